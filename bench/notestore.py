@@ -0,0 +1,195 @@
+"""
+Synthetic NoteStore.sqlite generator for benchmarks.
+
+Produces stores shaped like the ZICCLOUDSYNCINGOBJECT schema variants that
+memo_helpers.notes_sqlite handles, filled deterministically (seeded) so runs are
+comparable:
+
+- modern:  ZSNIPPET, ZIDENTIFIER, ZFOLDERTYPE, ZPARENT, ZMODIFICATIONDATE1,
+           ZCREATIONDATE3 (Recently Deleted found by folder type)
+- legacy:  ZSUMMARY, ZIDENTIFIER, ZPARENT1, ZMODIFICATIONDATE, ZCREATIONDATE1
+           (Recently Deleted found by identifier)
+- minimal: no snippet/summary/identifier/dates, ZPARENT2
+           (Recently Deleted found by localized name)
+
+Usage: python bench/notestore.py OUT.sqlite --notes 10000 --variant modern
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+
+VARIANTS = ("modern", "legacy", "minimal")
+
+# Bump when the generated data changes, so cached stores are rebuilt.
+GENERATOR_VERSION = 1
+
+_COLUMNS = {
+    "modern": [
+        "ZSNIPPET",
+        "ZIDENTIFIER",
+        "ZFOLDERTYPE",
+        "ZPARENT",
+        "ZMODIFICATIONDATE1",
+        "ZCREATIONDATE3",
+    ],
+    "legacy": [
+        "ZSUMMARY",
+        "ZIDENTIFIER",
+        "ZPARENT1",
+        "ZMODIFICATIONDATE",
+        "ZCREATIONDATE1",
+    ],
+    "minimal": ["ZPARENT2"],
+}
+
+_WORDS = (
+    "alpha beta gamma delta meeting notes plan groceries trip budget idea draft "
+    "review summary project weekly daily journal recipe book film todo list "
+    "research design release bug fix call email invoice travel health"
+).split()
+
+
+def _parent_column(variant: str) -> str:
+    return next(c for c in _COLUMNS[variant] if c.startswith("ZPARENT"))
+
+
+def generate(path: str, notes: int, variant: str = "modern", depth: int = 6, seed: int = 1) -> None:
+    """
+    Write a store with `notes` notes to `path` (replacing it).
+
+    Folders number about one per 25 notes and nest up to `depth` levels. About
+    2% of notes are untitled (titled from the snippet/summary when the variant
+    has one), 1% each are trashed, marked for deletion or password protected.
+    """
+    if variant not in VARIANTS:
+        raise ValueError(f"Unknown variant {variant!r}")
+    rng = random.Random(seed)
+    if os.path.exists(path):
+        os.unlink(path)
+    extra = _COLUMNS[variant]
+    parent_col = _parent_column(variant)
+
+    con = sqlite3.connect(path)
+    con.execute(
+        f"""
+        create table ZICCLOUDSYNCINGOBJECT (
+            Z_PK integer primary key,
+            Z_ENT integer,
+            ZTITLE1 varchar,
+            ZTITLE2 varchar,
+            ZFOLDER integer,
+            ZMARKEDFORDELETION integer,
+            ZISPASSWORDPROTECTED integer,
+            {", ".join(f"{c} {'varchar' if c in ('ZSNIPPET', 'ZSUMMARY', 'ZIDENTIFIER') else 'integer'}" for c in extra)}
+        )
+        """
+    )
+    # Core Data indexes its to-one relationships; the real store has these.
+    con.execute("create index ZICCLOUDSYNCINGOBJECT_ZFOLDER_INDEX on ZICCLOUDSYNCINGOBJECT (ZFOLDER)")
+    con.execute(
+        f"create index ZICCLOUDSYNCINGOBJECT_{parent_col}_INDEX on ZICCLOUDSYNCINGOBJECT ({parent_col})"
+    )
+    con.execute("create table Z_METADATA (Z_VERSION integer, Z_UUID varchar, Z_PLIST blob)")
+    con.execute("insert into Z_METADATA values (1, ?, null)", (f"BENCH-{variant.upper()}-{seed}",))
+    con.execute("create table Z_PRIMARYKEY (Z_ENT integer, Z_NAME varchar, Z_SUPER integer, Z_MAX integer)")
+    con.execute("insert into Z_PRIMARYKEY values (12, 'ICNote', 0, 0), (15, 'ICFolder', 0, 0)")
+
+    base_cols = ["Z_PK", "Z_ENT", "ZTITLE1", "ZTITLE2", "ZFOLDER", "ZMARKEDFORDELETION", "ZISPASSWORDPROTECTED"]
+    all_cols = base_cols + extra
+    insert = (
+        f"insert into ZICCLOUDSYNCINGOBJECT ({', '.join(all_cols)}) "
+        f"values ({', '.join('?' for _ in all_cols)})"
+    )
+
+    def row(**values):
+        return tuple(values.get(c) for c in all_cols)
+
+    rows = []
+    pk = 0
+
+    # Folders: a trash folder, then a forest where each folder nests under a
+    # random earlier one until `depth` is reached.
+    pk += 1
+    trash_pk = pk
+    rows.append(
+        row(
+            Z_PK=pk,
+            Z_ENT=15,
+            ZTITLE2="Recently Deleted",
+            ZIDENTIFIER="TrashFolder-DefaultAccount",
+            ZFOLDERTYPE=1,
+            ZMARKEDFORDELETION=0,
+        )
+    )
+    folder_pks: list[int] = []
+    folder_depth: dict[int, int] = {}
+    for i in range(max(1, notes // 25)):
+        pk += 1
+        parent = None
+        candidates = [f for f in folder_pks[-50:] if folder_depth[f] < depth - 1]
+        if candidates and rng.random() < 0.7:
+            parent = rng.choice(candidates)
+        folder_depth[pk] = folder_depth[parent] + 1 if parent else 0
+        folder_pks.append(pk)
+        rows.append(
+            row(
+                Z_PK=pk,
+                Z_ENT=15,
+                ZTITLE2=f"{rng.choice(_WORDS).title()} {i}",
+                ZIDENTIFIER=f"F-{pk:08d}",
+                ZFOLDERTYPE=0,
+                ZMARKEDFORDELETION=0,
+                **{parent_col: parent},
+            )
+        )
+
+    # Core Data dates: seconds since 2001-01-01.
+    now = 800_000_000.0
+    for i in range(notes):
+        pk += 1
+        words = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(1, 6)))
+        untitled = rng.random() < 0.02
+        roll = rng.random()
+        folder = trash_pk if roll < 0.01 else rng.choice(folder_pks)
+        modified = now - rng.random() * 300_000_000
+        snippet = f"{words}\nsecond line of note {i}"
+        rows.append(
+            row(
+                Z_PK=pk,
+                Z_ENT=12,
+                ZTITLE1="" if untitled else words.capitalize(),
+                ZFOLDER=folder,
+                ZMARKEDFORDELETION=1 if 0.01 <= roll < 0.02 else 0,
+                ZISPASSWORDPROTECTED=1 if 0.02 <= roll < 0.03 else 0,
+                ZSNIPPET=snippet,
+                ZSUMMARY=snippet,
+                ZIDENTIFIER=f"N-{pk:08d}",
+                ZMODIFICATIONDATE1=modified,
+                ZMODIFICATIONDATE=modified,
+                ZCREATIONDATE3=modified - rng.random() * 1_000_000,
+                ZCREATIONDATE1=modified - rng.random() * 1_000_000,
+            )
+        )
+        if len(rows) >= 10_000:
+            con.executemany(insert, rows)
+            rows.clear()
+    con.executemany(insert, rows)
+    con.commit()
+    con.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("out")
+    parser.add_argument("--notes", type=int, default=1000)
+    parser.add_argument("--variant", choices=VARIANTS, default="modern")
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    generate(args.out, args.notes, args.variant, args.depth, args.seed)
+
+
+if __name__ == "__main__":
+    main()
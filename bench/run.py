@@ -0,0 +1,201 @@
+"""
+Benchmark the Notes listing paths against synthetic NoteStore.sqlite files.
+
+Each store (see bench/notestore.py) is generated once and kept under
+bench/.stores. The listings are timed through notes_provider, the way the CLI
+calls them, with MEMO_NOTES_DB_PATH pointing at the store, in three modes:
+
+- nocache: MEMO_NO_CACHE=1, every call queries the store
+- miss:    cache enabled but empty, so the snapshot is built and stored
+- hit:     snapshot served from the cache
+
+Results are appended to bench/results.jsonl (one JSON object per case, tagged
+with a run id and the git revision). `--compare` prints each case against the
+previous run (or `--compare RUN_ID`).
+
+Usage:
+    python bench/run.py                          # 1k and 10k notes, all variants
+    python bench/run.py --notes 100000 --variant modern --repeat 3
+    python bench/run.py --compare
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(HERE))
+
+from notestore import GENERATOR_VERSION, VARIANTS, generate  # noqa: E402
+
+RESULTS = HERE / "results.jsonl"
+STORES = HERE / ".stores"
+
+LISTINGS = ("list_note_titles", "list_notes_meta", "list_folders_tree")
+
+
+def _store(notes: int, variant: str, depth: int) -> Path:
+    STORES.mkdir(exist_ok=True)
+    path = STORES / f"{variant}-{notes}-d{depth}-g{GENERATOR_VERSION}.sqlite"
+    if not path.exists():
+        t0 = time.perf_counter()
+        generate(str(path) + ".tmp", notes, variant, depth)
+        os.replace(str(path) + ".tmp", path)
+        print(f"generated {path.name} in {time.perf_counter() - t0:.1f}s", file=sys.stderr)
+    return path
+
+
+def _git_rev() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "-C", str(ROOT), "describe", "--always", "--dirty"],
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _time(fn, repeat: int, setup=None) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return samples
+
+
+def _bench_store(db: Path, repeat: int) -> dict[str, list[float]]:
+    from memo_helpers import notes_provider
+    from memo_helpers.cache import cache_delete
+
+    os.environ["MEMO_NOTES_DB_PATH"] = str(db)
+    os.environ["MEMO_NOTES_BACKEND"] = "sqlite"
+    os.environ.pop("MEMO_TIMING", None)
+
+    def drop_cache():
+        cache_delete("notes_snapshot:")
+        cache_delete("notes_folders:")
+
+    # A folder a few levels deep, for the folder-scoped paths.
+    folders = notes_provider.list_folder_names()
+    folder = folders[len(folders) // 2]
+
+    out: dict[str, list[float]] = {}
+    os.environ["MEMO_NO_CACHE"] = "1"
+    for name in LISTINGS:
+        out[f"nocache/{name}"] = _time(getattr(notes_provider, name), repeat)
+    out["nocache/list_notes_meta[folder]"] = _time(
+        lambda: notes_provider.list_notes_meta(folder), repeat
+    )
+    del os.environ["MEMO_NO_CACHE"]
+
+    for name in LISTINGS:
+        out[f"miss/{name}"] = _time(getattr(notes_provider, name), repeat, setup=drop_cache)
+    for name in LISTINGS:
+        getattr(notes_provider, name)()
+        out[f"hit/{name}"] = _time(getattr(notes_provider, name), repeat)
+    out["hit/list_notes_meta[folder]"] = _time(
+        lambda: notes_provider.list_notes_meta(folder), repeat
+    )
+    out["hit/list_folder_names"] = _time(notes_provider.list_folder_names, repeat)
+    return out
+
+
+def _load_results() -> list[dict]:
+    if not RESULTS.exists():
+        return []
+    rows = []
+    with open(RESULTS, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    continue
+    return rows
+
+
+def _baseline(rows: list[dict], run_id: str, wanted: str | None) -> dict[tuple, dict]:
+    earlier = [r for r in rows if r["run"] != run_id]
+    if wanted:
+        earlier = [r for r in earlier if r["run"] == wanted]
+    elif earlier:
+        last = max(r["run"] for r in earlier)
+        earlier = [r for r in earlier if r["run"] == last]
+    return {(r["variant"], r["notes"], r["case"]): r for r in earlier}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--notes", type=int, action="append", help="store size (repeatable)")
+    parser.add_argument("--variant", choices=VARIANTS, action="append", help="schema variant (repeatable)")
+    parser.add_argument("--depth", type=int, default=6, help="max folder nesting")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--compare", nargs="?", const="", metavar="RUN_ID", help="compare against a run")
+    parser.add_argument("--no-save", action="store_true", help="don't append to results.jsonl")
+    args = parser.parse_args()
+
+    sizes = args.notes or [1000, 10000]
+    variants = args.variant or list(VARIANTS)
+    run_id = time.strftime("%Y%m%dT%H%M%S")
+    meta = {
+        "run": run_id,
+        "git": _git_rev(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+    records = []
+    with tempfile.TemporaryDirectory(prefix="memo-bench-") as cache_home:
+        # Keep the user's real cache out of it.
+        os.environ["XDG_CACHE_HOME"] = cache_home
+        for variant in variants:
+            for notes in sizes:
+                db = _store(notes, variant, args.depth)
+                for case, samples in _bench_store(db, args.repeat).items():
+                    records.append(
+                        {
+                            **meta,
+                            "variant": variant,
+                            "notes": notes,
+                            "case": case,
+                            "min_ms": round(min(samples), 3),
+                            "median_ms": round(statistics.median(samples), 3),
+                            "repeat": args.repeat,
+                        }
+                    )
+
+    base = _baseline(_load_results(), run_id, args.compare) if args.compare is not None else {}
+    print(f"run {run_id} ({meta['git']}, Python {meta['python']})")
+    print(f"{'variant':<8} {'notes':>7}  {'case':<32} {'median ms':>10} {'min ms':>9}", end="")
+    print(f" {'vs base':>9}" if base else "")
+    for r in records:
+        line = f"{r['variant']:<8} {r['notes']:>7}  {r['case']:<32} {r['median_ms']:>10.2f} {r['min_ms']:>9.2f}"
+        prev = base.get((r["variant"], r["notes"], r["case"]))
+        if prev and prev["median_ms"] > 0:
+            line += f" {(r['median_ms'] / prev['median_ms'] - 1) * 100:>+8.1f}%"
+        print(line)
+
+    if not args.no_save:
+        with open(RESULTS, "a", encoding="utf-8") as f:
+            for r in records:
+                f.write(json.dumps(r) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,78 @@
 import click
 import datetime
+import importlib
 import os
-import time
-from memo_helpers.get_memo import get_note, get_reminder
-from memo_helpers.edit_memo import edit_note, edit_reminder
-from memo_helpers.add_memo import add_note, add_reminder
-from memo_helpers.delete_memo import (
-    delete_note,
-    complete_reminder,
-    delete_reminder,
-    delete_note_folder,
-)
-from memo_helpers.move_memo import move_note
-from memo_helpers.choice_memo import pick_note, pick_reminder
-from memo_helpers.notes_provider import list_folder_names, list_note_titles, list_folders_tree
+from memo_helpers.tracing import span
 from memo_helpers.validation_memo import selection_notes_validation
-from memo_helpers.search_memo import fuzzy_notes
-from memo_helpers.export_memo import export_memo
+
+
+def _lazy(module: str, name: str):
+    """
+    Stand-in for `from <module> import <name>` that defers the import to the
+    first call, so each subcommand and flag only loads the helpers it uses.
+    """
+
+    def _call(*args, **kwargs):
+        return getattr(importlib.import_module(module), name)(*args, **kwargs)
+
+    _call.__name__ = name
+    _call.__qualname__ = name
+    return _call
+
+
+get_note = _lazy("memo_helpers.get_memo", "get_note")
+get_reminder = _lazy("memo_helpers.reminders_provider", "get_reminder")
+edit_note = _lazy("memo_helpers.edit_memo", "edit_note")
+edit_reminder = _lazy("memo_helpers.edit_memo", "edit_reminder")
+add_note = _lazy("memo_helpers.add_memo", "add_note")
+add_reminder = _lazy("memo_helpers.add_memo", "add_reminder")
+delete_notes = _lazy("memo_helpers.delete_memo", "delete_notes")
+complete_reminders = _lazy("memo_helpers.delete_memo", "complete_reminders")
+delete_reminders = _lazy("memo_helpers.delete_memo", "delete_reminders")
+delete_note_folder = _lazy("memo_helpers.delete_memo", "delete_note_folder")
+move_notes = _lazy("memo_helpers.move_memo", "move_notes")
+pick_note = _lazy("memo_helpers.choice_memo", "pick_note")
+pick_notes = _lazy("memo_helpers.choice_memo", "pick_notes")
+pick_reminder = _lazy("memo_helpers.choice_memo", "pick_reminder")
+pick_reminders = _lazy("memo_helpers.choice_memo", "pick_reminders")
+list_folder_names = _lazy("memo_helpers.notes_provider", "list_folder_names")
+list_folders_tree = _lazy("memo_helpers.notes_provider", "list_folders_tree")
+list_note_titles = _lazy("memo_helpers.notes_provider", "list_note_titles")
+list_notes_meta = _lazy("memo_helpers.notes_provider", "list_notes_meta")
+fuzzy_notes = _lazy("memo_helpers.search_memo", "fuzzy_notes")
+grep_notes = _lazy("memo_helpers.search_memo", "grep_notes")
+export_memo = _lazy("memo_helpers.export_memo", "export_memo")
+export_archive = _lazy("memo_helpers.export_archive", "export_archive")
 
 # TODO: Check if notes can be imported.
 # TODO: Check if its possible to fetch .localized names from the folders.
 # TODO: Check alternative to md_converter to support images and attachments.
 
-def _maybe_timing(label: str, start: float) -> None:
-    if os.getenv("MEMO_TIMING") != "1":
-        return
-    ms = (time.perf_counter() - start) * 1000.0
-    click.echo(f"[timing] {label}: {ms:.1f}ms", err=True)
+def _notes_for_selection(folder: str = ""):
+    """
+    Build the [note_map, notes_list] pair that get_note() returns, from the
+    notes provider (SQLite when available, with its cache), so picking a note
+    doesn't walk every note through AppleScript. Falls back to get_note() only
+    when some note has no AppleScript id to address it by.
+    """
+    notes = list_notes_meta(folder=folder)
+    if not all(n.get("note_id") for n in notes):
+        return get_note(folder=folder)
+    note_map = {}
+    notes_list = []
+    for i, n in enumerate(notes, start=1):
+        display = f"{n['folder']} - {n['title']}" if n.get("folder") else n["title"]
+        note_map[i] = (n["note_id"], display)
+        notes_list.append(display)
+    return [note_map, notes_list]
 
 
 @click.group(invoke_without_command=False)
 @click.version_option()
-def cli():
-    pass
+@click.pass_context
+def cli(ctx):
+    # Root span for MEMO_TIMING / MEMO_TRACE, closed when the command returns.
+    ctx.with_resource(span(f"memo.{ctx.invoked_subcommand}"))
 
 
 @cli.command()
@@ -58,13 +98,13 @@ def cli():
     "--delete",
     "-d",
     is_flag=True,
-    help="Delete a note in the specified folder. Specify a folder using the --folder flag.",
+    help="Delete notes in the specified folder. Specify a folder using the --folder flag.",
 )
 @click.option(
     "--move",
     "-m",
     is_flag=True,
-    help="Move a note to a different folder.",
+    help="Move notes to a different folder.",
 )
 @click.option(
     "--flist",
@@ -73,6 +113,12 @@ def cli():
     help="List all the folders and subfolders.",
 )
 @click.option("--search", "-s", is_flag=True, help="Fuzzy search your notes.")
+@click.option(
+    "--grep",
+    "-g",
+    metavar="QUERY",
+    help="Search the contents of your notes (full-text index).",
+)
 @click.option(
     "--remove",
     "-r",
@@ -85,10 +131,51 @@ def cli():
     is_flag=True,
     help="Export your notes to the Desktop.",
 )
-def notes(folder, edit, add, delete, move, flist, search, remove, export):
-    t_total = time.perf_counter()
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["jsonl", "sqlite"]),
+    help="With --export, write all notes into a single JSONL or SQLite file.",
+)
+@click.option(
+    "--compress",
+    type=click.Choice(["gzip", "zstd"]),
+    help="Compress the --format output file.",
+)
+@click.option(
+    "--with-html",
+    is_flag=True,
+    help="Include each note's HTML in the --format output.",
+)
+def notes(
+    folder,
+    edit,
+    add,
+    delete,
+    move,
+    flist,
+    search,
+    grep,
+    remove,
+    export,
+    fmt,
+    compress,
+    with_html,
+):
     selection_notes_validation(
-        folder, edit, delete, move, add, flist, search, remove, export
+        folder,
+        edit,
+        delete,
+        move,
+        add,
+        flist,
+        search,
+        remove,
+        export,
+        fmt=fmt,
+        compress=compress,
+        with_html=with_html,
+        grep=grep,
     )
     # Avoid expensive AppleScript calls unless the chosen action needs them.
     if flist:
@@ -114,7 +201,8 @@ def notes(folder, edit, add, delete, move, flist, search, remove, export):
         return
 
     if export:
-        if click.confirm("\nAre you sure you want to export your notes to HTML?"):
+        target = f"a {fmt.upper()} file" if fmt else "HTML"
+        if click.confirm(f"\nAre you sure you want to export your notes to {target}?"):
             default_path = os.path.expanduser("~/Desktop/notes/")
             path_choice = click.confirm(
                 "\nDo you want to export to the default path (Desktop/notes)?",
@@ -132,78 +220,81 @@ def notes(folder, edit, add, delete, move, flist, search, remove, export):
                     )
                     return
 
-            export_memo(export_path)
+            if fmt:
+                out_path = export_archive(export_path, fmt, compress, with_html)
+                click.secho(f"\nNotes exported to {out_path}", fg="green")
+            else:
+                export_memo(export_path)
+        return
+
+    if grep:
+        grep_notes(grep, folder=folder)
         return
 
     if search:
         click.secho("\nFetching notes...\n", fg="yellow")
         fuzzy_notes(folder=folder)
-        _maybe_timing("memo.notes/total", t_total)
         return
 
-    t_validate = time.perf_counter()
-    folder_names = list_folder_names() if folder else []
-    _maybe_timing("memo.notes/folder_validate", t_validate)
+    with span("memo.notes/folder_validate"):
+        folder_names = list_folder_names() if folder else []
     if folder and folder not in folder_names:
         click.echo("\nThe folder does not exists.")
         click.echo("\nUse 'memo notes -fl' to see your folders")
-        _maybe_timing("memo.notes/total", t_total)
         return
 
     click.secho("\nFetching notes...", fg="yellow")
 
     listing_only = not (edit or delete or move)
     if listing_only:
-        t_fetch = time.perf_counter()
-        notes_list = list_note_titles(folder=folder)
-        _maybe_timing("memo.notes/fetch_titles", t_fetch)
+        with span("memo.notes/fetch_titles"):
+            notes_list = list_note_titles(folder=folder)
         notes_list_filter = [note for note in enumerate(notes_list, start=1)]
         if not notes_list_filter:
             click.echo("\nNo notes found.")
         else:
             title = f"Your Notes in folder {folder}:" if folder else "All your notes:"
             click.echo(f"\n{title}\n")
-            t_print = time.perf_counter()
-            for note in notes_list_filter:
-                click.echo(f"{note[0]}. {note[1]}")
-            _maybe_timing("memo.notes/print_list", t_print)
-        _maybe_timing("memo.notes/total", t_total)
+            with span("memo.notes/print_list"):
+                for note in notes_list_filter:
+                    click.echo(f"{note[0]}. {note[1]}")
         return
 
     # Note selection operations need IDs.
-    t_fetch = time.perf_counter()
-    note_map, notes_list = get_note(folder=folder)
-    _maybe_timing("memo.notes/fetch_ids", t_fetch)
+    with span("memo.notes/fetch_ids"):
+        note_map, notes_list = _notes_for_selection(folder=folder)
     notes_list_filter = [note for note in enumerate(notes_list, start=1)]
     if not notes_list_filter:
         click.echo("\nNo notes found.")
-        _maybe_timing("memo.notes/total", t_total)
         return
 
     title = f"Your Notes in folder {folder}:" if folder else "All your notes:"
     click.echo(f"\n{title}\n")
-    t_print = time.perf_counter()
-    for note in notes_list_filter:
-        click.echo(f"{note[0]}. {note[1]}")
-    _maybe_timing("memo.notes/print_list", t_print)
+    with span("memo.notes/print_list"):
+        for note in notes_list_filter:
+            click.echo(f"{note[0]}. {note[1]}")
 
     if edit:
         note_id = pick_note(note_map, notes_list_filter, "edit")
         edit_note(note_id)
+    titles = {note_id: title for note_id, title in note_map.values()}
     if move:
-        note_id = pick_note(note_map, notes_list_filter, "move")
-        if note_id is None:
-            click.echo("Invalid selection.")
-            return
+        note_ids = pick_notes(note_map, notes_list_filter, "move")
         target_folder = click.prompt(
-            "\nEnter the folder you want to move the note to", type=str
+            "\nEnter the folder you want to move the notes to"
+            if len(note_ids) > 1
+            else "\nEnter the folder you want to move the note to",
+            type=str,
         )
-        move_note(note_id, target_folder)
+        move_notes(note_ids, target_folder, titles)
     if delete:
-        note_id = pick_note(note_map, notes_list_filter, "delete")
-        delete_note(note_id)
+        note_ids = pick_notes(note_map, notes_list_filter, "delete")
+        if len(note_ids) > 1 and not click.confirm(
+            f"\nDelete {len(note_ids)} notes?", default=False
+        ):
+            return
+        delete_notes(note_ids, titles)
     # All other actions handled above.
-    _maybe_timing("memo.notes/total", t_total)
 
 
 @cli.command()
@@ -211,7 +302,7 @@ def notes(folder, edit, add, delete, move, flist, search, remove, export):
     "--complete",
     "-c",
     is_flag=True,
-    help="Mark a reminder as completed.",
+    help="Mark reminders as completed.",
 )
 @click.option(
     "--add",
@@ -223,7 +314,7 @@ def notes(folder, edit, add, delete, move, flist, search, remove, export):
     "--delete",
     "-d",
     is_flag=True,
-    help="Delete a reminder.",
+    help="Delete reminders.",
 )
 @click.option(
     "--edit",
@@ -231,23 +322,37 @@ def notes(folder, edit, add, delete, move, flist, search, remove, export):
     is_flag=True,
     help="Edit a reminder.",
 )
-def rem(complete, add, delete, edit):
+@click.option(
+    "--list",
+    "-l",
+    "list_name",
+    default="",
+    metavar="NAME",
+    help="Only show reminders in this list.",
+)
+def rem(complete, add, delete, edit, list_name):
     if add:
         add_reminder()
     else:
         today = datetime.datetime.today()
         modified_today = today - datetime.timedelta(days=1)
-        reminders_info = get_reminder()
-        reminders_map = reminders_info[0]
-        reminders_list = reminders_info[1]
-        reminders_list_filter = [
-            reminder for reminder in enumerate(reminders_list, start=1)
-        ]
+        click.secho("\nFetching reminders...", fg="yellow")
+        reminders = get_reminder(list_name=list_name)
+        if not reminders:
+            where = f" in list '{list_name}'" if list_name else ""
+            click.echo(f"\nNo open reminders{where}.")
+            return
+        reminders_map = {}
+        reminders_list_filter = []
         click.echo("\nYour Reminders:\n")
-        for reminder in reminders_list_filter:
-            reminder_dato = datetime.datetime.strptime(
-                reminder[1].split(" | ")[1], "%Y-%m-%d %H:%M:%S"
-            )
+        for i, reminder in enumerate(reminders, start=1):
+            reminders_map[i] = (reminder.reminder_id, reminder.title, reminder.due)
+            reminders_list_filter.append((i, reminder.title))
+            if reminder.due is None:
+                click.echo(f"{i}. {reminder.title} | No due date")
+                continue
+            reminder_dato = datetime.datetime.fromtimestamp(reminder.due).replace(microsecond=0)
+            line = f"{i}. {reminder.title} | {reminder_dato}"
             dato_diff = reminder_dato - modified_today
             if dato_diff.days <= 1:
                 due = (
@@ -255,27 +360,28 @@ def rem(complete, add, delete, edit):
                     if dato_diff.days > 0
                     else "Due today"
                 )
-                click.secho(
-                    f"{reminder[0]}. {reminder[1]} | {due}",
-                    fg="red",
-                )
+                click.secho(f"{line} | {due}", fg="red")
             elif dato_diff.days <= 3:
-                click.secho(
-                    f"{reminder[0]}. {reminder[1]} | Due on {dato_diff.days} days",
-                    fg="yellow",
-                )
+                click.secho(f"{line} | Due on {dato_diff.days} days", fg="yellow")
             else:
-                click.echo(
-                    f"{reminder[0]}. {reminder[1]} | Due on {dato_diff.days} days"
-                )
+                click.echo(f"{line} | Due on {dato_diff.days} days")
+        titles = {rid: title for rid, title, _due in reminders_map.values()}
         if complete:
-            reminder_id = pick_reminder(
+            reminder_ids = pick_reminders(
                 reminders_map, reminders_list_filter, "complete"
             )
-            complete_reminder(reminder_id)
+            if len(reminder_ids) > 1 and not click.confirm(
+                f"\nComplete {len(reminder_ids)} reminders?", default=False
+            ):
+                return
+            complete_reminders(reminder_ids, titles)
         if delete:
-            reminder_id = pick_reminder(reminders_map, reminders_list_filter, "delete")
-            delete_reminder(reminder_id)
+            reminder_ids = pick_reminders(reminders_map, reminders_list_filter, "delete")
+            if len(reminder_ids) > 1 and not click.confirm(
+                f"\nDelete {len(reminder_ids)} reminders?", default=False
+            ):
+                return
+            delete_reminders(reminder_ids, titles)
         if edit:
             reminder_id = pick_reminder(reminders_map, reminders_list_filter, "edit")
             part_to_edit = (
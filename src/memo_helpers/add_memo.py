@@ -1,12 +1,42 @@
 import subprocess
 import click
-import tempfile
-import mistune
 import os
 from datetime import datetime
 
+from memo_helpers.applescript import run_applescript
+from memo_helpers.notes_provider import invalidate_notes_cache
+from memo_helpers.reminders_provider import invalidate_reminders_cache
+
+_ADD_NOTE_SCRIPT = """
+    on run argv
+        tell application "Notes"
+            set targetFolder to first folder whose name is (item 1 of argv)
+            tell targetFolder
+                make new note with properties {body:(item 2 of argv)}
+            end tell
+        end tell
+    end run
+    """
+
+_ADD_REMINDER_SCRIPT = """
+    on run argv
+        tell application "Reminders"
+            set theDate to current date
+            set day of theDate to 1
+            set year of theDate to (item 2 of argv) as integer
+            set month of theDate to (item 3 of argv) as integer
+            set day of theDate to (item 4 of argv) as integer
+            set time of theDate to ((item 5 of argv) as integer) * hours + ((item 6 of argv) as integer) * minutes
+            make new reminder with properties {name:(item 1 of argv), due date:theDate}
+        end tell
+    end run
+    """
+
 
 def add_note(folder_name):
+    import mistune
+    import tempfile
+
     with tempfile.NamedTemporaryFile(suffix=".md", delete=False) as temp_file:
         temp_file.write(b"# Your note title\n\nWrite your note here...")
         temp_file_path = temp_file.name
@@ -24,22 +54,14 @@ def add_note(folder_name):
 
     note_html = mistune.markdown(note_md)
 
-    script = f"""
-        tell application "Notes"
-            set targetFolder to first folder whose name is "{folder_name}"
-            tell targetFolder
-                make new note with properties {{body:"{note_html}"}}
-            end tell
-        end tell
-        """
-
-    process = subprocess.run(
-        ["osascript", "-e", script], capture_output=True, text=True
+    process = run_applescript(
+        _ADD_NOTE_SCRIPT, folder_name, note_html, label="add_note/osascript"
     )
 
     os.remove(temp_file_path)
 
     if process.returncode == 0:
+        invalidate_notes_cache()
         click.echo(f"\nNote created in '{folder_name}' folder.")
     else:
         click.echo("\nError: Could not create note. Check if the folder exists.")
@@ -52,25 +74,19 @@ def add_reminder():
     datetime_str = f"{date} {time}"
     due_dt = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M")
 
-    year = due_dt.year
-    month = due_dt.month
-    day = due_dt.day
-    hour = due_dt.hour
-    minute = due_dt.minute
-
-    script = f'''
-    tell application "Reminders"
-        set theDate to current date
-        set year of theDate to {year}
-        set month of theDate to {month}
-        set day of theDate to {day}
-        set time of theDate to ({hour} * hours + {minute} * minutes)
-        make new reminder with properties {{name:"{title}", due date:theDate}}
-    end tell
-    '''
-    result = subprocess.run(["osascript", "-e", script], capture_output=True, text=True)
+    result = run_applescript(
+        _ADD_REMINDER_SCRIPT,
+        title,
+        str(due_dt.year),
+        str(due_dt.month),
+        str(due_dt.day),
+        str(due_dt.hour),
+        str(due_dt.minute),
+        label="add_reminder/osascript",
+    )
 
     if result.returncode == 0:
+        invalidate_reminders_cache()
         click.secho(f"\nReminder '{title}' added successfully.", fg="green")
     else:
         click.secho(f"\nError: Could not add reminder, {result.stderr}", fg="red")
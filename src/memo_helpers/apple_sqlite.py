@@ -0,0 +1,56 @@
+import os
+import sqlite3
+
+# Pieces shared by the readers of Apple's private Core Data stores
+# (NoteStore.sqlite in notes_sqlite, the Reminders stores in reminders_sqlite).
+
+# Core Data stores dates as seconds since 2001-01-01 UTC.
+CORE_DATA_EPOCH = 978307200
+
+
+def backend_from_env(var: str) -> str:
+    """
+    Select a listing backend from the environment variable `var`.
+
+    - auto (default): try sqlite, then fall back to AppleScript
+    - sqlite: force sqlite (error if unavailable)
+    - applescript: force AppleScript (even if sqlite works)
+    """
+    v = (os.getenv(var, "auto") or "").strip().lower()
+    if v in ("", "auto"):
+        return "auto"
+    if v in ("sqlite", "sql", "db"):
+        return "sqlite"
+    if v in ("applescript", "osascript", "as"):
+        return "applescript"
+    return "auto"
+
+
+def file_fingerprint(db_paths: list[str]) -> str | None:
+    """
+    Cheap change marker for SQLite stores, used to validate cached listings.
+
+    The apps write through the WAL, so the `-wal` file changes on every edit and
+    the main file changes on checkpoint. Stat-ing both avoids opening the DB.
+    Returns None when there is no store or one of them is missing.
+    """
+    if not db_paths:
+        return None
+    parts = []
+    for db_path in db_paths:
+        for p in (db_path, f"{db_path}-wal"):
+            try:
+                st = os.stat(p)
+            except FileNotFoundError:
+                if p == db_path:
+                    return None
+                parts.append("-")
+                continue
+            parts.append(f"{st.st_mtime_ns}:{st.st_size}")
+    return "|".join(parts)
+
+
+def open_readonly(db_path: str) -> sqlite3.Connection:
+    con = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=0.1)
+    con.row_factory = sqlite3.Row
+    return con
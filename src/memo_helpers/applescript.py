@@ -0,0 +1,104 @@
+import hashlib
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+from memo_helpers.cache import cache_dir
+from memo_helpers.tracing import count, span
+
+# Single execution layer for every AppleScript memo runs.
+#
+# Scripts are static sources taking their parameters from `on run argv`, so
+# user input is never spliced into source code. Each distinct source is compiled
+# once with `osacompile` into the cache dir (keyed by its hash); later calls run
+# the compiled .scpt directly and skip parsing/compiling the script again.
+
+
+def _scripts_dir() -> Path:
+    return cache_dir() / "scripts"
+
+
+def compiled_script(source: str) -> Path | None:
+    """
+    Return the path of a compiled copy of `source`, compiling it on first use.
+
+    Returns None when compiling isn't possible (no osacompile, caching disabled,
+    compile error); callers then run the source with `osascript -e`.
+    """
+    if os.getenv("MEMO_NO_CACHE") == "1":
+        return None
+    digest = hashlib.sha256(source.encode("utf-8")).hexdigest()[:32]
+    path = _scripts_dir() / f"{digest}.scpt"
+    if path.exists():
+        return path
+    osacompile = shutil.which("osacompile")
+    if osacompile is None:
+        return None
+
+    import tempfile
+
+    with span("applescript/osacompile"):
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(suffix=".scpt", dir=path.parent)
+            os.close(fd)
+            result = subprocess.run(
+                [osacompile, "-o", tmp, "-e", source], capture_output=True, text=True
+            )
+            if result.returncode != 0:
+                os.unlink(tmp)
+                return None
+            # Atomic publish, so concurrent memo processes never run a partial file.
+            os.replace(tmp, path)
+        except OSError:
+            return None
+    return path
+
+
+def run_applescript(
+    source: str, *args: str, label: str = "applescript/run"
+) -> subprocess.CompletedProcess:
+    """
+    Run an AppleScript with `args` passed to its `on run argv` handler.
+    """
+    compiled = compiled_script(source)
+    if compiled is not None:
+        cmd = ["osascript", str(compiled), *args]
+    else:
+        # osascript still parses options after `-e SOURCE`; "--" keeps an
+        # argument starting with "-" (a title, a folder name) from being one.
+        cmd = ["osascript", "-e", source, "--", *args]
+    with span(label):
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        count("osascript/calls")
+        count("osascript/stdout_chars", len(result.stdout or ""))
+    return result
+
+
+def _parse_batch(stdout: str, ids) -> dict[str, str | None]:
+    fields = stdout.rstrip("\n").split("\x1e") if stdout.strip() else []
+    out: dict[str, str | None] = {}
+    for n, item_id in enumerate(ids):
+        field = fields[n] if n < len(fields) else "!no result"
+        out[item_id] = None if field == "ok" else field[1:].strip() or "failed"
+    return out
+
+
+def run_batch(
+    source: str, ids, *args: str, label: str = "applescript/batch"
+) -> dict[str, str | None]:
+    """
+    Run a script acting on many ids in one osascript call and map each id to
+    None (done) or its error message.
+
+    The script gets `args` followed by the ids in argv, and returns one field
+    per id in argv order, separated by character id 30: "ok", or "!" and the
+    error message. When the run itself fails, every id gets its stderr.
+    """
+    ids = list(ids)
+    result = run_applescript(source, *args, *ids, label=label)
+    if result.returncode != 0:
+        error = (result.stderr or "").strip() or "osascript failed"
+        return {item_id: error for item_id in ids}
+    return _parse_batch(result.stdout, ids)
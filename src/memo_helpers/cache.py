@@ -1,20 +1,27 @@
 import json
 import os
+import sqlite3
 import time
 from pathlib import Path
 
+from memo_helpers.tracing import count
 
-def _cache_dir() -> Path:
+
+def cache_dir() -> Path:
     # Prefer XDG; macOS users may not have it set, so fall back to ~/.cache.
     base = os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
     return Path(base) / "memo"
 
 
 def _cache_path() -> Path:
-    return _cache_dir() / "cache_v1.json"
+    return cache_dir() / "cache_v2.sqlite"
+
 
+def _legacy_cache_path() -> Path:
+    return cache_dir() / "cache_v1.json"
 
-def _ttl_seconds() -> int:
+
+def ttl_seconds() -> int:
     raw = os.getenv("MEMO_CACHE_TTL_SECONDS", "30")
     try:
         return max(0, int(raw))
@@ -22,52 +29,166 @@ def _ttl_seconds() -> int:
         return 30
 
 
-def cache_get(key: str):
+def cache_enabled(fingerprint: str | None = None) -> bool:
     if os.getenv("MEMO_NO_CACHE") == "1":
-        return None
-    ttl = _ttl_seconds()
-    if ttl <= 0:
-        return None
+        return False
+    # Fingerprinted entries are validated against their source, not the clock.
+    if fingerprint is not None:
+        return True
+    return ttl_seconds() > 0
+
+
+def _migrate_legacy(con: sqlite3.Connection) -> None:
+    """
+    Import entries from the old single-file JSON cache, then drop it.
+
+    Best-effort: a corrupt legacy file is simply discarded.
+    """
+    legacy = _legacy_cache_path()
+    if not legacy.exists():
+        return
+    try:
+        obj = json.loads(legacy.read_text(encoding="utf-8"))
+    except Exception:
+        obj = {}
+    rows = []
+    if isinstance(obj, dict):
+        for key, entry in obj.items():
+            if not isinstance(entry, dict):
+                continue
+            ts = entry.get("ts")
+            if not isinstance(ts, (int, float)):
+                continue
+            rows.append((str(key), float(ts), json.dumps(entry.get("data"), ensure_ascii=True)))
+    with con:
+        con.executemany(
+            "insert or ignore into entries(key, ts, data) values (?, ?, ?)", rows
+        )
+    try:
+        legacy.unlink()
+    except OSError:
+        pass
+
 
+def _connect() -> sqlite3.Connection:
     p = _cache_path()
-    if not p.exists():
+    p.parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(p, timeout=1.0, isolation_level=None)
+    con.execute("pragma journal_mode=wal")
+    con.execute("pragma synchronous=normal")
+    con.execute(
+        """
+        create table if not exists entries (
+            key text primary key,
+            ts real not null,
+            fp text,
+            data text not null
+        ) without rowid
+        """
+    )
+    _migrate_legacy(con)
+    return con
+
+
+def cache_get(key: str, fingerprint: str | None = None):
+    """
+    Return cached data for `key`, or None on a miss.
+
+    With a `fingerprint`, the entry is served for as long as it was stored with
+    the same fingerprint (no TTL). Without one, MEMO_CACHE_TTL_SECONDS applies.
+    """
+    if not cache_enabled(fingerprint):
         return None
+    data = _lookup(key, fingerprint)
+    count("cache/hit" if data is not None else "cache/miss")
+    return data
+
 
+def _lookup(key: str, fingerprint: str | None):
     try:
-        obj = json.loads(p.read_text(encoding="utf-8"))
+        con = _connect()
+        try:
+            row = con.execute(
+                "select ts, fp, data from entries where key = ?", (key,)
+            ).fetchone()
+        finally:
+            con.close()
     except Exception:
         return None
 
-    entry = obj.get(key)
-    if not isinstance(entry, dict):
+    if row is None:
         return None
-    ts = entry.get("ts")
-    if not isinstance(ts, (int, float)):
+    ts, fp, data = row
+    if fingerprint is not None:
+        if fp != fingerprint:
+            return None
+    elif fp is not None or (time.time() - float(ts)) > ttl_seconds():
         return None
-    if (time.time() - float(ts)) > ttl:
+    try:
+        return json.loads(data)
+    except Exception:
         return None
-    return entry.get("data")
 
 
-def cache_set(key: str, data):
-    if os.getenv("MEMO_NO_CACHE") == "1":
+def cache_set(key: str, data, fingerprint: str | None = None):
+    if not cache_enabled(fingerprint):
         return
-    ttl = _ttl_seconds()
-    if ttl <= 0:
+
+    try:
+        payload = json.dumps(data, ensure_ascii=True)
+        con = _connect()
+        try:
+            con.execute(
+                "insert or replace into entries(key, ts, fp, data) values (?, ?, ?, ?)",
+                (key, time.time(), fingerprint, payload),
+            )
+        finally:
+            con.close()
+    except Exception:
+        # The cache is an optimisation; never fail a command because of it.
         return
 
-    p = _cache_path()
-    p.parent.mkdir(parents=True, exist_ok=True)
 
-    obj = {}
+def _like_prefix(prefix: str) -> str:
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+def cache_delete(prefix: str) -> None:
+    """Drop every entry whose key starts with `prefix` (e.g. after a mutation)."""
     try:
-        if p.exists():
-            obj = json.loads(p.read_text(encoding="utf-8"))
-            if not isinstance(obj, dict):
-                obj = {}
+        con = _connect()
+        try:
+            con.execute("delete from entries where key like ? escape '\\'", (_like_prefix(prefix),))
+        finally:
+            con.close()
     except Exception:
-        obj = {}
+        return
 
-    obj[key] = {"ts": time.time(), "data": data}
-    p.write_text(json.dumps(obj, ensure_ascii=True), encoding="utf-8")
 
+def cache_update(prefix: str, fn) -> None:
+    """
+    Rewrite every entry whose key starts with `prefix` as `fn(data)`, e.g. to
+    drop one item a mutation removed instead of refetching the whole listing.
+
+    Entries keep their timestamp and fingerprint, so they expire as before.
+    When `fn` raises, the entry is dropped.
+    """
+    try:
+        con = _connect()
+        try:
+            rows = con.execute(
+                "select key, data from entries where key like ? escape '\\'",
+                (_like_prefix(prefix),),
+            ).fetchall()
+            for key, data in rows:
+                try:
+                    payload = json.dumps(fn(json.loads(data)), ensure_ascii=True)
+                except Exception:
+                    con.execute("delete from entries where key = ?", (key,))
+                    continue
+                con.execute("update entries set data = ? where key = ?", (payload, key))
+        finally:
+            con.close()
+    except Exception:
+        return
@@ -27,3 +27,67 @@ def pick_reminder(reminder_map, reminders_list, action):
         return reminder_data[0]
     else:
         raise IndexError("The reminder you selected is not in the list.")
+
+
+def parse_selection(text, count):
+    """
+    Numbers picked in `text`, in the order given and without duplicates:
+    "3", "1,4", "2-5", "1-3, 7 9" or "all". Raises ValueError on anything else,
+    including numbers outside 1..count.
+    """
+    text = text.strip().lower()
+    if text in ("all", "*"):
+        return list(range(1, count + 1))
+    picked = []
+    seen = set()
+    for part in text.replace(",", " ").split():
+        start, sep, end = part.partition("-")
+        try:
+            first = int(start)
+            last = int(end) if sep else first
+        except ValueError:
+            raise ValueError(f"'{part}' is not a number or a range.") from None
+        if first > last:
+            first, last = last, first
+        if first < 1 or last > count:
+            raise ValueError(f"'{part}' is not in the list (1-{count}).")
+        for n in range(first, last + 1):
+            if n not in seen:
+                seen.add(n)
+                picked.append(n)
+    if not picked:
+        raise ValueError("Nothing selected.")
+    return picked
+
+
+class _Selection(click.ParamType):
+    name = "selection"
+
+    def __init__(self, count):
+        self.count = count
+
+    def convert(self, value, param, ctx):
+        if isinstance(value, list):
+            return value
+        try:
+            return parse_selection(value, self.count)
+        except ValueError as e:
+            self.fail(str(e), param, ctx)
+
+
+def _pick_many(item_map, items_list, noun, action):
+    choices = click.prompt(
+        f"\nEnter the numbers of the {noun}s you want to {action} (e.g. 1,3,5-7 or all)",
+        type=_Selection(len(items_list)),
+    )
+    return [item_map[n][0] for n in choices if n in item_map]
+
+
+def pick_reminders(reminder_map, reminders_list, action):
+    """Ids of the reminders picked by number, range or comma list."""
+    return _pick_many(reminder_map, reminders_list, "reminder", action)
+
+
+def pick_notes(note_map, notes_list, action):
+    """Ids of the notes picked by number, range or comma list."""
+    return _pick_many(note_map, notes_list, "note", action)
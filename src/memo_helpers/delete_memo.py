@@ -1,64 +1,144 @@
 import click
-import subprocess
 
+from memo_helpers.applescript import run_applescript, run_batch
+from memo_helpers.notes_provider import invalidate_notes_cache
+from memo_helpers.reminders_provider import forget_reminder
 
-def delete_note(note_id):
-    script = f'''
-    tell application "Notes"
-        set theNote to first note whose id is "{note_id}"
-        delete theNote
-    end tell
-    '''
+_DELETE_FOLDER_SCRIPT = """
+    on run argv
+        tell application "Notes"
+            set selectedFolder to first folder whose name is (item 1 of argv)
+            delete selectedFolder
+        end tell
+    end run
+    """
 
-    result = subprocess.run(["osascript", "-e", script], capture_output=True, text=True)
+# Notes and reminders are deleted/completed in one osascript run for any number
+# of ids; see applescript.run_batch() for the result format.
+_DELETE_NOTES_SCRIPT = """
+    on run argv
+        set results to {}
+        tell application "Notes"
+            repeat with noteId in argv
+                try
+                    delete note id (contents of noteId)
+                    set end of results to "ok"
+                on error errMsg
+                    set end of results to "!" & errMsg
+                end try
+            end repeat
+        end tell
+        set AppleScript's text item delimiters to (character id 30)
+        return results as text
+    end run
+    """
 
-    if result.returncode == 0:
-        click.secho("\nNote deleted successfully.", fg="green")
-    else:
-        click.secho(f"Error: {result.stderr}", fg="red")
+_COMPLETE_REMINDERS_SCRIPT = """
+    on run argv
+        set results to {}
+        tell application "Reminders"
+            repeat with reminderId in argv
+                try
+                    set completed of reminder id (contents of reminderId) to true
+                    set end of results to "ok"
+                on error errMsg
+                    set end of results to "!" & errMsg
+                end try
+            end repeat
+        end tell
+        set AppleScript's text item delimiters to (character id 30)
+        return results as text
+    end run
+    """
+
+_DELETE_REMINDERS_SCRIPT = """
+    on run argv
+        set results to {}
+        tell application "Reminders"
+            repeat with reminderId in argv
+                try
+                    delete reminder id (contents of reminderId)
+                    set end of results to "ok"
+                on error errMsg
+                    set end of results to "!" & errMsg
+                end try
+            end repeat
+        end tell
+        set AppleScript's text item delimiters to (character id 30)
+        return results as text
+    end run
+    """
 
 
 def delete_note_folder(folder_name):
-    script = f'''
-    tell application "Notes"
-        set selectedFolder to first folder whose name is "{folder_name}"
-        delete selectedFolder
-    end tell
-    '''
-    result = subprocess.run(["osascript", "-e", script], capture_output=True, text=True)
+    result = run_applescript(
+        _DELETE_FOLDER_SCRIPT, folder_name, label="delete_note_folder/osascript"
+    )
 
     if result.returncode == 0:
+        invalidate_notes_cache()
         click.secho("\nFolder deleted successfully.", fg="green")
     else:
         click.secho(f"Error: {result.stderr}", fg="red")
 
 
-def complete_reminder(reminder_id):
-    script = f'''
-        tell application "Reminders"
-            set selectedRem to first reminder whose id is "{reminder_id}"
-            set completed of selectedRem to true
-        end tell
-        '''
+def _report(results, titles, done_one, done_many):
+    failed = {i: e for i, e in results.items() if e is not None}
+    done = len(results) - len(failed)
+    if done:
+        message = done_one if len(results) == 1 else done_many.format(n=done)
+        click.secho(f"\n{message}", fg="green")
+    for item_id, error in failed.items():
+        name = (titles or {}).get(item_id) or item_id
+        click.secho(f"Error: {name}: {error}", fg="red")
 
-    result = subprocess.run(["osascript", "-e", script], capture_output=True, text=True)
 
-    if result.returncode == 0:
-        click.secho("\nReminder marked successfully as completed.", fg="green")
-    else:
-        click.secho(f"Error: {result.stderr}", fg="red")
+def delete_notes(note_ids, titles=None):
+    """
+    Delete notes in one AppleScript call and report the outcome per note.
+    `titles` ({id: title}) names failed ones in the report. Returns
+    {id: None or error message}.
+    """
+    if not note_ids:
+        return {}
+    results = run_batch(_DELETE_NOTES_SCRIPT, note_ids, label="delete_notes/osascript")
+    if any(e is None for e in results.values()):
+        invalidate_notes_cache()
+    _report(
+        results, titles, "Note deleted successfully.", "{n} notes deleted successfully."
+    )
+    return results
 
 
-def delete_reminder(reminder_id):
-    script = f'''
-        tell application "Reminders"
-        set selectedRem to first reminder whose id is "{reminder_id}"
-        delete selectedRem
-    end tell
-    '''
-    result = subprocess.run(["osascript", "-e", script], capture_output=True, text=True)
+def complete_reminders(reminder_ids, titles=None):
+    """Mark reminders completed in one AppleScript call; see delete_notes()."""
+    if not reminder_ids:
+        return {}
+    results = run_batch(
+        _COMPLETE_REMINDERS_SCRIPT, reminder_ids, label="complete_reminders/osascript"
+    )
+    forget_reminder(*(i for i, e in results.items() if e is None))
+    _report(
+        results,
+        titles,
+        "Reminder marked successfully as completed.",
+        "{n} reminders marked successfully as completed.",
+    )
+    return results
 
-    if result.returncode == 0:
-        click.secho("\nReminder deleted successfully.", fg="green")
-    else:
-        click.secho(f"Error: {result.stderr}", fg="red")
+
+def delete_reminders(reminder_ids, titles=None):
+    """Delete reminders in one AppleScript call; see delete_notes()."""
+    if not reminder_ids:
+        return {}
+    results = run_batch(
+        _DELETE_REMINDERS_SCRIPT, reminder_ids, label="delete_reminders/osascript"
+    )
+    forget_reminder(*(i for i, e in results.items() if e is None))
+    _report(
+        results,
+        titles,
+        "Reminder deleted successfully.",
+        "{n} reminders deleted successfully.",
+    )
+    return results
@@ -1,14 +1,48 @@
 import subprocess
 import click
-import tempfile
-import mistune
 import os
 import datetime
+from memo_helpers.applescript import run_applescript
 from memo_helpers.id_search_memo import id_search_memo
 from memo_helpers.md_converter import md_converter
+from memo_helpers.notes_provider import invalidate_notes_cache
+from memo_helpers.reminders_provider import update_cached_reminder
+
+_UPDATE_NOTE_SCRIPT = """
+    on run argv
+        tell application "Notes"
+            set body of note id (item 1 of argv) to (item 2 of argv)
+        end tell
+    end run
+    """
+
+_RENAME_REMINDER_SCRIPT = """
+    on run argv
+        tell application "Reminders"
+            set name of reminder id (item 1 of argv) to (item 2 of argv)
+        end tell
+    end run
+    """
+
+_REDATE_REMINDER_SCRIPT = """
+    on run argv
+        tell application "Reminders"
+            set dueDate to current date
+            set day of dueDate to 1
+            set year of dueDate to (item 2 of argv) as integer
+            set month of dueDate to (item 3 of argv) as integer
+            set day of dueDate to (item 4 of argv) as integer
+            set time of dueDate to ((item 5 of argv) as integer) * hours + ((item 6 of argv) as integer) * minutes
+            set due date of reminder id (item 1 of argv) to dueDate
+        end tell
+    end run
+    """
 
 
 def edit_note(note_id):
+    import mistune
+    import tempfile
+
     result = id_search_memo(note_id)
     original_md, original_html = md_converter(result)
 
@@ -36,35 +70,28 @@ def edit_note(note_id):
 
     edited_html = mistune.markdown(edited_md)
 
-    update_script = f"""
-        tell application "Notes"
-            set selectedNote to first note whose id is "{note_id}"
-            set body of selectedNote to "{edited_html}"
-        end tell
-        """
-    process = subprocess.run(
-        ["osascript", "-e", update_script], capture_output=True, text=True
+    process = run_applescript(
+        _UPDATE_NOTE_SCRIPT, note_id, edited_html, label="edit_note/osascript"
     )
     if process.returncode != 0:
         click.secho("\nError: Could not update note.\n", fg="red")
         click.secho(process.stderr, fg="red")
     else:
+        invalidate_notes_cache()
         click.secho("\nNote updated.", fg="green")
 
 
 def edit_reminder(reminder_id, part_to_edit):
     if part_to_edit == "title":
         new_title = click.prompt("\nEnter the new title")
-        script = f"""
-            tell application "Reminders"
-                set selectedReminder to first reminder whose id is "{reminder_id}"
-                set name of selectedReminder to "{new_title}"
-            end tell
-            """
-        result = subprocess.run(
-            ["osascript", "-e", script], capture_output=True, text=True
+        result = run_applescript(
+            _RENAME_REMINDER_SCRIPT,
+            reminder_id,
+            new_title,
+            label="edit_reminder/osascript",
         )
         if result.returncode == 0:
+            update_cached_reminder(reminder_id, title=new_title)
             click.secho("\nReminder title updated.", fg="green")
         else:
             click.secho("\nError: Could not update reminder title.", fg="red")
@@ -73,28 +100,18 @@ def edit_reminder(reminder_id, part_to_edit):
         new_time = click.prompt("\nEnter the new time (HH:MM)")
         datetime_str = f"{new_date} {new_time}"
         due_dt = datetime.datetime.strptime(datetime_str, "%Y-%m-%d %H:%M")
-        year = due_dt.year
-        month = due_dt.month
-        day = due_dt.day
-        hour = due_dt.hour
-        minute = due_dt.minute
-
-        script = f"""
-        tell application "Reminders"
-            set selectedReminder to first reminder whose id is "{reminder_id}"
-            set dueDate to current date
-            set year of dueDate to {year}
-            set month of dueDate to {month}
-            set day of dueDate to {day}
-            set time of dueDate to ({hour} * hours + {minute} * minutes)
-            set due date of selectedReminder to dueDate
-        end tell
-        """
-
-        result = subprocess.run(
-            ["osascript", "-e", script], capture_output=True, text=True
+        result = run_applescript(
+            _REDATE_REMINDER_SCRIPT,
+            reminder_id,
+            str(due_dt.year),
+            str(due_dt.month),
+            str(due_dt.day),
+            str(due_dt.hour),
+            str(due_dt.minute),
+            label="edit_reminder/osascript",
         )
         if result.returncode == 0:
+            update_cached_reminder(reminder_id, due=due_dt.timestamp())
             click.secho("\nReminder date updated.", fg="green")
         else:
             click.secho("\nError: Could not update reminder date.", fg="red")
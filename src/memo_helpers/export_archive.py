@@ -0,0 +1,234 @@
+import datetime
+import gzip
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import click
+
+from memo_helpers.export_memo import file_mode
+from memo_helpers.md_converter import html_to_markdown
+from memo_helpers.id_search_memo import (
+    get_note_bodies,
+    id_search_memo,
+    note_body_by_folder_title,
+)
+
+# Single-file exports for bulk processing: `memo notes --export --format jsonl|sqlite`.
+#
+# One record per note is streamed into the output as bodies arrive, so memory
+# stays flat regardless of account size. The file is written under a temporary
+# name and renamed into place once complete.
+
+_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+_SQLITE_SCHEMA = """
+create table notes (
+    identifier text,
+    folder text not null,
+    title text not null,
+    created text,
+    modified text,
+    markdown text not null,
+    html text
+)
+"""
+
+
+def _iso(ts: float | None) -> str | None:
+    if ts is None:
+        return None
+    return datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).isoformat()
+
+
+def _record(note: dict, markdown: str, html: str | None) -> dict:
+    return {
+        "folder": note.get("folder_path") or note.get("folder") or "",
+        "title": note["title"],
+        "identifier": note.get("identifier") or note.get("note_id"),
+        "created": _iso(note.get("created")),
+        "modified": _iso(note.get("modified")),
+        "markdown": markdown,
+        "html": html,
+    }
+
+
+def iter_records(notes: list[dict], with_html: bool):
+    """
+    Yield (note, record | None, error | None) for `notes` from list_notes_meta.
+
+    Bodies are decoded from NoteStore.sqlite when the notes come from it, with
+    a per-note AppleScript fallback for notes that fail to decode or have
+    attachments (only Notes' HTML keeps those); otherwise they are fetched in
+    AppleScript batches.
+    """
+    if notes and all(n.get("pk") is not None for n in notes):
+        from memo_helpers.notes_body import iter_note_bodies
+
+        bodies = iter_note_bodies([n["pk"] for n in notes])
+        for note, (_pk, body) in zip(notes, bodies):
+            if body is not None and not body.has_attachments:
+                markdown = body.to_markdown()
+                html = body.to_html() if with_html else None
+                yield note, _record(note, markdown, html), None
+                continue
+            if note.get("note_id"):
+                result = id_search_memo(note["note_id"])
+            else:
+                result = note_body_by_folder_title(note["folder"], note.get("lookup_title") or "")
+            if result.returncode != 0:
+                yield note, None, (result.stderr or "").strip() or "AppleScript execution failed."
+                continue
+            html = result.stdout.strip()
+            yield note, _record(note, html_to_markdown(html), html if with_html else None), None
+        return
+
+    from memo_helpers.id_search_memo import batch_size
+
+    size = batch_size()
+    for start in range(0, len(notes), size):
+        chunk = notes[start : start + size]
+        results = get_note_bodies([n["note_id"] for n in chunk], chunk_size=size)
+        for note, result in zip(chunk, results):
+            if result.body is None:
+                yield note, None, result.error or "no body"
+                continue
+            html = result.body
+            yield note, _record(note, html_to_markdown(html), html if with_html else None), None
+
+
+def _open_compressed(path: str, compress: str | None):
+    if compress is None:
+        return open(path, "wb")
+    if compress == "gzip":
+        return gzip.open(path, "wb")
+    try:
+        # Python 3.14+
+        from compression import zstd
+
+        return zstd.open(path, "wb")
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        raise click.ClickException(
+            "zstd compression needs the 'zstandard' package (pip install zstandard)."
+        )
+    return zstandard.ZstdCompressor().stream_writer(open(path, "wb"))
+
+
+class _JsonlWriter:
+    def __init__(self, tmp_path: str, compress: str | None):
+        self._f = _open_compressed(tmp_path, compress)
+
+    def write(self, record: dict) -> None:
+        self._f.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class _SqliteWriter:
+    def __init__(self, tmp_path: str, compress: str | None):
+        self._tmp_path = tmp_path
+        self._compress = compress
+        # Compressed output is built in a plain database first, then streamed
+        # through the compressor.
+        self._db_path = tmp_path + ".db" if compress else tmp_path
+        self._con = sqlite3.connect(self._db_path)
+        self._con.execute("pragma journal_mode = off")
+        self._con.execute("pragma synchronous = off")
+        self._con.execute(_SQLITE_SCHEMA)
+        self._rows: list[tuple] = []
+
+    def write(self, record: dict) -> None:
+        self._rows.append(
+            (
+                record["identifier"],
+                record["folder"],
+                record["title"],
+                record["created"],
+                record["modified"],
+                record["markdown"],
+                record["html"],
+            )
+        )
+        if len(self._rows) >= 500:
+            self._flush()
+
+    def _flush(self) -> None:
+        self._con.executemany("insert into notes values (?, ?, ?, ?, ?, ?, ?)", self._rows)
+        self._rows.clear()
+
+    def close(self) -> None:
+        try:
+            self._flush()
+            self._con.commit()
+        finally:
+            self._con.close()
+        if self._compress:
+            try:
+                with open(self._db_path, "rb") as src, _open_compressed(
+                    self._tmp_path, self._compress
+                ) as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+            finally:
+                os.unlink(self._db_path)
+
+
+def export_archive(
+    path: str, fmt: str, compress: str | None = None, with_html: bool = False
+) -> str:
+    """Write every note into one `notes.<fmt>` file in `path`; returns its path."""
+    from memo_helpers.notes_provider import list_notes_meta
+
+    notes = list_notes_meta()
+    os.makedirs(path, exist_ok=True)
+    out_path = os.path.join(path, f"notes.{fmt}{_SUFFIXES.get(compress, '')}")
+    fd, tmp = tempfile.mkstemp(dir=path, suffix=".tmp")
+    os.close(fd)
+    if fmt == "sqlite":
+        # sqlite3 wants to create the file itself.
+        os.unlink(tmp)
+
+    failures: list[tuple[str, str]] = []
+    written = 0
+    t0 = time.perf_counter()
+    try:
+        writer = _JsonlWriter(tmp, compress) if fmt == "jsonl" else _SqliteWriter(tmp, compress)
+        try:
+            with click.progressbar(
+                length=len(notes), label="Exporting notes", file=sys.stderr
+            ) as bar:
+                for note, record, error in iter_records(notes, with_html):
+                    if record is None:
+                        failures.append((note["title"], error or "unknown error"))
+                    else:
+                        writer.write(record)
+                        written += 1
+                    bar.update(1)
+        finally:
+            writer.close()
+        # mkstemp creates the file owner-only.
+        os.chmod(tmp, file_mode())
+        os.replace(tmp, out_path)
+    except BaseException:
+        for leftover in (tmp, tmp + ".db"):
+            try:
+                os.unlink(leftover)
+            except OSError:
+                pass
+        raise
+
+    elapsed = max(time.perf_counter() - t0, 1e-9)
+    click.echo(
+        f"\n{written} notes exported in {elapsed:.1f}s ({written / elapsed:.1f} notes/s)",
+        err=True,
+    )
+    for title, error in failures:
+        click.secho(f"Could not export '{title}': {error}", fg="red")
+    return out_path
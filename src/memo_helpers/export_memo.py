@@ -1,15 +1,21 @@
-import subprocess
+import hashlib
+import json
 import os
+import re
+import sys
+import time
 import click
-import html2text
-import chardet
-
-
-def export_memo(path: str):
-    script = f"""
-    set exportFolder to "{path}"
-    do shell script "mkdir -p " & quoted form of exportFolder
+from dataclasses import dataclass
+from memo_helpers.applescript import run_applescript
+from memo_helpers.id_search_memo import (
+    get_note_bodies,
+    id_search_memo,
+    note_body_by_folder_title,
+)
+from memo_helpers.md_converter import html_to_markdown
+from memo_helpers.tracing import attach, child_env, traced
 
+_EXPORT_SCRIPT = """
     on replaceText(find, replace, subject)
         set prevTIDs to text item delimiters of AppleScript
         set text item delimiters to find
@@ -20,76 +26,607 @@ def export_memo(path: str):
         return subject
     end replaceText
 
-    on cleanFileName(t)
+    on cleanFileName(t, noteId)
         set t to my replaceText(":", "-", t)
         set t to my replaceText("/", "-", t)
-        if length of t > 250 then
-            set t to text 1 thru 250 of t
+        set prevTIDs to text item delimiters of AppleScript
+        set text item delimiters to "/"
+        set suffix to " [" & last text item of noteId & "]"
+        set text item delimiters to prevTIDs
+        if length of t > 250 - (length of suffix) then
+            set t to text 1 thru (250 - (length of suffix)) of t
         end if
-        return t
+        return t & suffix
     end cleanFileName
 
-    tell application "Notes"
-        repeat with theNote in notes of default account
-            set noteLocked to password protected of theNote as boolean
-            if not noteLocked then
-                set noteName to name of theNote as string
-                set noteBody to body of theNote as string
-                set cleanName to my cleanFileName(noteName)
-                set exportPath to exportFolder & cleanName
-                set tempHTMLPath to exportPath & ".html"
-                set htmlContent to "<html><head><meta charset=\\"UTF-8\\"></head><body>" & noteBody & "</body></html>"
-                set f to open for access (POSIX file tempHTMLPath) with write permission
-                set eof of f to 0
-                write htmlContent to f
-                close access f
-            end if
-        end repeat
-    end tell
+    on run argv
+        set exportFolder to item 1 of argv
+        do shell script "mkdir -p " & quoted form of exportFolder
+
+        tell application "Notes"
+            repeat with theNote in notes of default account
+                set noteLocked to password protected of theNote as boolean
+                if not noteLocked then
+                    set noteName to name of theNote as string
+                    set noteBody to body of theNote as string
+                    set cleanName to my cleanFileName(noteName, id of theNote as string)
+                    set exportPath to exportFolder & cleanName
+                    set tempHTMLPath to exportPath & ".html"
+                    set htmlContent to "<html><head><meta charset=\\"UTF-8\\"></head><body>" & noteBody & "</body></html>"
+                    set f to open for access (POSIX file tempHTMLPath) with write permission
+                    set eof of f to 0
+                    write htmlContent to f
+                    close access f
+                end if
+            end repeat
+        end tell
+    end run
+    """
+
+
+# Written into the export folder; maps note key -> {"modified", "hash", "files"}.
+# It doubles as the index from note identity to exported files.
+_MANIFEST_NAME = ".memo-export.json"
+_MANIFEST_VERSION = 1
+
+
+def _note_suffix(pk: int | None = None, note_id: str | None = None) -> str:
+    """
+    Short stable tag for a note: "p<pk>", the last component of its
+    AppleScript id (x-coredata://<store>/ICNote/p<pk>) for the same note.
+    """
+    if pk is not None:
+        return f"p{pk}"
+    tail = (note_id or "").rsplit("/", 1)[-1]
+    if re.fullmatch(r"p\d+", tail):
+        return tail
+    return hashlib.sha256((note_id or "").encode("utf-8")).hexdigest()[:8]
+
+
+def _clean_file_name(name: str, suffix: str) -> str:
+    # Same rules as the `cleanFileName` handler in _EXPORT_SCRIPT. The suffix
+    # keeps notes with the same title from overwriting each other.
+    name = name.replace(":", "-").replace("/", "-")
+    tag = f" [{suffix}]"
+    return name[: 250 - len(tag)] + tag
+
+
+def _legacy_file_name(name: str) -> str:
+    # File name used by memo before the suffix and the manifest (no tag).
+    return name.replace(":", "-").replace("/", "-")[:250]
+
+
+@dataclass(frozen=True, slots=True)
+class ExportJob:
+    title: str
+    file_name: str
+    # At least one of the two is set; the other is derived in the worker.
+    html: str | None = None
+    markdown: str | None = None
+    # Manifest key, and the content hash and files recorded by the previous export.
+    key: str | None = None
+    known_hash: str | None = None
+    known_files: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class ExportFailure:
+    title: str
+    error: str
+
+
+def _workers() -> int:
+    raw = os.getenv("MEMO_EXPORT_WORKERS", "")
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        return os.cpu_count() or 1
+
+
+def file_mode() -> int:
+    """Mode open() gives new files under the current umask."""
+    mask = os.umask(0)
+    os.umask(mask)
+    return 0o666 & ~mask
+
+
+def _write_atomic(path: str, text: str) -> None:
+    import tempfile
+
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        # mkstemp creates the file owner-only.
+        os.chmod(tmp, file_mode())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _content_hash(job: ExportJob) -> str:
+    source = job.markdown if job.markdown is not None else f"html:{job.html or ''}"
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def _rename_files(path: str, old_files, new_names: list[str]) -> bool:
+    """Rename `old_files` to the new name with the same extension; False if one is missing."""
+    by_ext = {os.path.splitext(f)[1]: f for f in old_files}
+    try:
+        for new in new_names:
+            old = by_ext.get(os.path.splitext(new)[1])
+            if old is None:
+                return False
+            if old != new:
+                os.replace(os.path.join(path, old), os.path.join(path, new))
+    except OSError:
+        return False
+    return True
+
+
+@traced("export/write_note")
+def _write_job(
+    path: str, job: ExportJob, formats: tuple[str, ...]
+) -> tuple[str | None, str | None]:
+    """
+    Render and write one note; runs in a worker process.
+
+    Returns (content hash, error message) instead of raising, so one bad note
+    doesn't stop the export. When the content hash matches the previous export,
+    the files are left alone, or only renamed if the file name changed.
+    """
+    try:
+        digest = _content_hash(job)
+        if digest == job.known_hash:
+            names = [f"{job.file_name}.{ext}" for ext in formats]
+            if all(os.path.exists(os.path.join(path, n)) for n in names):
+                return digest, None
+            if _rename_files(path, job.known_files, names):
+                return digest, None
+        html = job.html
+        if "html" in formats:
+            if html is None:
+                import mistune
+
+                html = mistune.markdown(job.markdown or "")
+            _write_atomic(
+                os.path.join(path, f"{job.file_name}.html"),
+                f'<html><head><meta charset="UTF-8"></head><body>{html}</body></html>',
+            )
+        if "md" in formats:
+            markdown = job.markdown
+            if markdown is None:
+                markdown = html_to_markdown(html or "")
+            _write_atomic(os.path.join(path, f"{job.file_name}.md"), markdown)
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+    return digest, None
+
+
+def _run_pipeline(
+    path: str, total: int, source, formats: tuple[str, ...], on_written=None
+) -> list[ExportFailure]:
+    """
+    Feed jobs from `source` to a process pool as they arrive.
+
+    `source` yields ExportJob or ExportFailure items. At most a few jobs per
+    worker are in flight, so bodies are never all held in memory at once.
+    `on_written(job, digest)` is called for every note written successfully.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    workers = _workers()
+    failures: list[ExportFailure] = []
+    done_count = 0
+    t0 = time.perf_counter()
+
+    pool = None
+    if workers > 1:
+        try:
+            # Workers append their spans to the same MEMO_TRACE file.
+            pool = ProcessPoolExecutor(
+                max_workers=workers, initializer=attach, initargs=(child_env(),)
+            )
+        except (OSError, NotImplementedError):
+            pool = None
+
+    pending: dict = {}
+    with click.progressbar(length=total, label="Exporting notes", file=sys.stderr) as bar:
+
+        def _finish(job: ExportJob, digest: str | None, err: str | None) -> None:
+            nonlocal done_count
+            if err is not None:
+                failures.append(ExportFailure(job.title, err))
+            elif on_written is not None:
+                on_written(job, digest)
+            done_count += 1
+            bar.update(1)
+
+        def _collect(futures) -> None:
+            for fut in futures:
+                job = pending.pop(fut)
+                try:
+                    digest, err = fut.result()
+                except Exception as e:
+                    digest, err = None, f"{type(e).__name__}: {e}"
+                _finish(job, digest, err)
+
+        try:
+            for item in source:
+                if isinstance(item, ExportFailure):
+                    failures.append(item)
+                    done_count += 1
+                    bar.update(1)
+                    continue
+                if pool is None:
+                    _finish(item, *_write_job(path, item, formats))
+                    continue
+                pending[pool.submit(_write_job, path, item, formats)] = item
+                if len(pending) >= workers * 4:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    _collect(finished)
+            _collect(list(pending))
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+    elapsed = max(time.perf_counter() - t0, 1e-9)
+    written = done_count - len(failures)
+    click.echo(
+        f"\n{written} notes exported in {elapsed:.1f}s ({written / elapsed:.1f} notes/s)",
+        err=True,
+    )
+    for failure in failures:
+        click.secho(f"Could not export '{failure.title}': {failure.error}", fg="red")
+    return failures
+
+
+def _load_manifest(path: str) -> dict[str, dict]:
+    try:
+        with open(os.path.join(path, _MANIFEST_NAME), encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != _MANIFEST_VERSION:
+        return {}
+    notes = data.get("notes")
+    if not isinstance(notes, dict):
+        return {}
+    return {
+        k: v
+        for k, v in notes.items()
+        if isinstance(v, dict) and isinstance(v.get("files"), list) and v["files"]
+    }
+
+
+def _save_manifest(path: str, notes: dict[str, dict]) -> None:
+    data = {"version": _MANIFEST_VERSION, "notes": notes}
+    _write_atomic(
+        os.path.join(path, _MANIFEST_NAME),
+        json.dumps(data, ensure_ascii=False, indent=1, sort_keys=True),
+    )
+
+
+def _native_notes():
+    """Notes metadata from NoteStore.sqlite, or None when it can't be used."""
+    from memo_helpers.notes_provider import notes_backend
+
+    if notes_backend() == "applescript":
+        return None
+    try:
+        from memo_helpers.notes_sqlite import list_notes_meta
+
+        return list_notes_meta()
+    except Exception:
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class _Pending:
+    """A note whose body has to be read, with its previous manifest entry."""
+
+    key: str
+    file_name: str
+    modified: float | None
+    entry: dict | None
+    note: object
+
+    def job(self, title: str, html: str | None = None, markdown: str | None = None) -> ExportJob:
+        entry = self.entry or {}
+        return ExportJob(
+            title,
+            self.file_name,
+            html=html,
+            markdown=markdown,
+            key=self.key,
+            known_hash=entry.get("hash"),
+            known_files=tuple(entry.get("files", ())),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class _SyncStats:
+    unchanged: int
+    renamed: int
+    removed: int
+    kept: set[str]
+
+
+def _export_incremental(path: str, notes, formats: tuple[str, ...]) -> None:
+    """
+    Export notes from NoteStore.sqlite, only rewriting what changed.
+
+    The manifest from the previous run is compared against the store's
+    modification dates, so unchanged notes are skipped without reading their
+    body. Notes are matched by identifier, so a retitled note gets its files
+    renamed (or re-rendered under the new name when its content changed too),
+    and files of notes that no longer exist are removed. Notes with attachments
+    are exported from their AppleScript HTML, which keeps images and tables.
+    """
+    from memo_helpers.notes_body import iter_note_bodies
+
+    previous = _load_manifest(path)
+    current: dict[str, dict] = {}
+    todo: list[_Pending] = []
+    unchanged = renamed = 0
+    # A folder exported before the manifest existed has "<title>.html/.md"
+    # files; they are replaced by the tagged names (legacy name -> note keys).
+    migrate = not previous and not os.path.exists(os.path.join(path, _MANIFEST_NAME))
+    legacy: dict[str, list[str]] = {}
+
+    for note in notes:
+        key = note.identifier or f"pk:{note.pk}"
+        file_name = _clean_file_name(note.lookup_title or note.title, _note_suffix(pk=note.pk))
+        if migrate:
+            legacy_name = _legacy_file_name(note.lookup_title or note.title)
+            if any(
+                os.path.exists(os.path.join(path, f"{legacy_name}.{ext}"))
+                for ext in ("html", "md")
+            ):
+                legacy.setdefault(legacy_name, []).append(key)
+        entry = previous.get(key)
+        if (
+            entry is not None
+            and entry.get("files")
+            and note.modified is not None
+            and entry.get("modified") == note.modified
+        ):
+            old_stem = os.path.splitext(entry["files"][0])[0]
+            if all(os.path.exists(os.path.join(path, f"{old_stem}.{ext}")) for ext in formats):
+                files = entry["files"]
+                if old_stem != file_name:
+                    files = []
+                    for old in entry["files"]:
+                        new = f"{file_name}{os.path.splitext(old)[1]}"
+                        try:
+                            os.replace(os.path.join(path, old), os.path.join(path, new))
+                        except OSError:
+                            # Keep listing the old name: the stale cleanup below
+                            # would otherwise delete the only copy. The next run
+                            # retries the rename, or re-exports the note.
+                            files.append(old)
+                            continue
+                        files.append(new)
+                    renamed += 1
+                else:
+                    unchanged += 1
+                current[key] = dict(entry, files=files)
+                continue
+        todo.append(_Pending(key, file_name, note.modified, entry, note))
+
+    def _jobs():
+        bodies = iter_note_bodies([p.note.pk for p in todo])
+        for pending, (_pk, body) in zip(todo, bodies):
+            note = pending.note
+            if body is not None and not body.has_attachments:
+                yield pending.job(note.title, markdown=body.to_markdown())
+                continue
+            if note.note_id:
+                result = id_search_memo(note.note_id)
+            else:
+                result = note_body_by_folder_title(note.folder, note.lookup_title or "")
+            if result.returncode != 0:
+                err = (result.stderr or "").strip() or "AppleScript execution failed."
+                yield ExportFailure(note.title, err)
+                continue
+            yield pending.job(note.title, html=result.stdout.strip())
+
+    stats = _sync_export(path, formats, previous, current, todo, _jobs())
+    unchanged += stats.unchanged
+    renamed += stats.renamed
+
+    # Old files go once every note that could have written them is exported
+    # under its new name; notes sharing a title all wrote the same file.
+    migrated = 0
+    for legacy_name, keys in legacy.items():
+        if not all(k in current for k in keys):
+            continue
+        for ext in ("html", "md"):
+            old = f"{legacy_name}.{ext}"
+            if old in stats.kept:
+                continue
+            try:
+                os.unlink(os.path.join(path, old))
+            except OSError:
+                continue
+            migrated += 1
+
+    _save_manifest(path, current)
+    summary = f"{unchanged} unchanged, {renamed} renamed, {stats.removed} removed"
+    if migrated:
+        summary += f", {migrated} files from an older export replaced"
+    click.echo(summary, err=True)
+
+
+def _sync_export(
+    path: str,
+    formats: tuple[str, ...],
+    previous: dict[str, dict],
+    current: dict[str, dict],
+    todo: list[_Pending],
+    jobs,
+) -> _SyncStats:
+    """
+    Write `jobs` for the `todo` notes and record them in `current`, then remove
+    the files of notes that are gone or now live under another name.
+    """
+    pending = {p.key: p for p in todo}
+    unchanged = renamed = 0
+
+    def _written(job: ExportJob, digest: str | None) -> None:
+        nonlocal unchanged, renamed
+        files = [f"{job.file_name}.{ext}" for ext in formats]
+        entry = pending[job.key].entry
+        if entry is not None and entry.get("files"):
+            if sorted(entry["files"]) != sorted(files):
+                renamed += 1
+            elif digest == entry.get("hash"):
+                unchanged += 1
+        current[job.key] = {
+            "modified": pending[job.key].modified,
+            "hash": digest,
+            "files": files,
+        }
+
+    _run_pipeline(path, len(todo), jobs, formats, on_written=_written)
+
+    # Failed notes keep their previous entry (and files) so they're retried.
+    for p in todo:
+        if p.key not in current and p.entry is not None:
+            current[p.key] = p.entry
+
+    kept = {f for entry in current.values() for f in entry.get("files", ())}
+    removed = 0
+    for key, entry in previous.items():
+        stale = [f for f in entry.get("files", ()) if f not in kept]
+        for f in stale:
+            try:
+                os.unlink(os.path.join(path, f))
+            except OSError:
+                pass
+        if key not in current:
+            removed += 1
+    return _SyncStats(unchanged, renamed, removed, kept)
+
+
+def _applescript_notes() -> list[dict]:
+    from memo_helpers.notes_provider import list_notes_meta
+
+    return [n for n in list_notes_meta() if n.get("note_id")]
+
+
+def _export_applescript(path: str, notes: list[dict], formats: tuple[str, ...]) -> None:
     """
-    result = subprocess.run(["osascript", "-e", script], capture_output=True, text=True)
+    Export `notes` with their bodies fetched in batches of AppleScript calls.
+
+    AppleScript listings have no modification dates, so every body is read,
+    but the manifest is kept like in _export_incremental: notes whose content
+    didn't change are not rewritten, retitled notes get their files renamed,
+    and files of deleted notes are removed.
+    """
+    from memo_helpers.id_search_memo import batch_size
+
+    previous = _load_manifest(path)
+    current: dict[str, dict] = {}
+    todo = []
+    for note in notes:
+        key = note.get("identifier") or f"as:{note['note_id']}"
+        file_name = _clean_file_name(
+            note["lookup_title"] or note["title"],
+            _note_suffix(pk=note.get("pk"), note_id=note["note_id"]),
+        )
+        todo.append(_Pending(key, file_name, note.get("modified"), previous.get(key), note))
+
+    def _jobs():
+        size = batch_size()
+        for start in range(0, len(todo), size):
+            chunk = todo[start : start + size]
+            results = get_note_bodies([p.note["note_id"] for p in chunk], chunk_size=size)
+            for pending, result in zip(chunk, results):
+                if result.body is None:
+                    yield ExportFailure(pending.note["title"], result.error or "no body")
+                    continue
+                yield pending.job(pending.note["title"], html=result.body)
+
+    stats = _sync_export(path, formats, previous, current, todo, _jobs())
+    _save_manifest(path, current)
+    click.echo(
+        f"{stats.unchanged} unchanged, {stats.renamed} renamed, {stats.removed} removed",
+        err=True,
+    )
+
+
+def export_memo(path: str):
+    to_markdown = click.confirm(
+        "\nDo you want to convert the notes to Markdown too? Attachements and pictures will not be converted."
+    )
+    formats = ("html", "md") if to_markdown else ("html",)
+
+    notes = _native_notes()
+    if notes is not None:
+        os.makedirs(path, exist_ok=True)
+        _export_incremental(path, notes, formats)
+        click.secho(f"\nNotes exported to {path}", fg="green")
+        return
+
+    try:
+        notes = _applescript_notes()
+    except Exception:
+        notes = None
+    if notes is not None:
+        os.makedirs(path, exist_ok=True)
+        _export_applescript(path, notes, formats)
+        click.secho(f"\nNotes exported to {path}", fg="green")
+        return
+
+    result = run_applescript(_EXPORT_SCRIPT, path, label="export_memo/osascript")
     if result.returncode == 0:
         click.secho(f"\nNotes exported to {path}", fg="green")
-        if click.confirm(
-            "\nDo you want to convert the notes to Markdown? Attachements and pictures will not be converted."
-        ):
+        if to_markdown:
             html_to_md(path)
     else:
         click.secho("\nError exporting notes", fg="red")
 
 
-def html_to_md(path: str):
-    files = os.listdir(path)
-    files_list = [f for f in files if os.path.isfile(os.path.join(path, f))]
-
-    for file in files_list:
-        file_path = os.path.join(path, file)
-        file_name = os.path.splitext(file)[0]
-
-        with open(file_path, "rb") as f:
-            raw_data = f.read()
-            result = chardet.detect(raw_data)
-            encoding = result["encoding"]
+def _decode_html(raw_data: bytes) -> str:
+    # Files written by memo are UTF-8; only guess the encoding for anything else.
+    try:
+        return raw_data.decode("utf-8")
+    except UnicodeDecodeError:
+        pass
+    import chardet
 
+    encoding = chardet.detect(raw_data)["encoding"]
+    if encoding:
         try:
-            if encoding:
-                html_content = raw_data.decode(encoding)
-            else:
-                html_content = raw_data.decode("utf-8", errors="replace")
-        except Exception as e:
-            click.secho(
-                f"Could not decode {file} with detected encoding '{encoding}': {e}",
-                fg="red",
-            )
-            return
+            return raw_data.decode(encoding)
+        except (LookupError, UnicodeDecodeError):
+            pass
+    return raw_data.decode("utf-8", errors="replace")
+
 
-        text_maker = html2text.HTML2Text()
-        text_maker.images_to_alt = True
-        text_maker.body_width = 0
-        original_md = text_maker.handle(html_content).strip()
-        output_path = os.path.join(path, f"{file_name}.md")
+def html_to_md(path: str):
+    files = [
+        f
+        for f in os.listdir(path)
+        if f.endswith(".html") and os.path.isfile(os.path.join(path, f))
+    ]
 
-        with open(output_path, "w", encoding="utf-8") as md_file:
-            md_file.write(original_md)
+    def _jobs():
+        for file in files:
+            file_name = os.path.splitext(file)[0]
+            try:
+                with open(os.path.join(path, file), "rb") as f:
+                    html_content = _decode_html(f.read())
+            except OSError as e:
+                yield ExportFailure(file, str(e))
+                continue
+            yield ExportJob(file, file_name, html=html_content)
 
-    click.secho("\nAll notes succesfully converted to Markdown", fg="green")
+    failures = _run_pipeline(path, len(files), _jobs(), ("md",))
+    if not failures:
+        click.secho("\nAll notes succesfully converted to Markdown", fg="green")
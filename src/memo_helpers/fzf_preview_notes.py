@@ -5,6 +5,8 @@ from pathlib import Path
 
 from memo_helpers.id_search_memo import id_search_memo, note_body_by_folder_title
 from memo_helpers.md_converter import md_converter
+from memo_helpers.preview_cache import preview_get, preview_key, preview_put
+from memo_helpers.tracing import span
 
 
 def _load_map(path: Path) -> dict[str, dict]:
@@ -17,7 +19,7 @@ def _load_map(path: Path) -> dict[str, dict]:
 
 
 def _cache_path(map_path: Path, key: str) -> Path:
-    # Keep cached previews next to the map file, inside a stable subdir.
+    # Session-only previews live next to the map file, inside a stable subdir.
     d = map_path.parent / "preview_cache_v1"
     d.mkdir(parents=True, exist_ok=True)
     safe_key = "".join(ch for ch in (key or "") if ch.isalnum() or ch in ("_", "-")) or "0"
@@ -26,18 +28,28 @@ def _cache_path(map_path: Path, key: str) -> Path:
 
 def _render_markdown(item: dict) -> str:
     note_id = item.get("note_id")
-    identifier = item.get("identifier")
     folder = item.get("folder") or ""
     title = item.get("title") or ""
     lookup_title = item.get("lookup_title")
+    pk = item.get("pk")
 
+    if isinstance(pk, int):
+        # Decode straight from NoteStore.sqlite when possible; AppleScript is the fallback.
+        try:
+            from memo_helpers.notes_body import get_note_body
+
+            body = get_note_body(pk)
+        except Exception:
+            body = None
+        if body is not None:
+            return body.to_markdown()
+
+    result = None
     if isinstance(note_id, str) and note_id.strip():
+        # Exact lookup: AppleScript listings return the id, and SQLite listings
+        # derive it from the store UUID and pk.
         result = id_search_memo(note_id.strip())
-    elif isinstance(identifier, str) and identifier.strip():
-        # For sqlite listings, `identifier` is best-effort. If it doesn't match
-        # AppleScript note ids on a given macOS version, we fall back.
-        result = id_search_memo(identifier.strip())
-    else:
+    if result is None or (getattr(result, "returncode", 1) != 0 and isinstance(pk, int)):
         # If our display title is a placeholder, try looking up by empty name.
         # This is best-effort and can still be ambiguous when multiple untitled notes exist.
         effective_title = title
@@ -45,18 +57,6 @@ def _render_markdown(item: dict) -> str:
             effective_title = lookup_title
         result = note_body_by_folder_title(str(folder), str(effective_title))
 
-    if getattr(result, "returncode", 1) != 0:
-        # If identifier-based lookup fails, try the folder/title fallback.
-        if (
-            not (isinstance(note_id, str) and note_id.strip())
-            and isinstance(identifier, str)
-            and identifier.strip()
-        ):
-            effective_title = title
-            if title == "(Untitled)" and isinstance(lookup_title, str):
-                effective_title = lookup_title
-            result = note_body_by_folder_title(str(folder), str(effective_title))
-
     if getattr(result, "returncode", 1) != 0:
         err = (getattr(result, "stderr", "") or "").strip()
         return f"(preview error)\n\n{err}" if err else "(preview error)"
@@ -65,6 +65,50 @@ def _render_markdown(item: dict) -> str:
     return md
 
 
+def _write_atomic(path: Path, text: str) -> None:
+    # Readers (fzf preview, prefetch workers) must never see a partial file.
+    import tempfile
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def cached_preview(map_path: Path, key: str, item: dict) -> str:
+    """
+    Return the rendered preview for `item`, rendering and caching it on a miss.
+
+    Items with a modification date use the persistent preview cache; others
+    are cached for the current session only, next to the map file.
+    """
+    persistent_key = preview_key(item)
+    if persistent_key is not None:
+        hit = preview_get(persistent_key)
+        if hit:
+            return hit
+        md = _render_markdown(item)
+        if not md.startswith("(preview error"):
+            preview_put(persistent_key, md)
+        return md
+
+    cache_key = item.get("cache_key")
+    cache = _cache_path(map_path, str(cache_key) if cache_key else key)
+    if cache.exists() and os.path.getsize(cache) > 0:
+        return cache.read_text(encoding="utf-8", errors="replace")
+
+    md = _render_markdown(item)
+    _write_atomic(cache, md)
+    return md
+
+
 def main(argv: list[str] | None = None) -> int:
     p = argparse.ArgumentParser(prog="python -m memo_helpers.fzf_preview_notes")
     p.add_argument("--map", required=True, help="Path to notes preview map JSON")
@@ -81,15 +125,8 @@ def main(argv: list[str] | None = None) -> int:
             print("(no preview)")
             return 0
 
-        cache_key = item.get("cache_key")
-        cache = _cache_path(map_path, str(cache_key) if cache_key else key)
-        if cache.exists() and os.path.getsize(cache) > 0:
-            print(cache.read_text(encoding="utf-8", errors="replace"))
-            return 0
-
-        md = _render_markdown(item)
-        cache.write_text(md, encoding="utf-8")
-        print(md)
+        with span("preview/render", key=key):
+            print(cached_preview(map_path, key, item))
         return 0
     except Exception as e:
         print(f"(preview error: {type(e).__name__})")
@@ -1,21 +1,11 @@
-import subprocess
 import click
 import datetime
-import os
-import time
 
+from memo_helpers.applescript import run_applescript
 
-def _maybe_timing(label: str, start: float) -> None:
-    if os.getenv("MEMO_TIMING") != "1":
-        return
-    ms = (time.perf_counter() - start) * 1000.0
-    click.echo(f"[timing] {label}: {ms:.1f}ms", err=True)
 
-
-def _run_osascript(script: str, label: str):
-    t0 = time.perf_counter()
-    result = subprocess.run(["osascript", "-e", script], capture_output=True, text=True)
-    _maybe_timing(label, t0)
+def _run_osascript(script: str, label: str, *args: str):
+    result = run_applescript(script, *args, label=label)
     if result.returncode != 0:
         msg = "AppleScript execution failed."
         if result.stderr.strip():
@@ -27,10 +17,10 @@ def _run_osascript(script: str, label: str):
 def get_note(folder: str = ""):
     # AppleScript string concatenation in loops (`set output to output & ...`)
     # becomes very slow at scale. Build a list of lines and join once.
-    folder_escaped = (folder or "").replace("\\", "\\\\").replace('"', '\\"')
     script = """
+	on run argv
 	    set deletedTranslations to {"Recently Deleted", "Nylig slettet", "Senast raderade", "Senest slettet", "Zuletzt gelöscht", "Supprimés récemment", "Eliminados recientemente", "Eliminati di recente", "Recent verwijderd", "Ostatnio usunięte", "Недавно удалённые", "Apagados recentemente", "Apagadas recentemente", "最近删除", "最近刪除", "最近削除した項目", "최근 삭제된 항목", "Son Silinenler", "Äskettäin poistetut", "Nedávno smazané", "Πρόσφατα διαγραμμένα", "Nemrég töröltek", "Șterse recent", "Nedávno vymazané", "เพิ่งลบ", "Đã xóa gần đây", "Нещодавно видалені"}
-	    set folderFilter to "__FOLDER__"
+	    set folderFilter to item 1 of argv
 	    set prevTIDs to AppleScript's text item delimiters
 	    set AppleScript's text item delimiters to linefeed
 	    set outLines to {}
@@ -50,10 +40,10 @@ def get_note(folder: str = ""):
 	    set output to outLines as text
 	    set AppleScript's text item delimiters to prevTIDs
 	    return output
-	    """
-    script = script.replace("__FOLDER__", folder_escaped)
+	end run
+	"""
 
-    stdout = _run_osascript(script, "get_note/osascript")
+    stdout = _run_osascript(script, "get_note/osascript", folder or "")
     notes_list = [
         line.split("|", 1) for line in stdout.strip().split("\n") if line
     ]
@@ -69,10 +59,10 @@ def get_note(folder: str = ""):
 
 
 def get_note_titles(folder: str = ""):
-    folder_escaped = (folder or "").replace("\\", "\\\\").replace('"', '\\"')
     script = """
+	on run argv
 	    set deletedTranslations to {"Recently Deleted", "Nylig slettet", "Senast raderade", "Senest slettet", "Zuletzt gelöscht", "Supprimés récemment", "Eliminados recientemente", "Eliminati di recente", "Recent verwijderd", "Ostatnio usunięte", "Недавно удалённые", "Apagados recentemente", "Apagadas recentemente", "最近删除", "最近刪除", "最近削除した項目", "최근 삭제된 항목", "Son Silinenler", "Äskettäin poistetut", "Nedávno smazané", "Πρόσφατα διαγραμμένα", "Nemrég töröltek", "Șterse recent", "Nedávno vymazané", "เพิ่งลบ", "Đã xóa gần đây", "Нещодавно видалені"}
-	    set folderFilter to "__FOLDER__"
+	    set folderFilter to item 1 of argv
 	    set prevTIDs to AppleScript's text item delimiters
 	    set AppleScript's text item delimiters to linefeed
 	    set outLines to {}
@@ -92,55 +82,82 @@ def get_note_titles(folder: str = ""):
 	    set output to outLines as text
 	    set AppleScript's text item delimiters to prevTIDs
 	    return output
-	    """
-    script = script.replace("__FOLDER__", folder_escaped)
+	end run
+	"""
 
-    stdout = _run_osascript(script, "get_note_titles/osascript")
+    stdout = _run_osascript(script, "get_note_titles/osascript", folder or "")
     titles = [line for line in stdout.strip().split("\n") if line]
     return titles
 
 
-def get_reminder():
-    click.secho("\nFetching reminders...", fg="yellow")
-    script = """
-    set output to ""
+_GET_REMINDERS_SCRIPT = """
+on run argv
+    set listFilter to item 1 of argv
+    set fieldSep to character id 31
+    set recordSep to character id 30
+    set prevTIDs to AppleScript's text item delimiters
+
     tell application "Reminders"
-        repeat with eachRem in reminders
-            if not completed of eachRem then
-                set nameRem to name of eachRem
-                set idRem to id of eachRem
-                set dueDateRem to due date of eachRem
-                if dueDateRem is not missing value then
-                    set timeStamp to (dueDateRem - (current date)) + (do shell script "date +%s") as real
-                else
-                    set timeStamp to "None"
-                end if
-                set output to output & idRem & "|" & nameRem & " -> " & timeStamp & "\\n"
-            end if
-        end repeat
+        -- One Apple Event per property for all open reminders, instead of one
+        -- per property per reminder.
+        if listFilter is "" then
+            set openRems to a reference to (reminders whose completed is false)
+        else
+            set openRems to a reference to (reminders of list listFilter whose completed is false)
+        end if
+        set remIds to id of openRems
+        set remNames to name of openRems
+        set remDues to due date of openRems
     end tell
+
+    -- Due dates go out as second offsets from this single reference date,
+    -- which is sent first; Python converts them to timestamps.
+    set refDate to current date
+    set outRecords to {((year of refDate) as text) & fieldSep & ((month of refDate as integer) as text) & fieldSep & ((day of refDate) as text) & fieldSep & ((time of refDate) as text)}
+    repeat with i from 1 to count of remIds
+        set dueDate to item i of remDues
+        if dueDate is missing value then
+            set offsetText to ""
+        else
+            set offsetText to (dueDate - refDate) as text
+        end if
+        set end of outRecords to (item i of remIds) & fieldSep & offsetText & fieldSep & (item i of remNames)
+    end repeat
+
+    set AppleScript's text item delimiters to recordSep
+    set output to outRecords as text
+    set AppleScript's text item delimiters to prevTIDs
     return output
+end run
+"""
+
+
+def _parse_reminders(stdout: str):
+    """Reminder records from _GET_REMINDERS_SCRIPT output."""
+    from memo_helpers.reminders_sqlite import Reminder
+
+    records = stdout.rstrip("\n").split("\x1e")
+    year, month, day, seconds = (int(x) for x in records[0].split("\x1f"))
+    ref = datetime.datetime(year, month, day) + datetime.timedelta(seconds=seconds)
+    ref_ts = ref.timestamp()
+    reminders = []
+    for record in records[1:]:
+        parts = record.split("\x1f", 2)
+        if len(parts) != 3:
+            continue
+        reminder_id, offset, title = parts
+        due = None
+        if offset:
+            # Large offsets come back as reals, with the locale's decimal mark.
+            due = ref_ts + float(offset.replace(",", "."))
+        reminders.append(Reminder(reminder_id=reminder_id, title=title, due=due))
+    return reminders
+
+
+def get_reminder(list_name: str = ""):
     """
-    result_stdout = _run_osascript(script, "get_reminder/osascript")
-    reminders_list = [
-        line.split("|") for line in result_stdout.strip().split("\n") if line
-    ]
-    reminders_map = {}
-    for i, (reminder_id, reminder_title) in enumerate(reminders_list):
-        parts = reminder_title.split("->")
-        title = parts[0].strip()
-        due_ts_raw = parts[1].strip()
-
-        if due_ts_raw != "None":
-            due_ts_clean = due_ts_raw.replace(",", ".")
-            try:
-                due_datetime = datetime.datetime.fromtimestamp(float(due_ts_clean))
-            except ValueError:
-                due_datetime = None
-        else:
-            due_datetime = datetime.datetime.today().strftime("%Y-%m-%d %H:%M:%S")
-
-        reminders_map[i + 1] = (reminder_id, title, due_datetime)
-
-    reminders_list = [f"{v[1]} | {v[2]}" for v in reminders_map.values()]
-    return [reminders_map, reminders_list]
+    Incomplete reminders via AppleScript, as reminders_sqlite.Reminder records.
+    `list_name` limits them to one list.
+    """
+    stdout = _run_osascript(_GET_REMINDERS_SCRIPT, "get_reminder/osascript", list_name)
+    return _parse_reminders(stdout)
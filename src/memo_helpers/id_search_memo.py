@@ -1,38 +1,131 @@
+import os
 import subprocess
+import uuid
+from dataclasses import dataclass
 
+from memo_helpers.applescript import run_applescript
 
-def _escape_applescript_string(s: str) -> str:
-    # AppleScript string literal escaping for inclusion inside double quotes.
-    return (s or "").replace("\\", "\\\\").replace('"', '\\"')
 
+_BODY_BY_ID_SCRIPT = """
+    on run argv
+        tell application "Notes"
+            return body of note id (item 1 of argv)
+        end tell
+    end run
+    """
 
-def id_search_memo(note_id: str) -> subprocess.CompletedProcess:
-    script = f"""
+_BODY_BY_FOLDER_TITLE_SCRIPT = """
+    on run argv
+        set folderName to item 1 of argv
+        set noteName to item 2 of argv
         tell application "Notes"
-            set selectedNote to first note whose id is "{note_id}"
+            if folderName is "" then
+                set selectedNote to first note whose name is noteName
+            else
+                set theFolder to first folder whose name is folderName
+                set selectedNote to first note of theFolder whose name is noteName
+            end if
             return body of selectedNote
         end tell
-        """
-    result = subprocess.run(["osascript", "-e", script], capture_output=True, text=True)
-    return result
+    end run
+    """
+
+
+def id_search_memo(note_id: str) -> subprocess.CompletedProcess:
+    return run_applescript(_BODY_BY_ID_SCRIPT, note_id, label="id_search_memo/osascript")
 
 
 def note_body_by_folder_title(folder: str, title: str) -> subprocess.CompletedProcess:
-    folder_escaped = _escape_applescript_string(folder)
-    title_escaped = _escape_applescript_string(title)
-    if folder_escaped:
-        script = f"""
-            tell application "Notes"
-                set theFolder to first folder whose name is "{folder_escaped}"
-                set selectedNote to first note of theFolder whose name is "{title_escaped}"
-                return body of selectedNote
-            end tell
-        """
-    else:
-        script = f"""
-            tell application "Notes"
-                set selectedNote to first note whose name is "{title_escaped}"
-                return body of selectedNote
-            end tell
-        """
-    return subprocess.run(["osascript", "-e", script], capture_output=True, text=True)
+    return run_applescript(
+        _BODY_BY_FOLDER_TITLE_SCRIPT,
+        folder or "",
+        title or "",
+        label="note_body_by_folder_title/osascript",
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class NoteBodyResult:
+    note_id: str
+    # HTML body, or None when the note could not be read.
+    body: str | None
+    error: str | None = None
+
+
+# Each note is framed as "<boundary> ok|error <id>\n<body or message>\n".
+# The boundary is random per call, so note HTML can't collide with it.
+_BATCH_BODY_SCRIPT = """
+on run argv
+    set boundary to item 1 of argv
+    set outParts to {}
+    tell application "Notes"
+        repeat with i from 2 to count of argv
+            set noteId to item i of argv
+            try
+                set noteBody to body of note id noteId
+                set end of outParts to (boundary & " ok " & noteId & linefeed & noteBody & linefeed)
+            on error errMsg
+                set end of outParts to (boundary & " error " & noteId & linefeed & errMsg & linefeed)
+            end try
+        end repeat
+    end tell
+    set prevTIDs to AppleScript's text item delimiters
+    set AppleScript's text item delimiters to ""
+    set output to outParts as text
+    set AppleScript's text item delimiters to prevTIDs
+    return output
+end run
+"""
+
+
+def batch_size() -> int:
+    raw = os.getenv("MEMO_BODY_BATCH_SIZE", "50")
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        return 50
+
+
+def _parse_body_frames(stdout: str, boundary: str) -> dict[str, NoteBodyResult]:
+    # osascript terminates its output with a newline of its own.
+    if stdout.endswith("\n"):
+        stdout = stdout[:-1]
+    out: dict[str, NoteBodyResult] = {}
+    for frame in stdout.split(f"{boundary} ")[1:]:
+        header, _, payload = frame.partition("\n")
+        status, _, note_id = header.partition(" ")
+        if payload.endswith("\n"):
+            payload = payload[:-1]
+        if status == "ok":
+            out[note_id] = NoteBodyResult(note_id, payload)
+        else:
+            out[note_id] = NoteBodyResult(note_id, None, payload.strip() or "unknown error")
+    return out
+
+
+def get_note_bodies(ids: list[str], chunk_size: int | None = None) -> list[NoteBodyResult]:
+    """
+    Fetch many note bodies with one osascript call per chunk of ids.
+
+    Results come back in the order of `ids`. A note that can't be read gets an
+    error result instead of failing the whole batch.
+    """
+    size = chunk_size or batch_size()
+    results: dict[str, NoteBodyResult] = {}
+    for start in range(0, len(ids), size):
+        chunk = ids[start : start + size]
+        boundary = f"--memo-{uuid.uuid4().hex}"
+        result = run_applescript(
+            _BATCH_BODY_SCRIPT, boundary, *chunk, label="get_note_bodies/osascript"
+        )
+        if result.returncode != 0:
+            err = (result.stderr or "").strip() or "AppleScript execution failed."
+            for note_id in chunk:
+                results[note_id] = NoteBodyResult(note_id, None, err)
+            continue
+        results.update(_parse_body_frames(result.stdout, boundary))
+
+    return [
+        results.get(note_id) or NoteBodyResult(note_id, None, "no result returned")
+        for note_id in ids
+    ]
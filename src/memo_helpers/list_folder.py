@@ -1,16 +1,20 @@
-import subprocess
 import click
-import os
-import time
+
+from memo_helpers.applescript import run_applescript
+from memo_helpers.tracing import span
 
 FOLDER_SEPARATOR = "|||"
 
 
-def _maybe_timing(label: str, start: float) -> None:
-    if os.getenv("MEMO_TIMING") != "1":
+def _raise_for_applescript_error(result) -> None:
+    if result.returncode == 0:
         return
-    ms = (time.perf_counter() - start) * 1000.0
-    click.echo(f"[timing] {label}: {ms:.1f}ms", err=True)
+    stderr = (result.stderr or "").strip()
+    if stderr:
+        raise click.ClickException(f"AppleScript execution failed.\n\n{stderr}")
+    raise click.ClickException(
+        f"AppleScript execution failed: exit status {result.returncode}"
+    )
 
 
 def _build_tree(folders_with_parents):
@@ -48,28 +52,11 @@ def notes_folder_names():
     set AppleScript's text item delimiters to prevTIDs
     return output
     """
-    try:
-        t0 = time.perf_counter()
-        result = subprocess.run(
-            ["osascript", "-e", script], capture_output=True, text=True, check=True
-        )
-        _maybe_timing("notes_folder_names/osascript", t0)
-        t_parse = time.perf_counter()
+    result = run_applescript(script, label="notes_folder_names/osascript")
+    _raise_for_applescript_error(result)
+    with span("notes_folder_names/parse_lines"):
         raw = result.stdout.strip()
-        if not raw:
-            return []
-        out = [line.strip() for line in raw.split("\n") if line.strip()]
-        _maybe_timing("notes_folder_names/parse_lines", t_parse)
-        return out
-    except subprocess.CalledProcessError as e:
-        stderr = ""
-        try:
-            stderr = (e.stderr or "").strip()
-        except Exception:
-            stderr = ""
-        if stderr:
-            raise click.ClickException(f"AppleScript execution failed.\n\n{stderr}")
-        raise click.ClickException(f"AppleScript execution failed: {e}")
+        return [line.strip() for line in raw.split("\n") if line.strip()]
 
 
 def notes_folders_with_parents() -> list[tuple[str, str]]:
@@ -108,33 +95,15 @@ def notes_folders_with_parents() -> list[tuple[str, str]]:
     return output
     """
 
-    try:
-        t0 = time.perf_counter()
-        result = subprocess.run(
-            ["osascript", "-e", script], capture_output=True, text=True, check=True
-        )
-        _maybe_timing("notes_folders/osascript", t0)
-        t_parse = time.perf_counter()
-        raw = result.stdout.strip()
-        if not raw:
-            return []
-
+    result = run_applescript(script, label="notes_folders/osascript")
+    _raise_for_applescript_error(result)
+    with span("notes_folders/parse_pairs"):
         folders_with_parents = []
-        for line in raw.split("\n"):
+        for line in result.stdout.strip().split("\n"):
             if FOLDER_SEPARATOR in line:
                 name, parent = line.split(FOLDER_SEPARATOR, 1)
                 folders_with_parents.append((name.strip(), parent.strip()))
-        _maybe_timing("notes_folders/parse_pairs", t_parse)
-        return folders_with_parents
-    except subprocess.CalledProcessError as e:
-        stderr = ""
-        try:
-            stderr = (e.stderr or "").strip()
-        except Exception:
-            stderr = ""
-        if stderr:
-            raise click.ClickException(f"AppleScript execution failed.\n\n{stderr}")
-        raise click.ClickException(f"AppleScript execution failed: {e}")
+    return folders_with_parents
 
 
 def render_folder_tree(folders_with_parents: list[tuple[str, str]]) -> str:
@@ -144,13 +113,12 @@ def render_folder_tree(folders_with_parents: list[tuple[str, str]]) -> str:
     This is used for both AppleScript and sqlite backends to guarantee identical
     ordering and formatting between backends.
     """
-    t_render = time.perf_counter()
-    children = _build_tree(folders_with_parents)
-    # Ensure stable, backend-independent ordering.
-    for parent, names in children.items():
-        names.sort(key=str.casefold)
-    lines = _render_tree(children)
-    _maybe_timing("notes_folders/render_tree", t_render)
+    with span("notes_folders/render_tree"):
+        children = _build_tree(folders_with_parents)
+        # Ensure stable, backend-independent ordering.
+        for parent, names in children.items():
+            names.sort(key=str.casefold)
+        lines = _render_tree(children)
     return "\n".join(lines)
 
 
@@ -1,11 +1,13 @@
-import html2text
-
-
-def md_converter(id_search_result):
-    original_html = id_search_result.stdout.strip()
+def html_to_markdown(html: str) -> str:
+    import html2text
 
     text_maker = html2text.HTML2Text()
     text_maker.images_to_alt = True
     text_maker.body_width = 0
-    original_md = text_maker.handle(original_html).strip()
+    return text_maker.handle(html).strip()
+
+
+def md_converter(id_search_result):
+    original_html = id_search_result.stdout.strip()
+    original_md = html_to_markdown(original_html)
     return [original_md, original_html]
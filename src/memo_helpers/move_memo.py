@@ -1,57 +1,71 @@
-import subprocess
 import click
-import html2text
-from memo_helpers.id_search_memo import id_search_memo
+from memo_helpers.applescript import run_batch
+from memo_helpers.notes_provider import invalidate_notes_cache
 
-
-def move_note(note_id: str, target_folder: str):
-    result = id_search_memo(note_id)
-    original_html = result.stdout.strip()
-
-    text_maker = html2text.HTML2Text()
-    text_maker.body_width = 0
-
-    if "<img" in original_html or "<enclosure" in original_html:
-        click.secho(
-            "\n⚠️  Warning: This note contains images or attachments that could be lost!",
-            fg="yellow",
-        )
-        if not click.confirm("\nDo you still want to continue moving the note?"):
-            return
-
-    script = f'''
-    tell application "Notes"
-        set noteToMove to missing value
-        set noteName to ""
-        set noteBody to ""
-        set accToUse to missing value
-        repeat with acc in accounts
-            repeat with f in folders of acc
+# Moves any number of notes in one osascript run (argv: target folder, then note
+# ids). Each note is addressed by id directly and moved with Notes' own `move`,
+# which keeps its attachments, creation date and id. The target folder is looked
+# up (or created) once per account. See applescript.run_batch() for the result
+# format.
+_MOVE_NOTES_SCRIPT = """
+    on run argv
+        set targetFolder to item 1 of argv
+        set results to {}
+        set accountIds to {}
+        set destinations to {}
+        tell application "Notes"
+            repeat with noteId in rest of argv
                 try
-                    set n to first note of f whose id is "{note_id}"
-                    set noteToMove to n
-                    set noteName to name of n
-                    set noteBody to body of n
-                    set accToUse to acc
-                    exit repeat
+                    set theNote to note id (contents of noteId)
+                    set acc to container of theNote
+                    repeat while class of acc is folder
+                        set acc to container of acc
+                    end repeat
+                    set accId to id of acc
+                    set destinationFolder to missing value
+                    repeat with k from 1 to count of accountIds
+                        if item k of accountIds is accId then set destinationFolder to item k of destinations
+                    end repeat
+                    if destinationFolder is missing value then
+                        try
+                            set destinationFolder to folder targetFolder of acc
+                        on error
+                            set destinationFolder to make new folder with properties {name:targetFolder} at acc
+                        end try
+                        set end of accountIds to accId
+                        set end of destinations to destinationFolder
+                    end if
+                    move theNote to destinationFolder
+                    set end of results to "ok"
+                on error errMsg
+                    set end of results to "!" & errMsg
                 end try
             end repeat
-            if noteToMove is not missing value then exit repeat
-        end repeat
-        if noteToMove is not missing value then
-            set destinationFolder to missing value
-            try
-                set destinationFolder to folder "{target_folder}" of accToUse
-            on error
-                set destinationFolder to make new folder with properties {{name:"{target_folder}"}} at accToUse
-            end try
-            make new note at destinationFolder with properties {{name:noteName, body:noteBody}}
-            delete noteToMove
-        end if
-    end tell
-    '''
-    result = subprocess.run(["osascript", "-e", script], capture_output=True, text=True)
-    if result.returncode == 0:
-        click.secho(f'\n✅ The note was moved to "{target_folder}" folder.', fg="green")
-    else:
-        click.secho(f"\n❌ Error while moving: {result.stderr}", fg="red")
+        end tell
+        set AppleScript's text item delimiters to (character id 30)
+        return results as text
+    end run
+    """
+
+
+def move_notes(note_ids, target_folder: str, titles=None):
+    """
+    Move notes to `target_folder` (in each note's account, created when
+    missing) in one AppleScript call and report the outcome per note.
+    Returns {id: None or error message}.
+    """
+    if not note_ids:
+        return {}
+    results = run_batch(
+        _MOVE_NOTES_SCRIPT, note_ids, target_folder, label="move_notes/osascript"
+    )
+    failed = {i: e for i, e in results.items() if e is not None}
+    moved = len(results) - len(failed)
+    if moved:
+        invalidate_notes_cache()
+        what = "The note was" if len(results) == 1 else f"{moved} notes were"
+        click.secho(f'\n✅ {what} moved to "{target_folder}" folder.', fg="green")
+    for note_id, error in failed.items():
+        name = (titles or {}).get(note_id) or note_id
+        click.secho(f"\n❌ Error while moving {name}: {error}", fg="red")
+    return results
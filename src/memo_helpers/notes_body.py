@@ -0,0 +1,385 @@
+import gzip
+import os
+import re
+import sqlite3
+import zlib
+from dataclasses import dataclass, field
+
+from memo_helpers.apple_sqlite import open_readonly
+from memo_helpers.notes_sqlite import store_path
+from memo_helpers.tracing import count, span
+
+# Decoder for note bodies stored in NoteStore.sqlite (ZICNOTEDATA.ZDATA).
+#
+# ZDATA is a gzipped protobuf. Only the parts needed for text + basic formatting
+# are decoded; the relevant (private, reverse-engineered) schema is:
+#
+#   NoteStoreProto { Document document = 2; }
+#   Document       { Note note = 3; }
+#   Note           { string note_text = 2; repeated AttributeRun attribute_run = 5; }
+#   AttributeRun   { int32 length = 1; ParagraphStyle paragraph_style = 2;
+#                    int32 font_weight = 5; int32 underlined = 6;
+#                    int32 strikethrough = 7; string link = 9;
+#                    AttachmentInfo attachment_info = 12; }
+#   ParagraphStyle { int32 style_type = 1; int32 indent_amount = 4;
+#                    Checklist checklist = 5; int32 block_quote = 8; }
+#   Checklist      { bytes uuid = 1; int32 done = 2; }
+#
+# Run lengths count UTF-16 code units, like NSString.
+
+STYLE_TITLE = 0
+STYLE_HEADING = 1
+STYLE_SUBHEADING = 2
+STYLE_MONOSPACED = 4
+STYLE_DOTTED_LIST = 100
+STYLE_DASHED_LIST = 101
+STYLE_NUMBERED_LIST = 102
+STYLE_CHECKLIST = 103
+
+_ATTACHMENT_CHAR = "￼"
+
+
+@dataclass(frozen=True, slots=True)
+class AttributeRun:
+    length: int
+    style_type: int | None = None
+    indent: int = 0
+    # None when the paragraph is not a checklist item.
+    checked: bool | None = None
+    quote: bool = False
+    bold: bool = False
+    italic: bool = False
+    underline: bool = False
+    strikethrough: bool = False
+    link: str | None = None
+    attachment_uti: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class TextSpan:
+    text: str
+    run: AttributeRun
+
+
+@dataclass(slots=True)
+class NoteBody:
+    text: str
+    runs: list[AttributeRun] = field(default_factory=list)
+
+    @property
+    def has_attachments(self) -> bool:
+        """
+        True when the note embeds images, scans, tables or other attachments.
+        They are only rendered as "[attachment]" here, so exports take the
+        AppleScript HTML for these notes instead.
+        """
+        return _ATTACHMENT_CHAR in self.text or any(
+            r.attachment_uti is not None for r in self.runs
+        )
+
+    def spans(self) -> list[TextSpan]:
+        """Split `text` into spans carrying their attribute run."""
+        units = self.text.encode("utf-16-le")
+        out: list[TextSpan] = []
+        pos = 0
+        for run in self.runs:
+            if pos >= len(units):
+                break
+            end = min(len(units), pos + 2 * max(0, run.length))
+            out.append(TextSpan(units[pos:end].decode("utf-16-le", errors="replace"), run))
+            pos = end
+        if pos < len(units):
+            out.append(TextSpan(units[pos:].decode("utf-16-le", errors="replace"), AttributeRun(0)))
+        return out
+
+    def paragraphs(self) -> list[list[TextSpan]]:
+        """Group spans into lines; a line's paragraph style is its first span's."""
+        lines: list[list[TextSpan]] = [[]]
+        for span in self.spans():
+            parts = span.text.split("\n")
+            for i, part in enumerate(parts):
+                if i:
+                    lines.append([])
+                if part:
+                    lines[-1].append(TextSpan(part, span.run))
+        if lines and not lines[-1]:
+            lines.pop()
+        return lines
+
+    def to_markdown(self) -> str:
+        # Every line of a note is its own paragraph, like the <div>s in the
+        # HTML Notes.app produces; only consecutive list items stay together.
+        blocks: list[str] = []
+        code: list[str] | None = None
+        prev: AttributeRun | None = None
+        number = 0
+        for line in self.paragraphs():
+            style = line[0].run if line else AttributeRun(0)
+            if style.style_type == STYLE_MONOSPACED:
+                if code is None:
+                    code = []
+                    blocks.append("")
+                code.append("".join(s.text for s in line))
+                blocks[-1] = "```\n" + "\n".join(code) + "\n```"
+                prev = None
+                continue
+            code = None
+
+            number = number + 1 if style.style_type == STYLE_NUMBERED_LIST else 0
+            text = "".join(_inline_markdown(s) for s in line)
+            if not text.strip():
+                prev = None
+                continue
+            text = _escape_line_start(text)
+            indent = "  " * style.indent
+            if style.style_type == STYLE_TITLE:
+                prefix = "# "
+            elif style.style_type == STYLE_HEADING:
+                prefix = "## "
+            elif style.style_type == STYLE_SUBHEADING:
+                prefix = "### "
+            elif style.style_type in (STYLE_DOTTED_LIST, STYLE_DASHED_LIST):
+                prefix = f"{indent}- "
+            elif style.style_type == STYLE_NUMBERED_LIST:
+                prefix = f"{indent}{number}. "
+            elif style.style_type == STYLE_CHECKLIST:
+                prefix = f"{indent}- [{'x' if style.checked else ' '}] "
+            else:
+                prefix = ""
+            if style.quote:
+                prefix = f"> {prefix}"
+            md = f"{prefix}{text}"
+            if prev is not None and _is_list(prev) and _is_list(style) and prev.quote == style.quote:
+                blocks[-1] += "\n" + md
+            elif prev is not None and prev.quote and style.quote:
+                blocks[-1] += "\n>\n" + md
+            else:
+                blocks.append(md)
+            prev = style
+        return "\n\n".join(blocks).strip()
+
+    def to_html(self) -> str:
+        import mistune
+
+        return mistune.markdown(self.to_markdown())
+
+
+def _is_list(run: AttributeRun) -> bool:
+    return run.style_type in (
+        STYLE_DOTTED_LIST,
+        STYLE_DASHED_LIST,
+        STYLE_NUMBERED_LIST,
+        STYLE_CHECKLIST,
+    )
+
+
+# Note text is literal, so anything Markdown would read as markup is escaped.
+_MARKDOWN_SPECIALS = re.compile(r"([\\`*_\[\]<>~&|])")
+_BLOCK_START = re.compile(r"^(\s*)(\d+(?=[.)])|[#+=-])")
+
+
+def _escape_markdown(text: str) -> str:
+    return _MARKDOWN_SPECIALS.sub(r"\\\1", text)
+
+
+def _escape_line_start(text: str) -> str:
+    # Headings, quotes, list markers and setext underlines only count at the
+    # start of a line.
+    m = _BLOCK_START.match(text)
+    if m is None:
+        return text
+    end = m.end()
+    if m.group(2)[0].isdigit():
+        return f"{text[:end]}\\{text[end:]}"
+    return f"{text[:m.start(2)]}\\{text[m.start(2):]}"
+
+
+def _inline_markdown(span: TextSpan) -> str:
+    text = span.text
+    run = span.run
+    if run.attachment_uti is not None or text == _ATTACHMENT_CHAR:
+        return "[attachment]"
+    stripped = text.strip()
+    if not stripped:
+        return text
+    lead = text[: len(text) - len(text.lstrip())]
+    trail = text[len(text.rstrip()) :]
+    stripped = _escape_markdown(stripped)
+    if run.bold and run.italic:
+        stripped = f"***{stripped}***"
+    elif run.bold:
+        stripped = f"**{stripped}**"
+    elif run.italic:
+        stripped = f"*{stripped}*"
+    if run.strikethrough:
+        stripped = f"~~{stripped}~~"
+    if run.link:
+        stripped = f"[{stripped}]({run.link})"
+    return f"{lead}{stripped}{trail}"
+
+
+def _read_varint(buf: bytes, pos: int) -> tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        if pos >= len(buf):
+            raise ValueError("Truncated varint")
+        b = buf[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if not b & 0x80:
+            return result, pos
+        shift += 7
+        if shift > 63:
+            raise ValueError("Varint too long")
+
+
+def _fields(buf: bytes):
+    """Yield (field_number, value) for a protobuf message; value is int or bytes."""
+    pos = 0
+    while pos < len(buf):
+        key, pos = _read_varint(buf, pos)
+        number, wire_type = key >> 3, key & 0x7
+        if wire_type == 0:
+            value, pos = _read_varint(buf, pos)
+        elif wire_type == 1:
+            value, pos = int.from_bytes(buf[pos : pos + 8], "little"), pos + 8
+        elif wire_type == 2:
+            size, pos = _read_varint(buf, pos)
+            value, pos = buf[pos : pos + size], pos + size
+        elif wire_type == 5:
+            value, pos = int.from_bytes(buf[pos : pos + 4], "little"), pos + 4
+        else:
+            raise ValueError(f"Unsupported wire type {wire_type}")
+        if pos > len(buf):
+            raise ValueError("Truncated message")
+        yield number, value
+
+
+def _first(buf: bytes, number: int):
+    for n, v in _fields(buf):
+        if n == number:
+            return v
+    return None
+
+
+def _decode_run(buf: bytes) -> AttributeRun:
+    length = 0
+    style_type = None
+    indent = 0
+    checked = None
+    quote = False
+    weight = 0
+    underline = strikethrough = False
+    link = None
+    attachment_uti = None
+    for n, v in _fields(buf):
+        if n == 1 and isinstance(v, int):
+            length = v
+        elif n == 2 and isinstance(v, bytes):
+            for pn, pv in _fields(v):
+                if pn == 1 and isinstance(pv, int):
+                    style_type = pv
+                elif pn == 4 and isinstance(pv, int):
+                    indent = pv
+                elif pn == 5 and isinstance(pv, bytes):
+                    done = _first(pv, 2)
+                    checked = bool(done)
+                elif pn == 8 and isinstance(pv, int):
+                    quote = bool(pv)
+        elif n == 5 and isinstance(v, int):
+            weight = v
+        elif n == 6 and isinstance(v, int):
+            underline = bool(v)
+        elif n == 7 and isinstance(v, int):
+            strikethrough = bool(v)
+        elif n == 9 and isinstance(v, bytes):
+            link = v.decode("utf-8", errors="replace")
+        elif n == 12 and isinstance(v, bytes):
+            uti = _first(v, 2)
+            attachment_uti = uti.decode("utf-8", errors="replace") if isinstance(uti, bytes) else ""
+    return AttributeRun(
+        length=length,
+        style_type=style_type,
+        indent=indent,
+        checked=checked,
+        quote=quote,
+        bold=weight in (1, 3),
+        italic=weight in (2, 3),
+        underline=underline,
+        strikethrough=strikethrough,
+        link=link,
+        attachment_uti=attachment_uti,
+    )
+
+
+def decode_note_data(blob: bytes) -> NoteBody:
+    """Decode a raw ZICNOTEDATA.ZDATA value (gzip/zlib-compressed protobuf)."""
+    data = bytes(blob)
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    elif data[:1] == b"\x78":
+        data = zlib.decompress(data)
+
+    document = _first(data, 2)
+    note = _first(document, 3) if isinstance(document, bytes) else None
+    if not isinstance(note, bytes):
+        raise ValueError("No note in ZDATA")
+
+    text = ""
+    runs: list[AttributeRun] = []
+    for n, v in _fields(note):
+        if n == 2 and isinstance(v, bytes):
+            text = v.decode("utf-8", errors="replace")
+        elif n == 5 and isinstance(v, bytes):
+            runs.append(_decode_run(v))
+    return NoteBody(text=text, runs=runs)
+
+
+def _note_data_query(con: sqlite3.Connection) -> str:
+    cols = {r["name"] for r in con.execute("PRAGMA table_info(ZICNOTEDATA)").fetchall()}
+    if "ZNOTE" in cols:
+        return "select ZDATA as data from ZICNOTEDATA where ZNOTE = ?"
+    # Older schema variant: the note points at its data row instead.
+    return """
+        select d.ZDATA as data
+        from ZICCLOUDSYNCINGOBJECT n
+        join ZICNOTEDATA d on d.Z_PK = n.ZNOTEDATA
+        where n.Z_PK = ?
+    """
+
+
+def iter_note_bodies(pks: list[int]):
+    """
+    Yield (pk, NoteBody | None) for each pk, reading from one connection.
+
+    None means the body is missing or could not be decoded (e.g. locked notes);
+    callers should fall back to AppleScript for those.
+    """
+    db_path = store_path()
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(db_path)
+
+    con = open_readonly(db_path)
+    try:
+        q = _note_data_query(con)
+        for pk in pks:
+            with span("notes_body/decode"):
+                row = con.execute(q, (pk,)).fetchone()
+                body = None
+                if row is not None and row["data"]:
+                    count("notes_body/bytes", len(row["data"]))
+                    try:
+                        body = decode_note_data(row["data"])
+                    except Exception:
+                        body = None
+            yield pk, body
+    finally:
+        con.close()
+
+
+def get_note_body(pk: int) -> NoteBody | None:
+    """Decode one note body straight from NoteStore.sqlite (no AppleScript)."""
+    for _, body in iter_note_bodies([pk]):
+        return body
+    return None
@@ -0,0 +1,264 @@
+import re
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from memo_helpers.cache import cache_dir, ttl_seconds
+from memo_helpers.tracing import count, traced
+
+# Full-text index over note bodies for `memo notes --grep`.
+#
+# An FTS5 table in the cache dir holds the plain text of every note. It is
+# refreshed incrementally: a note is re-read only when its modification date in
+# NoteStore.sqlite changed. AppleScript listings carry no dates, so their notes
+# are re-read once they're older than the cache TTL.
+
+
+# Stale notes are committed in batches of this size, so an update cut short (e.g.
+# the background refresh while fzf is open) keeps its progress.
+_COMMIT_EVERY = 200
+
+
+def _index_path() -> Path:
+    return cache_dir() / "notes_fts_v1.sqlite"
+
+
+@dataclass(frozen=True, slots=True)
+class IndexHit:
+    folder: str
+    title: str
+    snippet: str
+    pk: int | None = None
+    note_id: str | None = None
+
+
+def _connect() -> sqlite3.Connection:
+    p = _index_path()
+    p.parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(p, timeout=1.0)
+    con.row_factory = sqlite3.Row
+    con.execute("pragma journal_mode=wal")
+    con.execute("pragma synchronous=normal")
+    con.executescript(
+        """
+        create table if not exists docs (
+            id integer primary key,
+            key text not null unique,
+            folder text not null,
+            title text not null,
+            pk integer,
+            note_id text,
+            modified real,
+            indexed_at real not null
+        );
+        create virtual table if not exists docs_fts using fts5(
+            title, folder, body, tokenize = 'unicode61 remove_diacritics 2'
+        );
+        create table if not exists meta (k text primary key, v text);
+        """
+    )
+    return con
+
+
+def note_key(note: dict) -> str | None:
+    """Stable key for a listed note, shared by the index and its callers."""
+    if note.get("identifier"):
+        return f"id:{note['identifier']}"
+    if note.get("pk") is not None:
+        return f"pk:{note['pk']}"
+    if note.get("note_id"):
+        return f"as:{note['note_id']}"
+    return None
+
+
+def _fetch_texts(notes: list[dict], allow_applescript: bool):
+    """
+    Yield (note, plain text | None) for `notes`.
+
+    Bodies are decoded from NoteStore.sqlite when a note has a pk. Notes
+    without one, and notes that fail to decode, are read through AppleScript
+    when `allow_applescript` (and they have a note id); others are skipped.
+    """
+    from memo_helpers.md_converter import html_to_markdown
+    from memo_helpers.id_search_memo import get_note_bodies
+
+    with_pk = [n for n in notes if n.get("pk") is not None]
+    with_id = [n for n in notes if n.get("pk") is None and n.get("note_id")]
+    if with_pk:
+        from memo_helpers.notes_body import iter_note_bodies
+
+        for note, (_pk, body) in zip(with_pk, iter_note_bodies([n["pk"] for n in with_pk])):
+            if body is None and allow_applescript and note.get("note_id"):
+                with_id.append(note)
+                continue
+            yield note, body.text if body is not None else None
+    if not allow_applescript:
+        return
+    if with_id:
+        for note, result in zip(with_id, get_note_bodies([n["note_id"] for n in with_id])):
+            yield note, html_to_markdown(result.body) if result.body is not None else None
+
+
+@traced("notes_index/update")
+def update_index(
+    notes: list[dict],
+    *,
+    prune: bool = True,
+    fingerprint: str | None = None,
+    allow_applescript: bool = True,
+) -> int:
+    """
+    Bring the index up to date with `notes` (from list_notes_meta).
+
+    Only new or modified notes have their bodies read. With `prune`, notes
+    missing from `notes` are dropped; pass False for folder-filtered listings.
+    When `fingerprint` (of the store) matches the last complete update, nothing
+    is read at all. Returns the number of notes (re)indexed.
+    """
+    con = _connect()
+    try:
+        if fingerprint is not None and prune:
+            row = con.execute("select v from meta where k = 'fingerprint'").fetchone()
+            if row is not None and row["v"] == fingerprint:
+                count("notes_index/up_to_date")
+                return 0
+
+        known = {
+            r["key"]: (r["id"], r["modified"], r["indexed_at"])
+            for r in con.execute("select id, key, modified, indexed_at from docs")
+        }
+        now = time.time()
+        ttl = ttl_seconds()
+        stale: list[dict] = []
+        seen: set[str] = set()
+        for note in notes:
+            key = note_key(note)
+            if key is None:
+                continue
+            seen.add(key)
+            entry = known.get(key)
+            if entry is not None:
+                _id, modified, indexed_at = entry
+                if note.get("modified") is not None:
+                    if modified == note["modified"]:
+                        continue
+                elif now - indexed_at < ttl:
+                    continue
+            stale.append(note)
+        count("notes_index/stale", len(stale))
+
+        indexed = 0
+        with con:
+            if prune:
+                gone = [known[k][0] for k in known.keys() - seen]
+                con.executemany("delete from docs where id = ?", [(i,) for i in gone])
+                con.executemany("delete from docs_fts where rowid = ?", [(i,) for i in gone])
+            for note, text in _fetch_texts(stale, allow_applescript):
+                if text is None:
+                    continue
+                key = note_key(note)
+                folder = str(note.get("folder_path") or note.get("folder") or "")
+                title = str(note.get("title") or "")
+                old = known.get(key)
+                if old is not None:
+                    con.execute("delete from docs_fts where rowid = ?", (old[0],))
+                cur = con.execute(
+                    """
+                    insert into docs(key, folder, title, pk, note_id, modified, indexed_at)
+                    values (?, ?, ?, ?, ?, ?, ?)
+                    on conflict(key) do update set
+                        folder = excluded.folder,
+                        title = excluded.title,
+                        pk = excluded.pk,
+                        note_id = excluded.note_id,
+                        modified = excluded.modified,
+                        indexed_at = excluded.indexed_at
+                    returning id
+                    """,
+                    (key, folder, title, note.get("pk"), note.get("note_id"), note.get("modified"), now),
+                )
+                doc_id = cur.fetchone()["id"]
+                con.execute(
+                    "insert into docs_fts(rowid, title, folder, body) values (?, ?, ?, ?)",
+                    (doc_id, title, folder, text),
+                )
+                indexed += 1
+                if indexed % _COMMIT_EVERY == 0:
+                    con.commit()
+            # Only once every stale note made it in; otherwise the next run
+            # would skip the ones that failed.
+            if fingerprint is not None and prune and indexed == len(stale):
+                con.execute(
+                    "insert or replace into meta(k, v) values ('fingerprint', ?)", (fingerprint,)
+                )
+    finally:
+        con.close()
+    return indexed
+
+
+def _quote_terms(query: str) -> str:
+    # Fallback for input that isn't valid FTS5 syntax: match every word literally.
+    terms = re.findall(r"\w+", query)
+    return " ".join('"' + t.replace('"', '""') + '"' for t in terms)
+
+
+@traced("notes_index/search")
+def search_index(query: str, folder: str = "", limit: int = 20) -> list[IndexHit]:
+    """Ranked hits for `query`; titles weigh more than folder names and bodies."""
+    folder_filter = (folder or "").strip()
+    con = _connect()
+    try:
+        q = """
+        select d.folder, d.title, d.pk, d.note_id,
+               snippet(docs_fts, 2, '[', ']', '…', 12) as snippet
+        from docs_fts
+        join docs d on d.id = docs_fts.rowid
+        where docs_fts match ?
+          and (? = '' or instr(d.folder, ?) > 0)
+        order by bm25(docs_fts, 10.0, 2.0, 1.0)
+        limit ?
+        """
+        try:
+            rows = con.execute(q, (query, folder_filter, folder_filter, limit)).fetchall()
+        except sqlite3.OperationalError:
+            quoted = _quote_terms(query)
+            if not quoted:
+                return []
+            rows = con.execute(q, (quoted, folder_filter, folder_filter, limit)).fetchall()
+    finally:
+        con.close()
+    return [
+        IndexHit(
+            folder=r["folder"],
+            title=r["title"],
+            snippet=" ".join(r["snippet"].split()),
+            pk=r["pk"],
+            note_id=r["note_id"],
+        )
+        for r in rows
+    ]
+
+
+def index_excerpts(notes: list[dict], max_chars: int = 500) -> dict[str, str]:
+    """
+    Leading body text per note key (see `note_key`), from the index only.
+
+    Used to make note contents searchable in the fzf list without reading any
+    bodies at startup.
+    """
+    keys = {k for k in (note_key(n) for n in notes) if k is not None}
+    if not keys or not _index_path().exists():
+        return {}
+    con = _connect()
+    try:
+        rows = con.execute(
+            """
+            select d.key, substr(f.body, 1, ?) as body
+            from docs d join docs_fts f on f.rowid = d.id
+            """,
+            (max_chars,),
+        ).fetchall()
+    finally:
+        con.close()
+    return {r["key"]: " ".join(r["body"].split()) for r in rows if r["key"] in keys}
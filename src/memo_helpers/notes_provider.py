@@ -1,215 +1,217 @@
-import os
-import time
 import click
 
-from memo_helpers.cache import cache_get, cache_set
-from memo_helpers.get_memo import get_note_titles
-from memo_helpers.get_memo import get_note
-from memo_helpers.list_folder import notes_folder_names, notes_folders_with_parents, render_folder_tree
+from memo_helpers.apple_sqlite import backend_from_env
+from memo_helpers.cache import cache_delete, cache_enabled, cache_get, cache_set
+from memo_helpers.tracing import count, span, traced
 
+# SQLite listings are cached in two entries under the store fingerprint: the
+# folder tree (small; all the folder views need) and the note columns of the
+# snapshot, which reference folders by pk.
+_FOLDERS_CACHE_KEY = "notes_folders:v1"
+_SNAPSHOT_CACHE_KEY = "notes_snapshot:v5"
 
-def _maybe_timing(label: str, start: float) -> None:
-    if os.getenv("MEMO_TIMING") != "1":
-        return
-    ms = (time.perf_counter() - start) * 1000.0
-    click.echo(f"[timing] {label}: {ms:.1f}ms", err=True)
 
+def notes_backend() -> str:
+    """Notes listing backend from MEMO_NOTES_BACKEND (see backend_from_env)."""
+    return backend_from_env("MEMO_NOTES_BACKEND")
 
-def _backend() -> str:
+
+def listing_fingerprint(backend: str) -> str | None:
     """
-    Select Notes listing backend.
+    Change marker for the Notes store backing a listing.
 
-    - auto (default): try sqlite, then fall back to AppleScript
-    - sqlite: force sqlite (error if unavailable)
-    - applescript: force AppleScript (even if sqlite works)
+    Listings cached under a fingerprint are served until NoteStore.sqlite changes.
+    Forced AppleScript listings (or a missing store) fall back to the TTL cache.
     """
-    v = (os.getenv("MEMO_NOTES_BACKEND", "auto") or "").strip().lower()
-    if v in ("", "auto"):
-        return "auto"
-    if v in ("sqlite", "sql", "db"):
-        return "sqlite"
-    if v in ("applescript", "osascript", "as"):
-        return "applescript"
-    return "auto"
+    if backend == "applescript":
+        return None
+    try:
+        from memo_helpers.notes_sqlite import store_fingerprint
 
+        return store_fingerprint()
+    except Exception:
+        return None
 
-def list_note_titles(folder: str = "") -> list[str]:
+
+def _sqlite_folders(backend: str, fp: str | None):
     """
-    Prefer fast local SQLite listing when available; fall back to AppleScript.
+    Return the (cached) FolderTree, read with a folder-only query on a miss.
+
+    Same error policy as `_sqlite_snapshot`.
     """
-    backend = _backend()
-    cache_key = f"note_titles:v1:{backend}:{folder}"
-    cached = cache_get(cache_key)
-    if isinstance(cached, list) and all(isinstance(x, str) for x in cached):
-        if os.getenv("MEMO_TIMING") == "1":
-            click.echo("[timing] notes_provider/cache_hit", err=True)
-        return cached
+    try:
+        from memo_helpers.notes_sqlite import FolderTree, load_folders
+    except Exception as e:
+        if backend == "sqlite":
+            raise click.ClickException(
+                f"SQLite Notes backend unavailable: {type(e).__name__}"
+            )
+        return None
 
-    t0 = time.perf_counter()
-    if backend == "applescript":
-        out = get_note_titles(folder=folder)
-        _maybe_timing("notes_provider/applescript_forced", t0)
-        cache_set(cache_key, out)
-        return out
+    cached = cache_get(_FOLDERS_CACHE_KEY, fingerprint=fp)
+    if isinstance(cached, dict):
+        try:
+            return FolderTree.from_json(cached)
+        except Exception:
+            pass
 
-    if backend == "sqlite":
+    with span(f"notes_provider/sqlite_folders_{backend}"):
         try:
-            from memo_helpers.notes_sqlite import list_note_titles as sqlite_list
+            folders = load_folders()
         except Exception as e:
+            if backend == "sqlite":
+                raise click.ClickException(
+                    f"SQLite Notes backend failed: {type(e).__name__}"
+                )
+            count(f"notes_provider/fallback/{type(e).__name__}")
+            return None
+        cache_set(_FOLDERS_CACHE_KEY, folders.to_json(), fingerprint=fp)
+    return folders
+
+
+def _sqlite_snapshot(backend: str, label: str):
+    """
+    Return the (cached) NotesSnapshot that the account-wide sqlite listings
+    derive from.
+
+    Forced sqlite raises a ClickException on failure; auto returns None so the
+    caller can fall back to AppleScript.
+    """
+    try:
+        from memo_helpers.notes_sqlite import NotesSnapshot, load_snapshot
+    except Exception as e:
+        if backend == "sqlite":
             raise click.ClickException(
                 f"SQLite Notes backend unavailable: {type(e).__name__}"
             )
+        return None
+
+    fp = listing_fingerprint(backend)
+    cached = cache_get(_SNAPSHOT_CACHE_KEY, fingerprint=fp)
+    if isinstance(cached, dict):
+        folders = _sqlite_folders(backend, fp)
+        if folders is not None:
+            try:
+                with span("notes_provider/snapshot_from_cache"):
+                    return NotesSnapshot.from_json(cached, folders)
+            except Exception:
+                pass
+
+    with span(f"notes_provider/sqlite_{label}_{backend}"):
         try:
-            out = sqlite_list(folder=folder)
+            snap = load_snapshot()
         except Exception as e:
-            raise click.ClickException(
-                f"SQLite Notes backend failed: {type(e).__name__}"
-            )
-        _maybe_timing("notes_provider/sqlite_forced", t0)
-        cache_set(cache_key, out)
-        return out
+            if backend == "sqlite":
+                raise click.ClickException(
+                    f"SQLite Notes backend failed: {type(e).__name__}"
+                )
+            count(f"notes_provider/fallback/{type(e).__name__}")
+            return None
+        cache_set(_FOLDERS_CACHE_KEY, snap.folders.to_json(), fingerprint=fp)
+        cache_set(_SNAPSHOT_CACHE_KEY, snap.to_json(), fingerprint=fp)
+    return snap
+
+
+def _sqlite_direct(backend: str, label: str, fn_name: str, folder: str):
+    """
+    Run a filtered sqlite listing without building a snapshot.
 
-    # auto
-    try:
-        from memo_helpers.notes_sqlite import list_note_titles as sqlite_list
+    Used for folder-scoped listings, where the query reads only the matching
+    notes (cheaper than loading the cached snapshot, and it never builds one),
+    and when nothing can be cached. Same error policy as `_sqlite_snapshot`.
+    """
+    with span(f"notes_provider/sqlite_{label}_direct"):
+        try:
+            from memo_helpers import notes_sqlite
 
-        out = sqlite_list(folder=folder)
-        _maybe_timing("notes_provider/sqlite_ok", t0)
-        cache_set(cache_key, out)
-        return out
-    except Exception as e:
-        if os.getenv("MEMO_TIMING") == "1":
-            click.echo(
-                f"[timing] notes_provider/sqlite_fallback: {type(e).__name__}", err=True
-            )
+            return getattr(notes_sqlite, fn_name)(folder=folder)
+        except Exception as e:
+            if backend == "sqlite":
+                raise click.ClickException(
+                    f"SQLite Notes backend failed: {type(e).__name__}"
+                )
+            count(f"notes_provider/fallback/{type(e).__name__}")
+            return None
+
+
+@traced("notes_provider/list_note_titles")
+def list_note_titles(folder: str = "") -> list[str]:
+    """
+    Prefer fast local SQLite listing when available; fall back to AppleScript.
+    """
+    backend = notes_backend()
+    if backend != "applescript":
+        if folder or not cache_enabled(listing_fingerprint(backend)):
+            out = _sqlite_direct(backend, "titles", "list_note_titles", folder)
+            if out is not None:
+                return out
+        else:
+            snap = _sqlite_snapshot(backend, "titles")
+            if snap is not None:
+                return snap.list_note_titles()
+
+    cache_key = f"note_titles:v1:applescript:{folder}"
+    cached = cache_get(cache_key)
+    if isinstance(cached, list) and all(isinstance(x, str) for x in cached):
+        return cached
+
+    from memo_helpers.get_memo import get_note_titles
 
-    out = get_note_titles(folder=folder)
-    _maybe_timing("notes_provider/applescript", t0)
+    with span("notes_provider/applescript"):
+        out = get_note_titles(folder=folder)
     cache_set(cache_key, out)
     return out
 
 
+@traced("notes_provider/list_folder_names")
 def list_folder_names() -> list[str]:
-    backend = _backend()
-    cache_key = f"folder_names:v1:{backend}"
+    backend = notes_backend()
+    if backend != "applescript":
+        folders = _sqlite_folders(backend, listing_fingerprint(backend))
+        if folders is not None:
+            return folders.list_folder_names()
+
+    cache_key = "folder_names:v1:applescript"
     cached = cache_get(cache_key)
     if isinstance(cached, list) and all(isinstance(x, str) for x in cached):
-        if os.getenv("MEMO_TIMING") == "1":
-            click.echo("[timing] notes_provider/cache_hit_folders", err=True)
         return cached
 
-    t0 = time.perf_counter()
-    if backend == "applescript":
-        out = notes_folder_names()
-        _maybe_timing("notes_provider/applescript_folders_forced", t0)
-        cache_set(cache_key, out)
-        return out
-
-    if backend == "sqlite":
-        try:
-            from memo_helpers.notes_sqlite import list_folder_names as sqlite_folders
-        except Exception as e:
-            raise click.ClickException(
-                f"SQLite Notes backend unavailable: {type(e).__name__}"
-            )
-        try:
-            out = sqlite_folders()
-        except Exception as e:
-            raise click.ClickException(
-                f"SQLite Notes backend failed: {type(e).__name__}"
-            )
-        _maybe_timing("notes_provider/sqlite_folders_forced", t0)
-        cache_set(cache_key, out)
-        return out
+    from memo_helpers.list_folder import notes_folder_names
 
-    # auto
-    try:
-        from memo_helpers.notes_sqlite import list_folder_names as sqlite_folders
-
-        out = sqlite_folders()
-        _maybe_timing("notes_provider/sqlite_folders_ok", t0)
-        cache_set(cache_key, out)
-        return out
-    except Exception as e:
-        if os.getenv("MEMO_TIMING") == "1":
-            click.echo(
-                f"[timing] notes_provider/sqlite_folders_fallback: {type(e).__name__}",
-                err=True,
-            )
-
-    out = notes_folder_names()
-    _maybe_timing("notes_provider/applescript_folders", t0)
+    with span("notes_provider/applescript_folders"):
+        out = notes_folder_names()
     cache_set(cache_key, out)
     return out
 
 
+@traced("notes_provider/list_folders_tree")
 def list_folders_tree() -> str:
     """
     List folders/subfolders as an indented tree (used by `memo notes -fl`).
 
     Uses the same backend selection + cache policy as other Notes listings.
     """
-    backend = _backend()
-    cache_key = f"folders_tree:v1:{backend}"
+    from memo_helpers.list_folder import notes_folders_with_parents, render_folder_tree
+
+    backend = notes_backend()
+    if backend != "applescript":
+        folders = _sqlite_folders(backend, listing_fingerprint(backend))
+        if folders is not None:
+            return render_folder_tree(folders.list_folders_with_parents())
+
+    cache_key = "folders_tree:v1:applescript"
     cached = cache_get(cache_key)
     if isinstance(cached, str):
-        if os.getenv("MEMO_TIMING") == "1":
-            click.echo("[timing] notes_provider/cache_hit_folders_tree", err=True)
         return cached
 
-    t0 = time.perf_counter()
-    if backend == "applescript":
+    with span("notes_provider/applescript_folders_tree"):
         pairs = notes_folders_with_parents()
         out = render_folder_tree(pairs)
-        _maybe_timing("notes_provider/applescript_folders_tree_forced", t0)
-        cache_set(cache_key, out)
-        return out
-
-    if backend == "sqlite":
-        try:
-            from memo_helpers.notes_sqlite import (
-                list_folders_with_parents as sqlite_pairs,
-            )
-        except Exception as e:
-            raise click.ClickException(
-                f"SQLite Notes backend unavailable: {type(e).__name__}"
-            )
-        try:
-            pairs = sqlite_pairs()
-        except Exception as e:
-            raise click.ClickException(
-                f"SQLite Notes backend failed: {type(e).__name__}"
-            )
-        out = render_folder_tree(pairs)
-        _maybe_timing("notes_provider/sqlite_folders_tree_forced", t0)
-        cache_set(cache_key, out)
-        return out
-
-    # auto
-    try:
-        from memo_helpers.notes_sqlite import (
-            list_folders_with_parents as sqlite_pairs,
-        )
-
-        pairs = sqlite_pairs()
-        out = render_folder_tree(pairs)
-        _maybe_timing("notes_provider/sqlite_folders_tree_ok", t0)
-        cache_set(cache_key, out)
-        return out
-    except Exception as e:
-        if os.getenv("MEMO_TIMING") == "1":
-            click.echo(
-                f"[timing] notes_provider/sqlite_folders_tree_fallback: {type(e).__name__}",
-                err=True,
-            )
-
-    pairs = notes_folders_with_parents()
-    out = render_folder_tree(pairs)
-    _maybe_timing("notes_provider/applescript_folders_tree", t0)
     cache_set(cache_key, out)
     return out
 
 
+@traced("notes_provider/list_notes_meta")
 def list_notes_meta(folder: str = "") -> list[dict]:
     """
     Structured listing used by `memo notes --search`.
@@ -222,99 +224,50 @@ def list_notes_meta(folder: str = "") -> list[dict]:
         "note_id": str|None,
         "lookup_title": str|None,
         "pk": int|None,
+        "modified": float|None,  # Unix epoch seconds
+        "created": float|None,  # Unix epoch seconds
+        "folder_path": str,  # "Parent/Child"
     }
-    - sqlite backend: best-effort returns identifier when available (note_id is None)
+    - sqlite backend: returns identifier when available, and note_id built from
+      the store UUID and pk (None if the store has no Z_METADATA UUID)
     - applescript backend: returns note_id (AppleScript id) and no identifier
     """
-    backend = _backend()
-    cache_key = f"notes_meta:v1:{backend}:{folder}"
+    backend = notes_backend()
+    if backend != "applescript":
+        if not folder and cache_enabled(listing_fingerprint(backend)):
+            snap = _sqlite_snapshot(backend, "meta")
+            if snap is not None:
+                return snap.list_notes_meta_dicts()
+        else:
+            notes = _sqlite_direct(backend, "meta", "list_notes_meta", folder)
+            if notes is not None:
+                return [
+                    {
+                        "folder": n.folder,
+                        "title": n.title,
+                        "identifier": n.identifier,
+                        "note_id": n.note_id,
+                        "lookup_title": n.lookup_title,
+                        "pk": n.pk,
+                        "modified": n.modified,
+                        "created": n.created,
+                        "folder_path": n.folder_path,
+                    }
+                    for n in notes
+                ]
+
+    cache_key = f"notes_meta:v2:applescript:{folder}"
     cached = cache_get(cache_key)
     if isinstance(cached, list) and all(isinstance(x, dict) for x in cached):
-        if os.getenv("MEMO_TIMING") == "1":
-            click.echo("[timing] notes_provider/cache_hit_meta", err=True)
         return cached
 
-    t0 = time.perf_counter()
-    if backend == "applescript":
-        note_map, _ = get_note(folder=folder)
-        out = []
-        for _, (note_id, display) in note_map.items():
-            # display is "Folder - Title" per AppleScript in get_note.
-            folder_name = ""
-            title = display
-            if " - " in display:
-                folder_name, title = display.split(" - ", 1)
-            out.append(
-                {
-                    "folder": folder_name,
-                    "title": title,
-                    "identifier": None,
-                    "note_id": note_id,
-                    "lookup_title": title,
-                    "pk": None,
-                }
-            )
-        _maybe_timing("notes_provider/applescript_meta_forced", t0)
-        cache_set(cache_key, out)
-        return out
-
-    if backend == "sqlite":
-        try:
-            from memo_helpers.notes_sqlite import list_notes_meta as sqlite_meta
-        except Exception as e:
-            raise click.ClickException(
-                f"SQLite Notes backend unavailable: {type(e).__name__}"
-            )
-        try:
-            notes = sqlite_meta(folder=folder)
-        except Exception as e:
-            raise click.ClickException(
-                f"SQLite Notes backend failed: {type(e).__name__}"
-            )
-        out = [
-            {
-                "folder": n.folder,
-                "title": n.title,
-                "identifier": n.identifier,
-                "note_id": None,
-                "lookup_title": n.lookup_title,
-                "pk": n.pk,
-            }
-            for n in notes
-        ]
-        _maybe_timing("notes_provider/sqlite_meta_forced", t0)
-        cache_set(cache_key, out)
-        return out
-
-    # auto
-    try:
-        from memo_helpers.notes_sqlite import list_notes_meta as sqlite_meta
-
-        notes = sqlite_meta(folder=folder)
-        out = [
-            {
-                "folder": n.folder,
-                "title": n.title,
-                "identifier": n.identifier,
-                "note_id": None,
-                "lookup_title": n.lookup_title,
-                "pk": n.pk,
-            }
-            for n in notes
-        ]
-        _maybe_timing("notes_provider/sqlite_meta_ok", t0)
-        cache_set(cache_key, out)
-        return out
-    except Exception as e:
-        if os.getenv("MEMO_TIMING") == "1":
-            click.echo(
-                f"[timing] notes_provider/sqlite_meta_fallback: {type(e).__name__}",
-                err=True,
-            )
+    from memo_helpers.get_memo import get_note
 
-    note_map, _ = get_note(folder=folder)
+    with span("notes_provider/applescript_meta"):
+        note_map, _ = get_note(folder=folder)
     out = []
     for _, (note_id, display) in note_map.items():
+        # display is "Folder - Title" per AppleScript in get_note.
         folder_name = ""
         title = display
         if " - " in display:
@@ -327,8 +280,21 @@ def list_notes_meta(folder: str = "") -> list[dict]:
                 "note_id": note_id,
                 "lookup_title": title,
                 "pk": None,
+                "modified": None,
+                "created": None,
+                "folder_path": folder_name,
             }
         )
-    _maybe_timing("notes_provider/applescript_meta", t0)
     cache_set(cache_key, out)
     return out
+
+
+def invalidate_notes_cache() -> None:
+    """
+    Forget cached AppleScript listings after memo changed notes or folders.
+
+    SQLite listings don't need this: they are keyed by the store fingerprint,
+    which changes with the write.
+    """
+    for prefix in ("note_titles:", "folder_names:", "folders_tree:", "notes_meta:"):
+        cache_delete(prefix)
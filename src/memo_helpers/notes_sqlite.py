@@ -1,9 +1,10 @@
 import os
 import sqlite3
-import time
-import click
 from dataclasses import dataclass
 
+from memo_helpers.apple_sqlite import CORE_DATA_EPOCH, file_fingerprint, open_readonly
+from memo_helpers.tracing import count, span
+
 
 _DELETED_TRANSLATIONS = {
     "Recently Deleted",
@@ -46,13 +47,182 @@ class NoteMeta:
     lookup_title: str | None = None
     # Primary key from ZICCLOUDSYNCINGOBJECT for stable display/cache keys.
     pk: int | None = None
+    # Last modification time (Unix epoch seconds), when the schema exposes it.
+    modified: float | None = None
+    # Creation time (Unix epoch seconds), when the schema exposes it.
+    created: float | None = None
+    # Full folder path ("Work/Projects"); `folder` is only the innermost name.
+    folder_path: str = ""
+    # AppleScript id (x-coredata://<store uuid>/ICNote/p<pk>), derived from the store.
+    note_id: str | None = None
+
+
+@dataclass(slots=True)
+class FolderTree:
+    """
+    All folders, in table order, as parallel arrays. Folders are addressed by
+    position; `parents` holds positions, `-1` for top-level folders.
+    """
+
+    pks: list[int]
+    names: list[str]
+    parents: list[int]
+
+    def to_json(self) -> dict:
+        return {"pk": self.pks, "name": self.names, "parent": self.parents}
+
+    @classmethod
+    def from_json(cls, obj: dict) -> "FolderTree":
+        tree = cls(pks=list(obj["pk"]), names=list(obj["name"]), parents=list(obj["parent"]))
+        if not len(tree.pks) == len(tree.names) == len(tree.parents):
+            raise ValueError("Inconsistent FolderTree")
+        return tree
+
+    def index_by_pk(self) -> dict[int, int]:
+        return {pk: i for i, pk in enumerate(self.pks)}
+
+    def list_folder_names(self) -> list[str]:
+        return sorted({n for n in self.names if n}, key=str.casefold)
+
+    def list_folders_with_parents(self) -> list[tuple[str, str]]:
+        out: list[tuple[str, str]] = []
+        for name, parent in zip(self.names, self.parents):
+            if not name:
+                continue
+            out.append((name, self.names[parent] if parent >= 0 else ""))
+        return out
+
+    def path(self, index: int) -> str:
+        names: list[str] = []
+        seen: set[int] = set()
+        # Guard against parent cycles in a damaged store.
+        while index >= 0 and index not in seen:
+            seen.add(index)
+            names.append(self.names[index])
+            index = self.parents[index]
+        return "/".join(reversed(names))
+
+
+@dataclass(slots=True)
+class NotesSnapshot:
+    """
+    Everything the Notes listings need, read in a single pass over the store.
+
+    Note columns are kept as parallel arrays (not per-row objects) so they
+    serialize compactly into the listing cache. `note_folders` holds positions
+    in `folders`, `-1` for unfiled notes. Notes are stored in display order.
+
+    `to_json()` only covers the notes; the folders are cached on their own, so
+    folder listings never load every note.
+    """
 
+    folders: FolderTree
+    note_pks: list[int]
+    note_titles: list[str]
+    note_lookup_titles: list[str]
+    note_identifiers: list[str | None]
+    note_folders: list[int]
+    note_modified: list[float | None]
+    note_created: list[float | None]
+    # "x-coredata://<store uuid>/ICNote/p"; a note's AppleScript id is this + pk.
+    note_id_prefix: str | None = None
+
+    def to_json(self) -> dict:
+        pks = self.folders.pks
+        return {
+            "note_id_prefix": self.note_id_prefix,
+            "notes": {
+                "pk": self.note_pks,
+                "title": self.note_titles,
+                "lookup_title": self.note_lookup_titles,
+                "identifier": self.note_identifiers,
+                # By folder pk, so the entry doesn't depend on folder positions.
+                "folder_pk": [pks[f] if f >= 0 else None for f in self.note_folders],
+                "modified": self.note_modified,
+                "created": self.note_created,
+            },
+        }
+
+    @classmethod
+    def from_json(cls, obj: dict, folders: FolderTree) -> "NotesSnapshot":
+        notes = obj["notes"]
+        index = folders.index_by_pk()
+        snap = cls(
+            folders=folders,
+            note_pks=list(notes["pk"]),
+            note_titles=list(notes["title"]),
+            note_lookup_titles=list(notes["lookup_title"]),
+            note_identifiers=list(notes["identifier"]),
+            note_folders=[index.get(pk, -1) for pk in notes["folder_pk"]],
+            note_modified=list(notes["modified"]),
+            note_created=list(notes["created"]),
+            note_id_prefix=obj.get("note_id_prefix"),
+        )
+        n = len(snap.note_pks)
+        if not all(
+            len(col) == n
+            for col in (
+                snap.note_titles,
+                snap.note_lookup_titles,
+                snap.note_identifiers,
+                snap.note_folders,
+                snap.note_modified,
+                snap.note_created,
+            )
+        ):
+            raise ValueError("Inconsistent NotesSnapshot")
+        return snap
+
+    def _note_indexes(self, folder: str) -> list[int]:
+        folder_filter = (folder or "").strip()
+        if not folder_filter:
+            return list(range(len(self.note_pks)))
+        # Keep current UX: folder filter is a substring match. Folder-level
+        # decisions are made once per folder, not once per note.
+        keep = [not name or folder_filter in name for name in self.folders.names]
+        return [i for i, f in enumerate(self.note_folders) if f < 0 or keep[f]]
+
+    def list_note_titles(self, folder: str = "") -> list[str]:
+        out: list[str] = []
+        for i in self._note_indexes(folder):
+            f = self.note_folders[i]
+            folder_name = self.folders.names[f] if f >= 0 else ""
+            if folder_name:
+                out.append(f"{folder_name} - {self.note_titles[i]}")
+            else:
+                out.append(self.note_titles[i])
+        # Unfiled notes sort by title among the "Folder - Title" lines.
+        out.sort(key=str.casefold)
+        return out
+
+    def list_notes_meta_dicts(self, folder: str = "") -> list[dict]:
+        """
+        Notes metadata as the dicts notes_provider.list_notes_meta() returns.
 
-def _maybe_timing(label: str, start: float) -> None:
-    if os.getenv("MEMO_TIMING") != "1":
-        return
-    ms = (time.perf_counter() - start) * 1000.0
-    click.echo(f"[timing] {label}: {ms:.1f}ms", err=True)
+        Built straight from the columns: going through NoteMeta objects costs
+        more than decoding the cached snapshot on large accounts.
+        """
+        names = self.folders.names
+        paths = [self.folders.path(f) for f in range(len(names))]
+        prefix = self.note_id_prefix
+        out: list[dict] = []
+        for i in self._note_indexes(folder):
+            f = self.note_folders[i]
+            pk = self.note_pks[i]
+            out.append(
+                {
+                    "folder": names[f] if f >= 0 else "",
+                    "title": self.note_titles[i],
+                    "identifier": self.note_identifiers[i],
+                    "note_id": f"{prefix}{pk}" if prefix else None,
+                    "lookup_title": self.note_lookup_titles[i],
+                    "pk": pk,
+                    "modified": self.note_modified[i],
+                    "created": self.note_created[i],
+                    "folder_path": paths[f] if f >= 0 else "",
+                }
+            )
+        return out
 
 
 def _default_db_path() -> str:
@@ -60,10 +230,19 @@ def _default_db_path() -> str:
     return os.path.expanduser("~/Library/Group Containers/group.com.apple.notes/NoteStore.sqlite")
 
 
-def _connect(db_path: str) -> sqlite3.Connection:
-    con = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=0.1)
-    con.row_factory = sqlite3.Row
-    return con
+def store_path() -> str:
+    return os.getenv("MEMO_NOTES_DB_PATH", _default_db_path())
+
+
+def store_fingerprint() -> str | None:
+    """Change marker for NoteStore.sqlite; None when the store is missing."""
+    return file_fingerprint([store_path()])
+
+
+def _sort_key(folder: str, title: str) -> str:
+    # Display order of the listings. str.casefold, unlike SQLite's
+    # `collate nocase`, also folds non-ASCII letters.
+    return f"{folder}\n{title}".casefold()
 
 
 def _note_columns(con: sqlite3.Connection) -> set[str]:
@@ -79,185 +258,305 @@ def _note_columns(con: sqlite3.Connection) -> set[str]:
     return cols
 
 
-def _best_title(
-    *,
-    raw_title: str,
-    snippet: str | None,
-    summary: str | None,
-    pk: int | None,
-) -> str:
-    title = (raw_title or "").strip()
-    if not title and snippet:
-        title = " ".join(str(snippet).splitlines()).strip()
-    if not title and summary:
-        title = " ".join(str(summary).splitlines()).strip()
-    if not title and pk is not None:
-        return f"(Untitled #{pk})"
-    return title or "(Untitled)"
+def _one_line_sql(expr: str) -> str:
+    # SQL twin of `" ".join(s.splitlines()).strip()`, mapped to NULL when empty.
+    return (
+        f"nullif(trim(replace(replace(replace({expr}, char(13) || char(10), ' '), "
+        f"char(10), ' '), char(13), ' ')), '')"
+    )
 
 
-def list_note_titles(folder: str = "") -> list[str]:
+def _title_sql(cols: set[str], alias: str) -> str:
     """
-    Fast path for `memo notes` listing (titles only).
-    Returns ["Folder - Title", ...] or ["Title", ...] when folder is empty.
+    Display title: ZTITLE1, else the first snippet/summary line, else a placeholder.
+    """
+    parts = [f"nullif(trim({alias}.ZTITLE1), '')"]
+    if "ZSNIPPET" in cols:
+        parts.append(_one_line_sql(f"{alias}.ZSNIPPET"))
+    if "ZSUMMARY" in cols:
+        parts.append(_one_line_sql(f"{alias}.ZSUMMARY"))
+    parts.append(f"'(Untitled #' || {alias}.Z_PK || ')'")
+    return f"coalesce({', '.join(parts)})"
+
+
+def _modified_sql(cols: set[str], alias: str) -> str:
+    for c in ("ZMODIFICATIONDATE1", "ZMODIFICATIONDATE"):
+        if c in cols:
+            return f"({alias}.{c} + {CORE_DATA_EPOCH})"
+    return "null"
+
+
+def _created_sql(cols: set[str], alias: str) -> str:
+    # Which column holds the creation date moved between schema versions.
+    present = [
+        f"{alias}.{c}"
+        for c in ("ZCREATIONDATE3", "ZCREATIONDATE1", "ZCREATIONDATE")
+        if c in cols
+    ]
+    if not present:
+        return "null"
+    expr = present[0] if len(present) == 1 else f"coalesce({', '.join(present)})"
+    return f"({expr} + {CORE_DATA_EPOCH})"
+
+
+def _not_trash_sql(cols: set[str], alias: str) -> tuple[str, list[str]]:
     """
-    db_path = os.getenv("MEMO_NOTES_DB_PATH", _default_db_path())
+    Condition excluding the Recently Deleted folder (matches when `alias` is NULL).
+
+    Uses the folder type / identifier rather than its localized name when the
+    schema exposes them; the translated names are only a fallback.
+    """
+    if "ZFOLDERTYPE" in cols:
+        return f"coalesce({alias}.ZFOLDERTYPE, 0) != 1", []
+    if "ZIDENTIFIER" in cols:
+        return f"coalesce({alias}.ZIDENTIFIER, '') not like 'TrashFolder%'", []
+    names = sorted(_DELETED_TRANSLATIONS)
+    placeholders = ", ".join("?" for _ in names)
+    return f"coalesce(trim({alias}.ZTITLE2), '') not in ({placeholders})", names
+
+
+_NOTE_IS_LISTABLE_SQL = """
+    (n.ZMARKEDFORDELETION is null or n.ZMARKEDFORDELETION = 0)
+    and (n.ZISPASSWORDPROTECTED is null or n.ZISPASSWORDPROTECTED = 0)
+"""
+
+
+def _folder_tree(con: sqlite3.Connection, cols: set[str]) -> FolderTree:
+    """All folders (ICFolder, Z_ENT=15; name in ZTITLE2, parent FK in ZPARENT)."""
+    folder_title_col = "ZTITLE2" if "ZTITLE2" in cols else "ZTITLE1"
+    parent_fk = next((c for c in ("ZPARENT", "ZPARENT1", "ZPARENT2") if c in cols), None)
+    rows = con.execute(
+        f"select Z_PK as pk, trim(coalesce({folder_title_col}, '')) as name, "
+        f"{parent_fk or 'null'} as parent "
+        "from ZICCLOUDSYNCINGOBJECT where Z_ENT = 15 order by Z_PK"
+    ).fetchall()
+    count("sqlite/rows", len(rows))
+    pks = [r["pk"] for r in rows]
+    index = {pk: i for i, pk in enumerate(pks)}
+    return FolderTree(
+        pks=pks,
+        names=[r["name"] for r in rows],
+        parents=[index.get(r["parent"], -1) for r in rows],
+    )
+
+
+def load_folders() -> FolderTree:
+    """Read only the folders, for the folder listings and checks."""
+    db_path = store_path()
     if not os.path.exists(db_path):
         raise FileNotFoundError(db_path)
+    with span("notes_sqlite/load_folders"):
+        con = open_readonly(db_path)
+        try:
+            return _folder_tree(con, _note_columns(con))
+        finally:
+            con.close()
 
-    folder_filter = (folder or "").strip()
 
-    t0 = time.perf_counter()
-    con = _connect(db_path)
-    try:
-        # Entities:
-        # - ICNote: Z_ENT=12, title in ZTITLE1, folder FK in ZFOLDER
-        # - ICFolder: Z_ENT=15, name in ZTITLE2, parent in ZPARENT
-        cols = _note_columns(con)
-        select_cols = [
-            "n.Z_PK as pk",
-            "n.ZTITLE1 as title",
-        ]
-        if "ZSNIPPET" in cols:
-            select_cols.append("n.ZSNIPPET as snippet")
-        if "ZSUMMARY" in cols:
-            select_cols.append("n.ZSUMMARY as summary")
-        select_cols.append("f.ZTITLE2 as folder")
-
-        q = f"""
-        select
-            {", ".join(select_cols)}
-        from ZICCLOUDSYNCINGOBJECT n
-        left join ZICCLOUDSYNCINGOBJECT f
-            on f.Z_PK = n.ZFOLDER and f.Z_ENT = 15
-        where n.Z_ENT = 12
-          and (n.ZMARKEDFORDELETION is null or n.ZMARKEDFORDELETION = 0)
-          and (n.ZISPASSWORDPROTECTED is null or n.ZISPASSWORDPROTECTED = 0)
-        """
-        rows = con.execute(q).fetchall()
-    finally:
-        con.close()
-    _maybe_timing("notes_sqlite/list_note_titles/query", t0)
-
-    t_parse = time.perf_counter()
-    out: list[str] = []
-    for r in rows:
-        pk = r["pk"] if isinstance(r, sqlite3.Row) and "pk" in r.keys() else None
-        pk = int(pk) if isinstance(pk, int) else None
-        raw_title = r["title"] if isinstance(r, sqlite3.Row) else ""
-        snippet = r["snippet"] if isinstance(r, sqlite3.Row) and "snippet" in r.keys() else None
-        summary = r["summary"] if isinstance(r, sqlite3.Row) and "summary" in r.keys() else None
-        title = _best_title(
-            raw_title=str(raw_title or ""),
-            snippet=snippet if isinstance(snippet, str) else None,
-            summary=summary if isinstance(summary, str) else None,
-            pk=pk,
-        )
-
-        folder_name = r["folder"] or ""
-        folder_name = folder_name.strip() if isinstance(folder_name, str) else ""
-        if folder_name in _DELETED_TRANSLATIONS:
-            continue
-
-        if folder_filter:
-            # Keep current UX: folder filter is a substring match.
-            if folder_name and folder_filter not in folder_name:
-                continue
-
-        if folder_name:
-            out.append(f"{folder_name} - {title}")
-        else:
-            out.append(title)
-    out.sort(key=str.casefold)
-    _maybe_timing("notes_sqlite/list_note_titles/format", t_parse)
-    return out
+def load_snapshot(folders: FolderTree | None = None) -> NotesSnapshot:
+    """
+    Read the folders (unless `folders` is given) and all note metadata.
 
+    Entities:
+    - ICNote: Z_ENT=12, title in ZTITLE1, folder FK in ZFOLDER
+    - ICFolder: Z_ENT=15, name in ZTITLE2, parent FK in ZPARENT
 
-def list_folder_names() -> list[str]:
-    db_path = os.getenv("MEMO_NOTES_DB_PATH", _default_db_path())
+    Notes that are marked for deletion, password protected or in Recently Deleted
+    are skipped; the Recently Deleted folder itself is still listed. Notes come
+    back ordered by folder and title (case-insensitive).
+    """
+    db_path = store_path()
     if not os.path.exists(db_path):
         raise FileNotFoundError(db_path)
 
-    t0 = time.perf_counter()
-    con = _connect(db_path)
-    try:
-        rows = con.execute(
-            """
-            select distinct ZTITLE2 as folder
-            from ZICCLOUDSYNCINGOBJECT
-            where Z_ENT = 15 and ZTITLE2 is not null and ZTITLE2 != ''
+    with span("notes_sqlite/load_snapshot/query"):
+        con = open_readonly(db_path)
+        try:
+            cols = _note_columns(con)
+            if folders is None:
+                folders = _folder_tree(con, cols)
+            folder_title_col = "ZTITLE2" if "ZTITLE2" in cols else "ZTITLE1"
+            not_trash, params = _not_trash_sql(cols, "f")
+
+            select_cols = [
+                "n.Z_PK as pk",
+                f"{_title_sql(cols, 'n')} as title",
+                "n.ZTITLE1 as raw_title",
+                "n.ZIDENTIFIER as identifier" if "ZIDENTIFIER" in cols else "null as identifier",
+                f"{_modified_sql(cols, 'n')} as modified",
+                f"{_created_sql(cols, 'n')} as created",
+                "n.ZFOLDER as folder_pk",
+                f"trim(coalesce(f.{folder_title_col}, '')) as folder_name",
+            ]
+            q = f"""
+            select
+                {", ".join(select_cols)}
+            from ZICCLOUDSYNCINGOBJECT n
+            left join ZICCLOUDSYNCINGOBJECT f
+                on f.Z_PK = n.ZFOLDER and f.Z_ENT = 15
+            where n.Z_ENT = 12 and {_NOTE_IS_LISTABLE_SQL} and {not_trash}
             """
-        ).fetchall()
-    finally:
-        con.close()
-    _maybe_timing("notes_sqlite/list_folder_names/query", t0)
+            rows = con.execute(q, params).fetchall()
+            rows.sort(key=lambda r: _sort_key(r["folder_name"], r["title"]))
+            note_id_prefix = _note_id_prefix(con)
+        finally:
+            con.close()
+        count("sqlite/rows", len(rows))
+
+    with span("notes_sqlite/load_snapshot/build"):
+        folder_index = folders.index_by_pk()
+        snap = NotesSnapshot(
+            folders=folders,
+            note_pks=[],
+            note_titles=[],
+            note_lookup_titles=[],
+            note_identifiers=[],
+            note_folders=[],
+            note_modified=[],
+            note_created=[],
+            note_id_prefix=note_id_prefix,
+        )
+        for r in rows:
+            raw_title = r["raw_title"]
+            identifier = r["identifier"]
+            snap.note_pks.append(r["pk"])
+            snap.note_titles.append(r["title"])
+            snap.note_lookup_titles.append(
+                raw_title.strip() if isinstance(raw_title, str) else ""
+            )
+            snap.note_identifiers.append(
+                identifier.strip()
+                if isinstance(identifier, str) and identifier.strip()
+                else None
+            )
+            snap.note_folders.append(folder_index.get(r["folder_pk"], -1))
+            snap.note_modified.append(r["modified"])
+            snap.note_created.append(r["created"])
+    return snap
 
-    out = []
-    for r in rows:
-        name = (r["folder"] or "").strip()
-        if not name:
-            continue
-        out.append(name)
-    out.sort(key=str.casefold)
-    return out
 
+def _note_id_prefix(con: sqlite3.Connection) -> str | None:
+    """
+    Prefix of the AppleScript ids of notes in this store.
 
-def list_folders_with_parents() -> list[tuple[str, str]]:
+    Notes.app exposes notes as Core Data object URIs,
+    x-coredata://<Z_METADATA.Z_UUID>/<entity>/p<Z_PK>, so they can be built
+    without asking AppleScript.
     """
-    Return a list of (folder_name, parent_folder_name) pairs from NoteStore.sqlite.
+    try:
+        row = con.execute("select Z_UUID as uuid from Z_METADATA limit 1").fetchone()
+    except sqlite3.Error:
+        return None
+    uuid = row["uuid"] if row is not None else None
+    if not isinstance(uuid, str) or not uuid.strip():
+        return None
+    entity = "ICNote"
+    try:
+        ent = con.execute("select Z_NAME as name from Z_PRIMARYKEY where Z_ENT = 12").fetchone()
+        if ent is not None and isinstance(ent["name"], str) and ent["name"]:
+            entity = ent["name"]
+    except sqlite3.Error:
+        pass
+    return f"x-coredata://{uuid.strip()}/{entity}/p"
 
-    Entities:
-    - ICFolder: Z_ENT=15, name in ZTITLE2, parent FK in ZPARENT
+
+def _query_notes(
+    folder: str, *, with_meta: bool
+) -> tuple[list[sqlite3.Row], dict[int, str], str | None]:
+    """
+    Filtered, ordered note rows for one listing, without building a snapshot.
+
+    Folder filter, Recently Deleted exclusion and ordering all run in SQL, so the
+    rows fetched scale with the result rather than the whole account. With
+    `with_meta`, folder paths by pk and the note id prefix are returned too
+    (empty / None otherwise).
     """
-    db_path = os.getenv("MEMO_NOTES_DB_PATH", _default_db_path())
+    db_path = store_path()
     if not os.path.exists(db_path):
         raise FileNotFoundError(db_path)
 
-    t0 = time.perf_counter()
-    con = _connect(db_path)
-    try:
-        cols = _note_columns(con)
-        title_col = "ZTITLE2" if "ZTITLE2" in cols else "ZTITLE1"
-        parent_fk = None
-        for c in ("ZPARENT", "ZPARENT1", "ZPARENT2"):
-            if c in cols:
-                parent_fk = c
-                break
-
-        if parent_fk:
-            q = f"""
-            select
-                f.{title_col} as name,
-                p.{title_col} as parent
-            from ZICCLOUDSYNCINGOBJECT f
-            left join ZICCLOUDSYNCINGOBJECT p
-                on p.Z_PK = f.{parent_fk} and p.Z_ENT = 15
-            where f.Z_ENT = 15 and f.{title_col} is not null and f.{title_col} != ''
-            """
-        else:
-            # Schema variant without a visible parent FK; still return a flat listing.
+    folder_filter = (folder or "").strip()
+
+    with span("notes_sqlite/query_notes", folder=folder_filter):
+        con = open_readonly(db_path)
+        try:
+            cols = _note_columns(con)
+            not_trash, params = _not_trash_sql(cols, "f")
+            select_cols = [
+                "n.Z_PK as pk",
+                f"{_title_sql(cols, 'n')} as title",
+                "n.ZTITLE1 as raw_title",
+                "trim(coalesce(f.ZTITLE2, '')) as folder",
+            ]
+            if with_meta:
+                select_cols.append(
+                    "n.ZIDENTIFIER as identifier" if "ZIDENTIFIER" in cols else "null as identifier"
+                )
+                select_cols.append(f"{_modified_sql(cols, 'n')} as modified")
+                select_cols.append(f"{_created_sql(cols, 'n')} as created")
+                select_cols.append("n.ZFOLDER as folder_pk")
+            where_folder = ""
+            if folder_filter:
+                # Keep current UX: substring match on the folder name; unfiled notes
+                # are always kept. Resolving folder PKs first lets SQLite drive the
+                # note lookup from the ZFOLDER index.
+                where_folder = """
+                  and (
+                    n.ZFOLDER in (
+                        select Z_PK from ZICCLOUDSYNCINGOBJECT
+                        where Z_ENT = 15 and instr(ZTITLE2, ?) > 0
+                    )
+                    or coalesce(trim(f.ZTITLE2), '') = ''
+                  )
+                """
+                params = [*params, folder_filter]
             q = f"""
             select
-                f.{title_col} as name,
-                '' as parent
-            from ZICCLOUDSYNCINGOBJECT f
-            where f.Z_ENT = 15 and f.{title_col} is not null and f.{title_col} != ''
+                {", ".join(select_cols)}
+            from ZICCLOUDSYNCINGOBJECT n
+            left join ZICCLOUDSYNCINGOBJECT f
+                on f.Z_PK = n.ZFOLDER and f.Z_ENT = 15
+            where n.Z_ENT = 12
+              and {_NOTE_IS_LISTABLE_SQL}
+              and {not_trash}
+              {where_folder}
             """
-        rows = con.execute(q).fetchall()
-    finally:
-        con.close()
-    _maybe_timing("notes_sqlite/list_folders_with_parents/query", t0)
+            rows = con.execute(q, params).fetchall()
+            rows.sort(key=lambda r: _sort_key(r["folder"], r["title"]))
+            if with_meta:
+                tree = _folder_tree(con, cols)
+                paths = {pk: tree.path(i) for pk, i in tree.index_by_pk().items()}
+            else:
+                paths = {}
+            note_id_prefix = _note_id_prefix(con) if with_meta else None
+        finally:
+            con.close()
+        count("sqlite/rows", len(rows))
+    return rows, paths, note_id_prefix
 
-    out: list[tuple[str, str]] = []
-    for r in rows:
-        name = (r["name"] or "").strip()
-        if not name:
-            continue
-        parent = (r["parent"] or "").strip()
-        out.append((name, parent))
+
+def list_note_titles(folder: str = "") -> list[str]:
+    """
+    Fast path for `memo notes` listing (titles only).
+    Returns ["Folder - Title", ...] or ["Title", ...] for unfiled notes.
+    """
+    rows, _, _ = _query_notes(folder, with_meta=False)
+    out = [f"{r['folder']} - {r['title']}" if r["folder"] else r["title"] for r in rows]
+    out.sort(key=str.casefold)
     return out
 
 
+def list_folder_names() -> list[str]:
+    return load_folders().list_folder_names()
+
+
+def list_folders_with_parents() -> list[tuple[str, str]]:
+    """
+    Return a list of (folder_name, parent_folder_name) pairs from NoteStore.sqlite.
+    """
+    return load_folders().list_folders_with_parents()
+
+
 def list_notes_meta(folder: str = "") -> list[NoteMeta]:
     """
     Best-effort structured listing for `memo notes --search`.
@@ -265,90 +564,30 @@ def list_notes_meta(folder: str = "") -> list[NoteMeta]:
     Returns NoteMeta(folder, title, identifier?) for all notes that are:
     - not marked for deletion
     - not password protected
-    - not in Recently Deleted (translated)
+    - not in Recently Deleted
 
     Folder filtering keeps the existing UX: substring match on folder name.
     """
-    db_path = os.getenv("MEMO_NOTES_DB_PATH", _default_db_path())
-    if not os.path.exists(db_path):
-        raise FileNotFoundError(db_path)
-
-    folder_filter = (folder or "").strip()
-
-    con = _connect(db_path)
-    try:
-        cols = _note_columns(con)
-        t0 = time.perf_counter()
-        select_cols = [
-            "n.Z_PK as pk",
-            "n.ZTITLE1 as title",
-        ]
-        if "ZSNIPPET" in cols:
-            select_cols.append("n.ZSNIPPET as snippet")
-        if "ZSUMMARY" in cols:
-            select_cols.append("n.ZSUMMARY as summary")
-        if "ZIDENTIFIER" in cols:
-            select_cols.append("n.ZIDENTIFIER as identifier")
-        select_cols.append("f.ZTITLE2 as folder")
-
-        q = f"""
-        select
-            {", ".join(select_cols)}
-        from ZICCLOUDSYNCINGOBJECT n
-        left join ZICCLOUDSYNCINGOBJECT f
-            on f.Z_PK = n.ZFOLDER and f.Z_ENT = 15
-        where n.Z_ENT = 12
-          and (n.ZMARKEDFORDELETION is null or n.ZMARKEDFORDELETION = 0)
-          and (n.ZISPASSWORDPROTECTED is null or n.ZISPASSWORDPROTECTED = 0)
-        """
-        rows = con.execute(q).fetchall()
-        _maybe_timing("notes_sqlite/list_notes_meta/query", t0)
-    finally:
-        con.close()
-
-    t_parse = time.perf_counter()
     out: list[NoteMeta] = []
+    rows, paths, note_id_prefix = _query_notes(folder, with_meta=True)
     for r in rows:
-        pk = r["pk"] if isinstance(r, sqlite3.Row) and "pk" in r.keys() else None
-        pk = int(pk) if isinstance(pk, int) else None
-
-        raw_title = r["title"] if isinstance(r, sqlite3.Row) else ""
-        raw_title = raw_title.strip() if isinstance(raw_title, str) else ""
-        snippet = r["snippet"] if isinstance(r, sqlite3.Row) and "snippet" in r.keys() else None
-        summary = r["summary"] if isinstance(r, sqlite3.Row) and "summary" in r.keys() else None
-        title = _best_title(
-            raw_title=str(raw_title or ""),
-            snippet=snippet if isinstance(snippet, str) else None,
-            summary=summary if isinstance(summary, str) else None,
-            pk=pk,
-        )
-
-        folder_name = r["folder"] if isinstance(r, sqlite3.Row) else None
-        folder_name = folder_name or ""
-        folder_name = folder_name.strip() if isinstance(folder_name, str) else ""
-        if folder_name in _DELETED_TRANSLATIONS:
-            continue
-
-        if folder_filter:
-            if folder_name and folder_filter not in folder_name:
-                continue
-
-        identifier = None
-        if isinstance(r, sqlite3.Row) and "identifier" in r.keys():
-            raw = r["identifier"]
-            if isinstance(raw, str) and raw.strip():
-                identifier = raw.strip()
-
+        raw_title = r["raw_title"]
+        identifier = r["identifier"]
         out.append(
             NoteMeta(
-                folder=folder_name,
-                title=title,
-                identifier=identifier,
-                lookup_title=raw_title,
-                pk=pk,
+                folder=r["folder"],
+                title=r["title"],
+                identifier=(
+                    identifier.strip()
+                    if isinstance(identifier, str) and identifier.strip()
+                    else None
+                ),
+                lookup_title=raw_title.strip() if isinstance(raw_title, str) else "",
+                pk=r["pk"],
+                modified=r["modified"],
+                created=r["created"],
+                folder_path=paths.get(r["folder_pk"], ""),
+                note_id=f"{note_id_prefix}{r['pk']}" if note_id_prefix else None,
             )
         )
-
-    out.sort(key=lambda x: f"{x.folder}\n{x.title}".casefold())
-    _maybe_timing("notes_sqlite/list_notes_meta/format", t_parse)
     return out
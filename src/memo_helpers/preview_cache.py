@@ -0,0 +1,112 @@
+import hashlib
+import os
+import time
+from pathlib import Path
+
+from memo_helpers.cache import cache_dir
+
+# Rendered note previews, shared across `memo notes --search` sessions.
+#
+# Entries are content-addressed: the key covers the note's identity *and* its
+# modification date, so an edited note simply misses and gets re-rendered;
+# stale entries age out through LRU eviction instead of explicit invalidation.
+
+# Bump when preview rendering changes, to stop serving old renders.
+_RENDER_VERSION = "1"
+
+
+def _previews_dir() -> Path:
+    return cache_dir() / "previews_v1"
+
+
+def _max_bytes() -> int:
+    raw = os.getenv("MEMO_PREVIEW_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        return 64 * 1024 * 1024
+
+
+def preview_key(item: dict) -> str | None:
+    """
+    Cache key for a preview map item, or None when it can't be validated.
+
+    Items without a modification date (AppleScript listings) can't tell whether
+    the note changed, so they are not cached across sessions.
+    """
+    if os.getenv("MEMO_NO_CACHE") == "1":
+        return None
+    modified = item.get("modified")
+    if not isinstance(modified, (int, float)):
+        return None
+    identity = item.get("pk") or item.get("identifier") or item.get("note_id")
+    if identity is None:
+        return None
+    raw = f"{_RENDER_VERSION}:{identity}:{modified!r}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:40]
+
+
+def _entry_path(key: str) -> Path:
+    return _previews_dir() / key[:2] / f"{key}.md"
+
+
+def preview_get(key: str) -> str | None:
+    p = _entry_path(key)
+    try:
+        text = p.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return None
+    try:
+        # mtime doubles as the LRU clock.
+        os.utime(p)
+    except OSError:
+        pass
+    return text
+
+
+def preview_put(key: str, text: str) -> None:
+    import tempfile
+
+    p = _entry_path(key)
+    try:
+        p.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=p.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, p)
+    except OSError:
+        return
+
+
+def preview_evict(max_bytes: int | None = None) -> None:
+    """Drop least recently used previews until the cache fits in `max_bytes`."""
+    limit = _max_bytes() if max_bytes is None else max_bytes
+    root = _previews_dir()
+    if not root.exists():
+        return
+    entries = []
+    total = 0
+    now = time.time()
+    for p in root.glob("*/*"):
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        if p.suffix == ".tmp":
+            # Leftover from an interrupted write.
+            if now - st.st_mtime > 3600:
+                p.unlink(missing_ok=True)
+            continue
+        entries.append((st.st_mtime, st.st_size, p))
+        total += st.st_size
+    if total <= limit:
+        return
+    entries.sort()
+    for _mtime, size, p in entries:
+        if total <= limit:
+            break
+        try:
+            p.unlink()
+            total -= size
+        except OSError:
+            continue
@@ -0,0 +1,43 @@
+import os
+import socket
+import sys
+
+# Client for preview_server.py, run by fzf on every focus change.
+#
+# Started as `python -S preview_client.py SOCKET KEY`: keep it stdlib-only and
+# free of memo imports so interpreter startup stays minimal. The one exception
+# is tracing, loaded only when MEMO_TRACE is set.
+
+
+def main(argv: list[str]) -> int:
+    if not os.getenv("MEMO_TRACE"):
+        return _request(argv)
+    # -S leaves site-packages off sys.path; memo_helpers sits next to us.
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from memo_helpers.tracing import span
+
+    with span("preview_client/request", key=argv[-1] if argv else ""):
+        return _request(argv)
+
+
+def _request(argv: list[str]) -> int:
+    if len(argv) != 2:
+        print("(no preview)")
+        return 0
+    socket_path, key = argv
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.connect(socket_path)
+            s.sendall(key.encode("utf-8") + b"\n")
+            out = sys.stdout.buffer
+            while chunk := s.recv(65536):
+                out.write(chunk)
+            out.write(b"\n")
+            out.flush()
+    except OSError as e:
+        print(f"(preview error: {type(e).__name__})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
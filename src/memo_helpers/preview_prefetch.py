@@ -0,0 +1,127 @@
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+
+from memo_helpers.fzf_preview_notes import cached_preview
+
+# How many neighbours on each side of the focused item get warmed.
+_NEIGHBOUR_RADIUS = 3
+# Total time stop() waits for in-flight renders, across all workers.
+_STOP_GRACE_SECONDS = 0.2
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+class PreviewPrefetcher:
+    """
+    Warm the preview cache in the background while fzf is running.
+
+    Starts with the first `top_n` items, then follows the focused item, reported
+    through `notify_focus()` (or, without a preview server, by fzf appending the
+    focused key to `focus_path`); its neighbours are queued.
+    Work is LIFO, so what the user is looking at now wins over the initial
+    backlog. `stop()` cancels pending work when fzf exits.
+
+    Tuning: MEMO_PREVIEW_PREFETCH (items warmed up front, 0 disables
+    prefetching) and MEMO_PREVIEW_WORKERS (concurrent renders).
+    """
+
+    def __init__(self, items: dict[str, dict], map_path: Path, focus_path: Path | None = None):
+        self.items = items
+        self.map_path = map_path
+        self.focus_path = focus_path
+        self.top_n = _env_int("MEMO_PREVIEW_PREFETCH", 30)
+        self.workers = max(1, _env_int("MEMO_PREVIEW_WORKERS", 4))
+        self._queue: queue.LifoQueue[str] = queue.LifoQueue()
+        self._seen: set[str] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    @property
+    def enabled(self) -> bool:
+        return self.top_n > 0 and bool(self.items)
+
+    def start(self) -> None:
+        if not self.enabled:
+            return
+        # Reversed, so the LIFO queue hands out item 1 first.
+        for key in reversed([str(i) for i in range(1, self.top_n + 1)]):
+            self._schedule(key)
+        for _ in range(self.workers):
+            t = threading.Thread(target=self._work, daemon=True)
+            t.start()
+            self._threads.append(t)
+        if self.focus_path is not None:
+            t = threading.Thread(target=self._follow_focus, daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self) -> None:
+        self._stop.set()
+        # One shared deadline: a render stuck in AppleScript must not hold up
+        # exiting fzf. Workers are daemon threads, so stragglers don't block
+        # interpreter exit either.
+        deadline = time.monotonic() + _STOP_GRACE_SECONDS
+        for t in self._threads:
+            t.join(timeout=max(0.0, deadline - time.monotonic()))
+        self._threads.clear()
+
+    def notify_focus(self, key: str) -> None:
+        if not self.enabled or self._stop.is_set():
+            return
+        try:
+            focused = int(key)
+        except ValueError:
+            return
+        # Queue the far neighbours first so the closest ones run first.
+        for distance in range(_NEIGHBOUR_RADIUS, 0, -1):
+            self._schedule(str(focused + distance))
+            self._schedule(str(focused - distance))
+        self._schedule(str(focused))
+
+    def _schedule(self, key: str) -> None:
+        with self._lock:
+            if key in self._seen or key not in self.items:
+                return
+            self._seen.add(key)
+        self._queue.put(key)
+
+    def _work(self) -> None:
+        while not self._stop.is_set():
+            try:
+                key = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if self._stop.is_set():
+                return
+            try:
+                cached_preview(self.map_path, key, self.items[key])
+            except Exception:
+                # Prefetch is best-effort; the on-demand preview reports errors.
+                pass
+
+    def _follow_focus(self) -> None:
+        offset = 0
+        while not self._stop.wait(0.05):
+            try:
+                with open(self.focus_path, "rb") as f:
+                    f.seek(offset)
+                    data = f.read()
+            except FileNotFoundError:
+                continue
+            # Only consume complete lines; fzf may be mid-write.
+            end = data.rfind(b"\n") + 1
+            if not end:
+                continue
+            offset += end
+            lines = data[:end].decode("utf-8", errors="replace").split()
+            if lines:
+                self.notify_focus(lines[-1])
@@ -0,0 +1,74 @@
+import socketserver
+import threading
+from pathlib import Path
+
+from memo_helpers.fzf_preview_notes import cached_preview
+from memo_helpers.tracing import span
+
+# Resident preview backend for `memo notes --search`.
+#
+# fzf runs its `--preview` command on every focus change. Instead of starting a
+# Python interpreter that re-imports the converters and re-parses the preview
+# map each time, the search session keeps both in memory here and serves
+# rendered previews over a Unix socket. The per-keystroke command is the tiny
+# stdlib-only client in preview_client.py.
+
+
+class _PreviewHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        server: "PreviewServer" = self.server.preview  # type: ignore[attr-defined]
+        key = self.rfile.readline().decode("utf-8", errors="replace").strip()
+        self.wfile.write(server.render(key).encode("utf-8"))
+
+
+class _Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class PreviewServer:
+    def __init__(self, items: dict[str, dict], map_path: Path, socket_path: Path, on_focus=None):
+        self.items = items
+        self.map_path = map_path
+        self.socket_path = socket_path
+        # Called with each requested key; a request means the item has focus.
+        self.on_focus = on_focus
+        self._server: _Server | None = None
+        self._thread: threading.Thread | None = None
+
+    def render(self, key: str) -> str:
+        item = self.items.get(key)
+        if not isinstance(item, dict):
+            return "(no preview)"
+        if self.on_focus is not None:
+            self.on_focus(key)
+        try:
+            with span("preview_server/render", key=key):
+                return cached_preview(self.map_path, key, item)
+        except Exception as e:
+            return f"(preview error: {type(e).__name__})"
+
+    def start(self) -> bool:
+        """Start serving; returns False if the socket can't be created."""
+        try:
+            self._server = _Server(str(self.socket_path), _PreviewHandler)
+        except (OSError, AttributeError):
+            # AttributeError: platform without AF_UNIX support.
+            return False
+        self._server.preview = self  # type: ignore[attr-defined]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        try:
+            self.socket_path.unlink()
+        except OSError:
+            pass
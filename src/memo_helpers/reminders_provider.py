@@ -0,0 +1,127 @@
+import click
+from dataclasses import asdict, replace
+
+from memo_helpers.apple_sqlite import backend_from_env
+from memo_helpers.cache import cache_delete, cache_get, cache_set, cache_update
+from memo_helpers.tracing import count, span, traced
+
+# Cached listings live under this prefix, one entry per backend and list:
+# "reminders:v1:<sqlite|applescript>:<list name>". SQLite listings are keyed by
+# the store fingerprint; AppleScript ones use the TTL. memo's own changes are
+# applied to the cached entries right away (see below), so a triage session
+# doesn't refetch after every completed reminder.
+_CACHE_PREFIX = "reminders:"
+
+
+def _backend() -> str:
+    """Reminders listing backend from MEMO_REMINDERS_BACKEND (see backend_from_env)."""
+    return backend_from_env("MEMO_REMINDERS_BACKEND")
+
+
+def _fingerprint(backend: str) -> str | None:
+    if backend == "applescript":
+        return None
+    try:
+        from memo_helpers.reminders_sqlite import store_fingerprint
+
+        return store_fingerprint()
+    except Exception:
+        return None
+
+
+def _sqlite_reminders(backend: str, list_name: str):
+    """
+    Incomplete reminders from the Reminders stores, or None to fall back.
+
+    Forced sqlite raises a ClickException on failure; auto returns None so the
+    caller can fall back to AppleScript.
+    """
+    with span(f"reminders_provider/sqlite_{backend}"):
+        try:
+            from memo_helpers.reminders_sqlite import list_reminders
+
+            return list_reminders(list_name)
+        except Exception as e:
+            if backend == "sqlite":
+                raise click.ClickException(
+                    f"SQLite Reminders backend failed: {type(e).__name__}"
+                )
+            count(f"reminders_provider/fallback/{type(e).__name__}")
+            return None
+
+
+def _sort_key(r) -> tuple:
+    return (r.due is None, r.due or 0.0, r.title.casefold())
+
+
+def _cached(key: str, fingerprint: str | None = None):
+    from memo_helpers.reminders_sqlite import Reminder
+
+    cached = cache_get(key, fingerprint=fingerprint)
+    if not isinstance(cached, list):
+        return None
+    try:
+        return [Reminder(**d) for d in cached]
+    except TypeError:
+        return None
+
+
+@traced("reminders_provider/get_reminder")
+def get_reminder(list_name: str = ""):
+    """
+    Incomplete reminders as reminders_sqlite.Reminder records, soonest due
+    first and undated ones last. `list_name` limits them to one list.
+
+    Read from the local Reminders stores when possible, which skips walking
+    every reminder through AppleScript.
+    """
+    backend = _backend()
+    if backend != "applescript":
+        fp = _fingerprint(backend)
+        key = f"{_CACHE_PREFIX}v1:sqlite:{list_name}"
+        cached = _cached(key, fp) if fp is not None else None
+        if cached is not None:
+            return cached
+        reminders = _sqlite_reminders(backend, list_name)
+        if reminders is not None:
+            reminders.sort(key=_sort_key)
+            if fp is not None:
+                cache_set(key, [asdict(r) for r in reminders], fingerprint=fp)
+            return reminders
+
+    key = f"{_CACHE_PREFIX}v1:applescript:{list_name}"
+    cached = _cached(key)
+    if cached is not None:
+        return cached
+    from memo_helpers.get_memo import get_reminder as applescript_get_reminder
+
+    with span("reminders_provider/applescript"):
+        reminders = sorted(applescript_get_reminder(list_name), key=_sort_key)
+    cache_set(key, [asdict(r) for r in reminders])
+    return reminders
+
+
+def forget_reminder(*reminder_ids: str) -> None:
+    """Drop completed or deleted reminders from the cached listings."""
+    gone = set(reminder_ids)
+    if gone:
+        cache_update(
+            _CACHE_PREFIX, lambda data: [d for d in data if d["reminder_id"] not in gone]
+        )
+
+
+def update_cached_reminder(reminder_id: str, **changes) -> None:
+    """Apply an edit (new `title` and/or `due` timestamp) to the cached listings."""
+    from memo_helpers.reminders_sqlite import Reminder
+
+    def _apply(data):
+        out = [Reminder(**d) for d in data]
+        out = [replace(r, **changes) if r.reminder_id == reminder_id else r for r in out]
+        return [asdict(r) for r in sorted(out, key=_sort_key)]
+
+    cache_update(_CACHE_PREFIX, _apply)
+
+
+def invalidate_reminders_cache() -> None:
+    """Forget every cached listing, e.g. after adding a reminder."""
+    cache_delete(_CACHE_PREFIX)
@@ -0,0 +1,130 @@
+import glob
+import os
+import sqlite3
+from dataclasses import dataclass
+
+from memo_helpers.apple_sqlite import CORE_DATA_EPOCH, file_fingerprint, open_readonly
+from memo_helpers.tracing import count, span
+
+# Read-only access to the Reminders stores (one Data-*.sqlite per account).
+#
+# Like NoteStore.sqlite this is a private Core Data schema, so every column is
+# checked before use and callers fall back to AppleScript on any error:
+#
+#   ZREMCDREMINDER  Z_PK, ZTITLE, ZCOMPLETED, ZMARKEDFORDELETION, ZDUEDATE,
+#                   ZLIST (-> ZREMCDBASELIST), ZCKIDENTIFIER
+#   ZREMCDBASELIST  Z_PK, ZNAME, ZMARKEDFORDELETION
+#
+# The AppleScript id of a reminder is "x-apple-reminder://" + ZCKIDENTIFIER.
+
+_ID_PREFIX = "x-apple-reminder://"
+
+
+@dataclass(frozen=True, slots=True)
+class Reminder:
+    reminder_id: str
+    title: str
+    due: float | None  # Unix epoch seconds
+    list_name: str = ""
+
+
+def _default_stores_dir() -> str:
+    # Note: this is private implementation detail of Reminders and may change.
+    return os.path.expanduser(
+        "~/Library/Group Containers/group.com.apple.reminders/Container_v1/Stores"
+    )
+
+
+def _db_paths() -> list[str]:
+    """
+    Store files to read: MEMO_REMINDERS_DB_PATH (a file, or a directory of
+    Data-*.sqlite stores), else every store in the Reminders container.
+    """
+    path = os.getenv("MEMO_REMINDERS_DB_PATH") or _default_stores_dir()
+    if os.path.isdir(path):
+        return sorted(glob.glob(os.path.join(path, "Data-*.sqlite")))
+    return [path] if os.path.exists(path) else []
+
+
+def store_fingerprint() -> str | None:
+    """
+    Cheap change marker over all stores (and their WAL files), used to validate
+    cached listings. Returns None when there is no store.
+    """
+    return file_fingerprint(_db_paths())
+
+
+def _columns(con: sqlite3.Connection, table: str) -> set[str]:
+    return {r["name"] for r in con.execute(f"PRAGMA table_info({table})")}
+
+
+def _query_store(db_path: str, list_name: str) -> list[Reminder] | None:
+    """Reminders from one store, or None when it lacks the expected schema."""
+    con = open_readonly(db_path)
+    try:
+        cols = _columns(con, "ZREMCDREMINDER")
+        if not {"ZTITLE", "ZCOMPLETED", "ZCKIDENTIFIER"} <= cols:
+            # Empty placeholder store, or a schema we don't know.
+            return None
+        list_cols = _columns(con, "ZREMCDBASELIST") if "ZLIST" in cols else set()
+        has_lists = "ZNAME" in list_cols
+        due_sql = "r.ZDUEDATE" if "ZDUEDATE" in cols else "null"
+        where = ["r.ZCOMPLETED = 0"]
+        if "ZMARKEDFORDELETION" in cols:
+            where.append("coalesce(r.ZMARKEDFORDELETION, 0) = 0")
+        if has_lists and "ZMARKEDFORDELETION" in list_cols:
+            where.append("coalesce(l.ZMARKEDFORDELETION, 0) = 0")
+        params: list[str] = []
+        if list_name and has_lists:
+            where.append("l.ZNAME = ?")
+            params.append(list_name)
+        elif list_name:
+            return []
+        q = f"""
+        select
+            r.ZCKIDENTIFIER as ck_id,
+            coalesce(r.ZTITLE, '') as title,
+            {due_sql} as due,
+            {"coalesce(l.ZNAME, '')" if has_lists else "''"} as list_name
+        from ZREMCDREMINDER r
+        {"left join ZREMCDBASELIST l on l.Z_PK = r.ZLIST" if has_lists else ""}
+        where {" and ".join(where)}
+        """
+        rows = con.execute(q, params).fetchall()
+    finally:
+        con.close()
+    count("sqlite/rows", len(rows))
+    return [
+        Reminder(
+            reminder_id=_ID_PREFIX + r["ck_id"],
+            title=r["title"],
+            due=r["due"] + CORE_DATA_EPOCH if r["due"] is not None else None,
+            list_name=r["list_name"],
+        )
+        for r in rows
+        if r["ck_id"]
+    ]
+
+
+def list_reminders(list_name: str = "") -> list[Reminder]:
+    """
+    Incomplete reminders across all stores, in store order.
+
+    `list_name` keeps only reminders in the list with that exact name. Raises
+    FileNotFoundError when there is no store, sqlite3 errors when none can be
+    read.
+    """
+    paths = _db_paths()
+    if not paths:
+        raise FileNotFoundError(os.getenv("MEMO_REMINDERS_DB_PATH") or _default_stores_dir())
+    out: list[Reminder] = []
+    readable = False
+    with span("reminders_sqlite/query", stores=len(paths)):
+        for db_path in paths:
+            found = _query_store(db_path, list_name)
+            if found is not None:
+                readable = True
+                out.extend(found)
+    if not readable:
+        raise sqlite3.DatabaseError("no Reminders store with a known schema")
+    return out
@@ -4,8 +4,18 @@ import shlex
 import subprocess
 import sys
 import tempfile
+import threading
+from pathlib import Path
 
-from memo_helpers.notes_provider import list_notes_meta
+import click
+
+from memo_helpers.notes_index import index_excerpts, note_key, search_index, update_index
+from memo_helpers.notes_provider import list_notes_meta, listing_fingerprint, notes_backend
+from memo_helpers.preview_cache import preview_evict
+from memo_helpers import preview_client
+from memo_helpers.preview_prefetch import PreviewPrefetcher
+from memo_helpers.preview_server import PreviewServer
+from memo_helpers.tracing import child_env, span
 
 
 def fuzzy_notes(folder: str = "") -> None:
@@ -14,9 +24,20 @@ def fuzzy_notes(folder: str = "") -> None:
 
     Implementation notes:
     - Listing uses memo's Notes provider (sqlite when available, else AppleScript).
-    - Preview is lazy: body is fetched on-demand via AppleScript and cached on disk.
+    - Preview is rendered on demand and cached on disk across sessions (keyed by
+      note and modification date); a background prefetcher warms the cache for
+      the first items and around the focused one.
+    - Each line carries the start of the note's body from the full-text index,
+      so content can be matched too. Only what is already indexed is used; the
+      index is refreshed from NoteStore.sqlite in the background while fzf is
+      open, so new excerpts show up on the next run. AppleScript bodies are
+      indexed by `--grep`.
     """
     notes = list_notes_meta(folder=folder)
+    try:
+        excerpts = index_excerpts(notes)
+    except Exception:
+        excerpts = {}
 
     with tempfile.TemporaryDirectory() as tmpdirname:
         map_path = os.path.join(tmpdirname, "notes_map_v1.json")
@@ -41,28 +62,51 @@ def fuzzy_notes(folder: str = "") -> None:
                 "note_id": n.get("note_id"),
                 "lookup_title": n.get("lookup_title"),
                 "pk": n.get("pk"),
+                "modified": n.get("modified"),
                 "cache_key": cache_key,
             }
-            lines.append(f"{key}\t{display}")
+            excerpt = excerpts.get(note_key(n), "").replace("\t", " ")
+            if excerpt:
+                lines.append(f"{key}\t{display}\t\x1b[2m{excerpt}\x1b[0m")
+            else:
+                lines.append(f"{key}\t{display}")
 
         with open(map_path, "w", encoding="utf-8") as f:
             json.dump({"items": items}, f, ensure_ascii=True)
 
         map_q = shlex.quote(map_path)
         py = shlex.quote(sys.executable or "python3")
+        bat = "if command -v bat >/dev/null 2>&1; then bat --style=plain --color=always --language=markdown -; else cat; fi"
+
+        prefetcher = PreviewPrefetcher(items, Path(map_path))
+        socket_path = Path(tmpdirname) / "preview.sock"
+        server = PreviewServer(
+            items, Path(map_path), socket_path, on_focus=prefetcher.notify_focus
+        )
         # Use numeric key (field 1) for preview, to avoid shell-escaping note titles.
+        if server.start():
+            # Resident server: each focus change only costs a stdlib-only client.
+            client_q = shlex.quote(preview_client.__file__)
+            sock_q = shlex.quote(str(socket_path))
+            preview_cmd = f"{py} -S {client_q} {sock_q} {{1}} | {bat}"
+            focus_bind = ""
+        else:
+            preview_cmd = f"{py} -m memo_helpers.fzf_preview_notes --map {map_q} --key {{1}} | {bat}"
+            focus_path = os.path.join(tmpdirname, "focus.log")
+            prefetcher.focus_path = Path(focus_path)
+            focus_bind = f"execute-silent(echo {{1}} >> {shlex.quote(focus_path)})+"
         #
         # fzf runs `--preview` and some `--bind` actions through $SHELL -c.
         # When users run fish, fish-specific parsing breaks POSIX-y snippets.
         # Force a predictable shell for fzf to avoid preview breakage.
-        env = os.environ.copy()
+        env = child_env()
         env["SHELL"] = os.getenv("MEMO_FZF_SHELL", "/bin/sh")
         fzf_command = f"""
         fzf --style=full \\
             --border --padding=1,2 \\
             --border-label=' Your Notes ' --input-label=' Input ' --header-label=' Note ' \\
-            --delimiter='\\t' --with-nth=2.. \\
-            --preview='{py} -m memo_helpers.fzf_preview_notes --map {map_q} --key {{1}} | if command -v bat >/dev/null 2>&1; then bat --style=plain --color=always --language=markdown -; else cat; fi' \\
+            --ansi --delimiter='\\t' --with-nth=2.. \\
+            --preview='{preview_cmd}' \\
             --preview-window=right:60%:wrap:cycle \\
             --bind='ctrl-d:preview-down,ctrl-u:preview-up' \\
             --bind='result:transform-list-label:
@@ -71,18 +115,65 @@ def fuzzy_notes(folder: str = "") -> None:
                 else
                 echo \" $FZF_MATCH_COUNT matches for [$FZF_QUERY] \"
                 fi' \\
-            --bind='focus:transform-preview-label:if [ -n \"{{1}}\" ]; then printf \" Previewing [%s] \" \"{{1}}\"; fi' \\
+            --bind='focus:{focus_bind}transform-preview-label:if [ -n \"{{1}}\" ]; then printf \" Previewing [%s] \" \"{{1}}\"; fi' \\
             --color='border:#aaaaaa,label:#cccccc' \\
             --color='preview-border:#9999cc,preview-label:#ccccff' \\
             --color='list-border:#669966,list-label:#99cc99' \\
             --color='input-border:#996666,input-label:#ffcccc' \\
             --color='header-border:#6699cc,header-label:#99ccff'
         """
-        subprocess.run(
-            fzf_command,
-            shell=True,
-            cwd=tmpdirname,
-            env=env,
-            input="\n".join(lines) + ("\n" if lines else ""),
-            text=True,
+        prefetcher.start()
+        threading.Thread(target=_refresh_index, args=(notes, folder), daemon=True).start()
+        try:
+            with span("search/fzf"):
+                subprocess.run(
+                    fzf_command,
+                    shell=True,
+                    cwd=tmpdirname,
+                    env=env,
+                    input="\n".join(lines) + ("\n" if lines else ""),
+                    text=True,
+                )
+        finally:
+            server.stop()
+            prefetcher.stop()
+            preview_evict()
+
+
+def _refresh_index(notes: list[dict], folder: str) -> None:
+    # Runs while fzf is open; an unfinished refresh keeps what it committed and
+    # resumes on the next run.
+    try:
+        update_index(
+            notes,
+            prune=not folder,
+            fingerprint=listing_fingerprint(notes_backend()),
+            allow_applescript=False,
         )
+    except Exception:
+        pass
+
+
+def grep_notes(query: str, folder: str = "", limit: int = 20) -> None:
+    """
+    Print notes whose contents match `query`, best matches first.
+
+    The full-text index is brought up to date first; only notes modified since
+    the last run have their bodies read.
+    """
+    notes = list_notes_meta(folder=folder)
+    backend = notes_backend()
+    indexed = update_index(notes, prune=not folder, fingerprint=listing_fingerprint(backend))
+    if indexed:
+        click.secho(f"\nIndexed {indexed} notes.", fg="yellow", err=True)
+
+    hits = search_index(query, folder=folder, limit=limit)
+    if not hits:
+        click.secho(f"\nNo notes match '{query}'.", fg="yellow")
+        return
+    click.echo()
+    for hit in hits:
+        display = f"{hit.folder} - {hit.title}" if hit.folder else hit.title
+        click.secho(display, bold=True)
+        if hit.snippet:
+            click.echo(f"    {hit.snippet}")
@@ -0,0 +1,360 @@
+import atexit
+import contextlib
+import functools
+import itertools
+import os
+import sys
+import threading
+import time
+
+# Timing and tracing for every memo code path.
+#
+# Work is wrapped in nested spans (`with span("notes_provider/list_meta"):`) that
+# collect counters (`count("sqlite/rows", n)`). Nothing is recorded unless one of
+# these is set:
+#
+# - MEMO_TIMING=1: print the span tree with durations and counters to stderr
+#   when memo exits.
+# - MEMO_TRACE=path: append every finished span to `path`, as JSON lines when it
+#   ends in `.jsonl`, otherwise as Chrome trace events (open it in Perfetto or
+#   chrome://tracing). MEMO_TRACE_FORMAT=jsonl|chrome overrides the suffix.
+#
+# Child processes started with `child_env()` (the fzf preview commands, export
+# workers) append to the same trace, with their root spans linked to the span
+# that started them. Only the top-level process prints the MEMO_TIMING tree, so
+# previews stay clean.
+#
+# Stdlib-only, so the preview client can import it without pulling in click.
+
+_PARENT_ENV = "MEMO_TRACE_PARENT"
+
+# perf_counter() is per process; spans are stamped on the wall clock so events
+# from several processes line up in one trace.
+_EPOCH = time.time() - time.perf_counter()
+
+# MEMO_TIMING keeps this many top-level spans; long fzf sessions produce many.
+_MAX_ROOTS = 500
+# Longer runs of same-named sibling spans are printed as one summary line.
+_COLLAPSE_AFTER = 5
+
+_ids = itertools.count(1)
+_local = threading.local()
+_lock = threading.Lock()
+_roots: list["_Span"] = []
+_dropped_roots = 0
+_loose_counters: dict[str, int] = {}
+_sink = None
+_parent: tuple[str, str, int] | None = None
+_registered = False
+
+
+def _timing() -> bool:
+    return os.getenv("MEMO_TIMING") == "1" and not os.getenv(_PARENT_ENV)
+
+
+def enabled() -> bool:
+    return bool(os.getenv("MEMO_TRACE")) or _timing()
+
+
+class _Span:
+    __slots__ = ("name", "attrs", "counters", "children", "span_id", "parent_id", "start", "end", "tid")
+
+    def __init__(self, name: str, attrs: dict, parent_id: str | None):
+        self.name = name
+        self.attrs = attrs
+        self.counters: dict[str, int] = {}
+        self.children: list[_Span] = []
+        self.span_id = f"{os.getpid()}-{next(_ids)}"
+        self.parent_id = parent_id
+        self.tid = threading.get_ident()
+        self.start = time.perf_counter()
+        self.end: float | None = None
+
+    @property
+    def ms(self) -> float:
+        return ((self.end or time.perf_counter()) - self.start) * 1000.0
+
+
+class _Sink:
+    """Append-only trace file, shared by every memo process of a session."""
+
+    def __init__(self, path: str):
+        fmt = os.getenv("MEMO_TRACE_FORMAT", "").strip().lower()
+        self.chrome = fmt == "chrome" or (fmt != "jsonl" and not path.endswith(".jsonl"))
+        if self.chrome:
+            # The JSON array format may be left unterminated, which lets every
+            # process append without coordinating who writes the closing "]".
+            try:
+                fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+                os.write(fd, b"[\n")
+                os.close(fd)
+            except FileExistsError:
+                pass
+        self.fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        if self.chrome:
+            self.write(
+                {
+                    "ph": "M",
+                    "name": "process_name",
+                    "pid": os.getpid(),
+                    "args": {"name": " ".join([os.path.basename(sys.argv[0] or "python"), *sys.argv[1:3]])},
+                }
+            )
+
+    def write(self, event: dict) -> None:
+        import json
+
+        line = json.dumps(event, ensure_ascii=False, default=str)
+        # One write per event: O_APPEND keeps lines from different processes whole.
+        os.write(self.fd, (line + (",\n" if self.chrome else "\n")).encode("utf-8"))
+
+    def span(self, s: _Span) -> None:
+        if self.chrome:
+            self.write(
+                {
+                    "ph": "X",
+                    "name": s.name,
+                    "cat": "memo",
+                    "pid": os.getpid(),
+                    "tid": s.tid,
+                    "ts": round((_EPOCH + s.start) * 1e6, 1),
+                    "dur": round((s.end - s.start) * 1e6, 1),
+                    "args": {**s.attrs, **s.counters},
+                }
+            )
+            return
+        self.write(
+            {
+                "trace": _trace_id(),
+                "span": s.span_id,
+                "parent": s.parent_id,
+                "name": s.name,
+                "pid": os.getpid(),
+                "tid": s.tid,
+                "start": round(_EPOCH + s.start, 6),
+                "ms": round(s.ms, 3),
+                "attrs": s.attrs,
+                "counters": s.counters,
+            }
+        )
+
+    def flow(self, phase: str, flow_id: int, ts: float) -> None:
+        # Chrome flow arrows link a span to the child process it started.
+        if self.chrome:
+            event = {
+                "ph": phase,
+                "id": flow_id,
+                "name": "spawn",
+                "cat": "memo",
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "ts": round((_EPOCH + ts) * 1e6, 1),
+            }
+            if phase == "f":
+                event["bp"] = "e"
+            self.write(event)
+
+
+def _get_sink() -> "_Sink | None":
+    global _sink
+    path = os.getenv("MEMO_TRACE")
+    if not path:
+        return None
+    if _sink is None:
+        with _lock:
+            if _sink is None:
+                try:
+                    _sink = _Sink(path)
+                except OSError:
+                    return None
+    return _sink
+
+
+def _trace_id() -> str:
+    return _inherited()[0] if _inherited() else f"{os.getpid()}-{int(_EPOCH)}"
+
+
+def _inherited() -> tuple[str, str, int] | None:
+    """(trace id, parent span id, flow id) from the process that started us."""
+    global _parent
+    if _parent is None:
+        raw = os.getenv(_PARENT_ENV, "")
+        parts = raw.split(":")
+        if len(parts) == 3 and parts[2].isdigit():
+            _parent = (parts[0], parts[1], int(parts[2]))
+        else:
+            _parent = ("", "", 0)
+    return _parent if _parent[0] else None
+
+
+def _stack() -> list[_Span]:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _register_exit() -> None:
+    global _registered
+    if not _registered:
+        _registered = True
+        atexit.register(report)
+
+
+@contextlib.contextmanager
+def _open_span(name: str, attrs: dict):
+    stack = _stack()
+    parent = stack[-1] if stack else None
+    inherited = _inherited() if parent is None else None
+    s = _Span(name, attrs, parent.span_id if parent else (inherited[1] if inherited else None))
+    if parent is not None:
+        parent.children.append(s)
+    sink = _get_sink()
+    if inherited and sink is not None:
+        sink.flow("f", inherited[2], s.start)
+    stack.append(s)
+    try:
+        yield s
+    finally:
+        s.end = time.perf_counter()
+        stack.pop()
+        if sink is not None:
+            sink.span(s)
+        if parent is None and _timing():
+            global _dropped_roots
+            with _lock:
+                if len(_roots) < _MAX_ROOTS:
+                    _roots.append(s)
+                else:
+                    _dropped_roots += 1
+            _register_exit()
+
+
+def span(name: str, **attrs):
+    """
+    Context manager timing the enclosed block as `name`, nested under the
+    current span of this thread. Keyword arguments are recorded with it.
+    """
+    if not enabled():
+        return contextlib.nullcontext()
+    return _open_span(name, attrs)
+
+
+def traced(name: str):
+    """Decorator running every call of the function in `span(name)`."""
+
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            if not enabled():
+                return fn(*args, **kwargs)
+            with _open_span(name, {}):
+                return fn(*args, **kwargs)
+
+        return inner
+
+    return wrap
+
+
+def count(name: str, n: int = 1) -> None:
+    """Add `n` to counter `name` on the current span."""
+    if not enabled():
+        return
+    stack = _stack()
+    if stack:
+        counters = stack[-1].counters
+        counters[name] = counters.get(name, 0) + n
+        return
+    if _timing():
+        with _lock:
+            _loose_counters[name] = _loose_counters.get(name, 0) + n
+        _register_exit()
+
+
+def child_env(env: dict | None = None) -> dict:
+    """
+    Environment for a child process whose spans belong to the current one.
+
+    Returns a copy of `env` (default: os.environ).
+    """
+    out = dict(os.environ if env is None else env)
+    if not enabled():
+        return out
+    stack = _stack()
+    parent_id = stack[-1].span_id if stack else ""
+    flow_id = next(_ids) + (os.getpid() << 20)
+    sink = _get_sink()
+    if sink is not None:
+        sink.flow("s", flow_id, time.perf_counter())
+    out[_PARENT_ENV] = f"{_trace_id()}:{parent_id}:{flow_id}"
+    return out
+
+
+def attach(env: dict) -> None:
+    """
+    Adopt the trace context from `child_env()`, e.g. as a pool initializer.
+
+    Also drops state copied from the parent by fork(), so the process records
+    its own spans.
+    """
+    global _parent, _sink, _local
+    _local = threading.local()
+    _sink = None
+    _parent = None
+    with _lock:
+        _roots.clear()
+        _loose_counters.clear()
+    if _PARENT_ENV in env:
+        os.environ[_PARENT_ENV] = env[_PARENT_ENV]
+
+
+def _format_counters(counters: dict[str, int]) -> str:
+    return "  ".join(f"{k}={v}" for k, v in sorted(counters.items()))
+
+
+def _render(spans: list[_Span], depth: int, lines: list[str]) -> None:
+    i = 0
+    while i < len(spans):
+        name = spans[i].name
+        j = i + 1
+        while j < len(spans) and spans[j].name == name:
+            j += 1
+        run = spans[i:j]
+        i = j
+        label = f"{'  ' * depth}{name}"
+        if len(run) > _COLLAPSE_AFTER:
+            # e.g. one decode span per exported note: summarise the run.
+            counters: dict[str, int] = {}
+            for s in run:
+                for k, v in s.counters.items():
+                    counters[k] = counters.get(k, 0) + v
+            total = sum(s.ms for s in run)
+            extra = _format_counters(counters)
+            lines.append(
+                f"[timing] {label + f' x{len(run)}':<48} {total:9.1f}ms"
+                f"  avg={total / len(run):.2f}ms" + (f"  {extra}" if extra else "")
+            )
+            continue
+        for s in run:
+            extra = _format_counters(s.counters)
+            lines.append(f"[timing] {label:<48} {s.ms:9.1f}ms" + (f"  {extra}" if extra else ""))
+            _render(s.children, depth + 1, lines)
+
+
+def report() -> None:
+    """Print the MEMO_TIMING tree of finished spans to stderr."""
+    global _dropped_roots
+    with _lock:
+        roots = sorted(_roots, key=lambda s: s.start)
+        _roots.clear()
+        loose = dict(_loose_counters)
+        _loose_counters.clear()
+        dropped, _dropped_roots = _dropped_roots, 0
+    lines: list[str] = []
+    _render(roots, 0, lines)
+    if dropped:
+        lines.append(f"[timing] ({dropped} more top-level spans not shown)")
+    if loose:
+        lines.append(f"[timing] (outside spans)  {_format_counters(loose)}")
+    if lines:
+        print("\n".join(lines), file=sys.stderr)
@@ -2,7 +2,19 @@ import click
 
 
 def selection_notes_validation(
-    folder, edit, delete, move, add, flist, search, remove, export
+    folder,
+    edit,
+    delete,
+    move,
+    add,
+    flist,
+    search,
+    remove,
+    export,
+    fmt=None,
+    compress=None,
+    with_html=False,
+    grep=None,
 ):
     used_flags = {
         "folder": bool(folder),
@@ -14,6 +26,7 @@ def selection_notes_validation(
         "search": search,
         "remove": remove,
         "export": export,
+        "grep": bool(grep),
     }
 
     if add and not folder:
@@ -21,14 +34,20 @@ def selection_notes_validation(
             "--add must be used indicating a folder to create the note to."
         )
 
+    if (fmt or compress or with_html) and not export:
+        raise click.UsageError("--format, --compress and --with-html require --export.")
+
+    if (compress or with_html) and not fmt:
+        raise click.UsageError("--compress and --with-html require --format.")
+
     if flist and sum(used_flags.values()) > 1:
         raise click.UsageError(
             "--flist must be used alone. It cannot be combined with other flags or --folder."
         )
 
-    modifier_flags = ["edit", "delete", "move", "remove", "search", "export"]
+    modifier_flags = ["edit", "delete", "move", "remove", "search", "export", "grep"]
     used_modifiers = [f for f in modifier_flags if used_flags[f]]
     if len(used_modifiers) > 1:
         raise click.UsageError(
-            "Only one of --edit, --delete, --move, --remove , --export or search can be used at a time."
+            "Only one of --edit, --delete, --move, --remove , --export, --grep or search can be used at a time."
         )
@@ -0,0 +1,106 @@
+import sys
+import textwrap
+
+from memo_helpers.applescript import run_applescript
+from memo_helpers.id_search_memo import get_note_bodies
+
+# Stand-in for osascript: answers the batch body script from argv, with bodies
+# that deliberately contain newlines, markup and look-alike framing.
+FAKE_OSACOMPILE = textwrap.dedent(
+    """\
+    #!{python}
+    import sys
+
+    with open({log!r}, "a") as f:
+        f.write("osacompile\\n")
+    out = sys.argv[sys.argv.index("-o") + 1]
+    with open(out, "w") as f:
+        f.write(sys.argv[sys.argv.index("-e") + 1])
+    """
+)
+
+FAKE_OSASCRIPT = textwrap.dedent(
+    """\
+    #!{python}
+    import sys
+
+    # Either `osascript -e SOURCE [--] args...` or `osascript COMPILED.scpt args...`.
+    # Like getopt, options are still parsed after `-e SOURCE` until "--".
+    args = sys.argv[3:] if sys.argv[1] == "-e" else sys.argv[2:]
+    if sys.argv[1] == "-e" and args:
+        if args[0] == "--":
+            args = args[1:]
+        elif args[0].startswith("-"):
+            sys.exit("osascript: illegal option -- " + args[0][1:])
+    with open({log!r}, "a") as f:
+        f.write(sys.argv[1] + " " + " ".join(args) + "\\n")
+    if not args:
+        sys.exit(0)
+    boundary, ids = args[0], args[1:]
+    out = []
+    for note_id in ids:
+        if note_id == "bad":
+            out.append(f"{{boundary}} error {{note_id}}\\nCan't get note id.\\n")
+        else:
+            body = f"<div>{{note_id}}</div>\\n<pre>--memo- ok x\\n</pre>\\n"
+            out.append(f"{{boundary}} ok {{note_id}}\\n{{body}}\\n")
+    print("".join(out))
+    """
+)
+
+
+def _install_fake_osascript(monkeypatch, tmp_path, with_osacompile=False):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    log = tmp_path / "calls.log"
+    shims = {"osascript": FAKE_OSASCRIPT}
+    if with_osacompile:
+        shims["osacompile"] = FAKE_OSACOMPILE
+    for name, source in shims.items():
+        shim = bin_dir / name
+        shim.write_text(source.format(python=sys.executable, log=str(log)))
+        shim.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}:/usr/bin:/bin")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.delenv("MEMO_NO_CACHE", raising=False)
+    return log
+
+
+def test_get_note_bodies_batches_and_frames(monkeypatch, tmp_path):
+    log = _install_fake_osascript(monkeypatch, tmp_path)
+    results = get_note_bodies(["n1", "bad", "n3"], chunk_size=2)
+
+    assert [r.note_id for r in results] == ["n1", "bad", "n3"]
+    assert results[0].body == "<div>n1</div>\n<pre>--memo- ok x\n</pre>\n"
+    assert results[0].error is None
+    assert results[1].body is None
+    assert results[1].error == "Can't get note id."
+    assert results[2].body.startswith("<div>n3</div>")
+    assert len(log.read_text().splitlines()) == 2
+
+
+def test_run_applescript_compiles_once(monkeypatch, tmp_path):
+    log = _install_fake_osascript(monkeypatch, tmp_path, with_osacompile=True)
+    source = "on run argv\nreturn item 1 of argv\nend run"
+
+    first = run_applescript(source, "b1", "x")
+    second = run_applescript(source, "b2", 'say "hi"')
+
+    assert first.returncode == 0 and second.returncode == 0
+    calls = log.read_text().splitlines()
+    assert calls.count("osacompile") == 1
+    compiled = [c for c in calls if c.endswith(".scpt b1 x") or ".scpt b2" in c]
+    assert len(compiled) == 2
+    assert 'say "hi"' in calls[-1]
+    scripts = list((tmp_path / "cache" / "memo" / "scripts").glob("*.scpt"))
+    assert len(scripts) == 1 and scripts[0].read_text() == source
+
+
+def test_run_applescript_uncompiled_dash_args(monkeypatch, tmp_path):
+    log = _install_fake_osascript(monkeypatch, tmp_path)
+    monkeypatch.setenv("MEMO_NO_CACHE", "1")
+
+    result = run_applescript("on run argv\nend run", "-b1", "-x")
+
+    assert result.returncode == 0, result.stderr
+    assert log.read_text().splitlines() == ["-e -b1 -x"]
@@ -0,0 +1,121 @@
+import gzip
+import sqlite3
+
+import pytest
+
+from memo_helpers import notes_body
+
+
+def _varint(n):
+    out = bytearray()
+    while True:
+        b = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(b | 0x80)
+        else:
+            out.append(b)
+            return bytes(out)
+
+
+def _int(number, value):
+    return _varint(number << 3) + _varint(value)
+
+
+def _bytes(number, value):
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    return _varint(number << 3 | 2) + _varint(len(value)) + value
+
+
+def _run(length, style=None, indent=0, checked=None, weight=0, link=None):
+    para = b""
+    if style is not None:
+        para += _int(1, style)
+    if indent:
+        para += _int(4, indent)
+    if checked is not None:
+        para += _bytes(5, _bytes(1, b"uuid") + _int(2, int(checked)))
+    msg = _int(1, length)
+    if para:
+        msg += _bytes(2, para)
+    if weight:
+        msg += _int(5, weight)
+    if link:
+        msg += _bytes(9, link)
+    return _bytes(5, msg)
+
+
+def _zdata(text, runs):
+    note = _bytes(2, text) + b"".join(runs)
+    return gzip.compress(_bytes(2, _bytes(3, note)))
+
+
+def _utf16_len(s):
+    return len(s.encode("utf-16-le")) // 2
+
+
+def _sample():
+    lines = [
+        ("Shopping 🛒\n", dict(style=0)),
+        ("Intro ", {}),
+        ("bold", dict(weight=1)),
+        (" and ", {}),
+        ("site", dict(link="https://example.com")),
+        ("\n", {}),
+        ("Milk\n", dict(style=103, checked=True)),
+        ("Eggs\n", dict(style=103, checked=False)),
+        ("One\n", dict(style=102)),
+        ("Two\n", dict(style=102)),
+        ("Nested\n", dict(style=100, indent=1)),
+    ]
+    text = "".join(t for t, _ in lines)
+    runs = [_run(_utf16_len(t), **kw) for t, kw in lines]
+    return text, _zdata(text, runs)
+
+
+def test_decode_note_data_markdown():
+    text, blob = _sample()
+    body = notes_body.decode_note_data(blob)
+    assert body.text == text
+    assert body.to_markdown() == "\n".join(
+        [
+            "# Shopping 🛒",
+            "",
+            "Intro **bold** and [site](https://example.com)",
+            "",
+            "- [x] Milk",
+            "- [ ] Eggs",
+            "1. One",
+            "2. Two",
+            "  - Nested",
+        ]
+    )
+
+
+def test_markdown_keeps_plain_lines_literal():
+    body = notes_body.NoteBody(text="Groceries\nMilk\n# x\n1986. x\n* x\n[a](b)\n")
+    assert body.to_html() == "".join(
+        f"<p>{line}</p>\n" for line in ["Groceries", "Milk", "# x", "1986. x", "* x", "[a](b)"]
+    )
+
+
+def test_decode_rejects_garbage():
+    with pytest.raises(Exception):
+        notes_body.decode_note_data(gzip.compress(b"\x07\x07\x07"))
+
+
+def test_get_note_body_from_store(monkeypatch, tmp_path):
+    db = tmp_path / "NoteStore.sqlite"
+    con = sqlite3.connect(db)
+    con.execute("create table ZICNOTEDATA (Z_PK integer primary key, ZNOTE integer, ZDATA blob)")
+    _text, blob = _sample()
+    con.execute("insert into ZICNOTEDATA values (1, 42, ?)", (blob,))
+    con.commit()
+    con.close()
+    monkeypatch.setenv("MEMO_NOTES_DB_PATH", str(db))
+
+    body = notes_body.get_note_body(42)
+    assert body is not None
+    assert body.text.startswith("Shopping")
+    assert notes_body.get_note_body(7) is None
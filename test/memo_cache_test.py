@@ -0,0 +1,66 @@
+import json
+import time
+
+from memo_helpers import cache
+
+
+def _isolate(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.delenv("MEMO_NO_CACHE", raising=False)
+    monkeypatch.delenv("MEMO_CACHE_TTL_SECONDS", raising=False)
+
+
+def test_cache_roundtrip(monkeypatch, tmp_path):
+    _isolate(monkeypatch, tmp_path)
+    cache.cache_set("note_titles:v1:auto:", ["Work - Alpha"])
+    cache.cache_set("folder_names:v1:auto", ["Work"])
+    assert cache.cache_get("note_titles:v1:auto:") == ["Work - Alpha"]
+    assert cache.cache_get("folder_names:v1:auto") == ["Work"]
+    assert cache.cache_get("missing") is None
+
+
+def test_cache_disabled(monkeypatch, tmp_path):
+    _isolate(monkeypatch, tmp_path)
+    monkeypatch.setenv("MEMO_NO_CACHE", "1")
+    cache.cache_set("k", [1])
+    assert cache.cache_get("k") is None
+    assert not (tmp_path / "memo" / "cache_v2.sqlite").exists()
+
+
+def test_cache_ttl_expired(monkeypatch, tmp_path):
+    _isolate(monkeypatch, tmp_path)
+    cache.cache_set("k", [1])
+    monkeypatch.setattr(cache.time, "time", lambda: 10**12)
+    assert cache.cache_get("k") is None
+
+
+def test_cache_migrates_legacy_json(monkeypatch, tmp_path):
+    _isolate(monkeypatch, tmp_path)
+    legacy = tmp_path / "memo" / "cache_v1.json"
+    legacy.parent.mkdir(parents=True)
+    legacy.write_text(
+        json.dumps({"folders_tree:v1:auto": {"ts": time.time(), "data": "Work"}}),
+        encoding="utf-8",
+    )
+    assert cache.cache_get("folders_tree:v1:auto") == "Work"
+    assert not legacy.exists()
+
+
+def test_cache_fingerprint_ignores_ttl(monkeypatch, tmp_path):
+    _isolate(monkeypatch, tmp_path)
+    monkeypatch.setenv("MEMO_CACHE_TTL_SECONDS", "0")
+    cache.cache_set("k", ["a"], fingerprint="1:10|-")
+    assert cache.cache_get("k", fingerprint="1:10|-") == ["a"]
+    assert cache.cache_get("k", fingerprint="2:10|-") is None
+    assert cache.cache_get("k") is None
+
+
+def test_cache_delete_by_prefix(monkeypatch, tmp_path):
+    _isolate(monkeypatch, tmp_path)
+    cache.cache_set("notes_meta:v2:applescript:", [1])
+    cache.cache_set("notes_meta:v2:applescript:Work", [2])
+    cache.cache_set("notes_metaX", [3])
+    cache.cache_delete("notes_meta:")
+    assert cache.cache_get("notes_meta:v2:applescript:") is None
+    assert cache.cache_get("notes_meta:v2:applescript:Work") is None
+    assert cache.cache_get("notes_metaX") == [3]
@@ -0,0 +1,275 @@
+import os
+import stat
+
+from memo_helpers import export_memo
+from memo_helpers.export_memo import ExportFailure, ExportJob
+
+
+def test_export_pipeline_reports_failures_and_keeps_going(monkeypatch, tmp_path):
+    monkeypatch.setenv("MEMO_EXPORT_WORKERS", "2")
+    jobs = [
+        ExportJob("Alpha", "Alpha", markdown="# Alpha\n\n- one"),
+        ExportFailure("Locked", "note is locked"),
+        # Missing directory: the write fails inside the worker.
+        ExportJob("Broken", "missing/Broken", html="<p>x</p>"),
+        ExportJob("Beta", "Beta", html="<h1>Beta</h1><p><b>bold</b></p>"),
+    ]
+    mask = os.umask(0o022)
+    try:
+        failures = export_memo._run_pipeline(str(tmp_path), len(jobs), iter(jobs), ("html", "md"))
+    finally:
+        os.umask(mask)
+
+    assert sorted(f.title for f in failures) == ["Broken", "Locked"]
+    assert stat.S_IMODE((tmp_path / "Alpha.md").stat().st_mode) == 0o644
+    assert (tmp_path / "Alpha.md").read_text() == "# Alpha\n\n- one"
+    assert "<h1>Alpha</h1>" in (tmp_path / "Alpha.html").read_text()
+    assert (tmp_path / "Beta.md").read_text() == "# Beta\n\n**bold**"
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_html_to_md_decodes_non_utf8(monkeypatch, tmp_path):
+    monkeypatch.setenv("MEMO_EXPORT_WORKERS", "1")
+    (tmp_path / "utf8.html").write_text("<p>Zoë</p>", encoding="utf-8")
+    (tmp_path / "latin.html").write_bytes("<p>Café crème brûlée à la française</p>".encode("latin-1"))
+    export_memo.html_to_md(str(tmp_path))
+    assert (tmp_path / "utf8.md").read_text() == "Zoë"
+    assert "Caf" in (tmp_path / "latin.md").read_text()
+
+
+def test_incremental_export(monkeypatch, tmp_path):
+    from memo_helpers import notes_body
+    from memo_helpers.notes_sqlite import NoteMeta
+
+    monkeypatch.setenv("MEMO_EXPORT_WORKERS", "1")
+    fetched = []
+
+    def _bodies(pks):
+        for pk in pks:
+            fetched.append(pk)
+            yield pk, notes_body.NoteBody(text=f"Body {pk}\n")
+
+    monkeypatch.setattr(notes_body, "iter_note_bodies", _bodies)
+
+    def _note(pk, title, modified):
+        return NoteMeta("Work", title, f"N-{pk}", title, pk, modified)
+
+    formats = ("html", "md")
+    export_memo._export_incremental(
+        str(tmp_path), [_note(1, "Alpha", 10.0), _note(2, "Beta", 10.0)], formats
+    )
+    assert fetched == [1, 2]
+    assert (tmp_path / "Alpha [p1].md").read_text() == "Body 1"
+
+    fetched.clear()
+    export_memo._export_incremental(
+        str(tmp_path), [_note(1, "Alpha renamed", 10.0), _note(3, "Gamma", 11.0)], formats
+    )
+    assert fetched == [3]
+    names = sorted(p.name for p in tmp_path.iterdir())
+    assert names == [
+        ".memo-export.json",
+        "Alpha renamed [p1].html",
+        "Alpha renamed [p1].md",
+        "Gamma [p3].html",
+        "Gamma [p3].md",
+    ]
+
+    # Retitling bumps the modification date; the body is read again, but the
+    # files are only renamed when their content is the same.
+    (tmp_path / "Gamma [p3].md").write_text("kept")
+    fetched.clear()
+    export_memo._export_incremental(
+        str(tmp_path), [_note(1, "Alpha renamed", 10.0), _note(3, "Gamma 2", 12.0)], formats
+    )
+    assert fetched == [3]
+    assert (tmp_path / "Gamma 2 [p3].md").read_text() == "kept"
+    assert not (tmp_path / "Gamma [p3].html").exists()
+
+
+def test_applescript_export_keeps_a_manifest(monkeypatch, tmp_path, capsys):
+    from memo_helpers.id_search_memo import NoteBodyResult
+
+    monkeypatch.setenv("MEMO_EXPORT_WORKERS", "1")
+    monkeypatch.setattr(
+        export_memo,
+        "get_note_bodies",
+        lambda ids, chunk_size=None: [NoteBodyResult(i, f"<p>{i}</p>", None) for i in ids],
+    )
+
+    def _note(n, title):
+        note_id = f"x-coredata://S/ICNote/p{n}"
+        return {"title": title, "lookup_title": title, "note_id": note_id, "identifier": None}
+
+    export_memo._export_applescript(str(tmp_path), [_note(1, "Alpha"), _note(2, "Beta")], ("html",))
+    (tmp_path / "Alpha [p1].html").write_text("kept")
+    capsys.readouterr()
+
+    export_memo._export_applescript(str(tmp_path), [_note(1, "Alpha 2")], ("html",))
+    assert "0 unchanged, 1 renamed, 1 removed" in capsys.readouterr().err
+    assert sorted(p.name for p in tmp_path.iterdir()) == [".memo-export.json", "Alpha 2 [p1].html"]
+    assert (tmp_path / "Alpha 2 [p1].html").read_text() == "kept"
+
+
+def test_incremental_export_keeps_files_when_rename_fails(monkeypatch, tmp_path):
+    import os
+
+    from memo_helpers import notes_body
+    from memo_helpers.notes_sqlite import NoteMeta
+
+    monkeypatch.setenv("MEMO_EXPORT_WORKERS", "1")
+    monkeypatch.setattr(
+        notes_body,
+        "iter_note_bodies",
+        lambda pks: ((pk, notes_body.NoteBody(text="Body\n")) for pk in pks),
+    )
+    formats = ("html", "md")
+    export_memo._export_incremental(
+        str(tmp_path), [NoteMeta("Work", "Alpha", "N-1", "Alpha", 1, 10.0)], formats
+    )
+
+    real_replace = os.replace
+
+    def _replace(src, dst):
+        if str(src).endswith(".md"):
+            raise PermissionError(src)
+        return real_replace(src, dst)
+
+    monkeypatch.setattr(export_memo.os, "replace", _replace)
+    renamed = [NoteMeta("Work", "Beta", "N-1", "Beta", 1, 10.0)]
+    export_memo._export_incremental(str(tmp_path), renamed, formats)
+    assert (tmp_path / "Alpha [p1].md").exists()
+    assert (tmp_path / "Beta [p1].html").exists()
+
+    # The next run re-exports the half-renamed note and drops the old file.
+    monkeypatch.setattr(export_memo.os, "replace", real_replace)
+    export_memo._export_incremental(str(tmp_path), renamed, formats)
+    names = sorted(p.name for p in tmp_path.iterdir())
+    assert names == [".memo-export.json", "Beta [p1].html", "Beta [p1].md"]
+
+
+def test_incremental_export_replaces_untagged_files(monkeypatch, tmp_path):
+    from memo_helpers import notes_body
+    from memo_helpers.notes_sqlite import NoteMeta
+
+    monkeypatch.setenv("MEMO_EXPORT_WORKERS", "1")
+    monkeypatch.setattr(
+        notes_body,
+        "iter_note_bodies",
+        lambda pks: ((pk, notes_body.NoteBody(text="Body\n")) for pk in pks),
+    )
+    # Written by memo before file names were tagged and a manifest was kept.
+    (tmp_path / "Plan-Q3.html").write_text("<p>old</p>")
+    (tmp_path / "Plan-Q3.md").write_text("old")
+    (tmp_path / "Unrelated.txt").write_text("mine")
+
+    notes = [NoteMeta("Work", "Plan/Q3", "N-1", "Plan/Q3", 1, 10.0)]
+    export_memo._export_incremental(str(tmp_path), notes, ("html", "md"))
+    names = sorted(p.name for p in tmp_path.iterdir())
+    assert names == [".memo-export.json", "Plan-Q3 [p1].html", "Plan-Q3 [p1].md", "Unrelated.txt"]
+
+
+def test_export_takes_applescript_html_for_attachments(monkeypatch, tmp_path):
+    import dataclasses
+    import subprocess
+
+    from memo_helpers import export_archive, notes_body
+    from memo_helpers.notes_sqlite import NoteMeta
+
+    monkeypatch.setenv("MEMO_EXPORT_WORKERS", "1")
+    bodies = {
+        1: notes_body.NoteBody(text="Plain\n"),
+        2: notes_body.NoteBody(text="Photo \ufffc\n"),
+    }
+    monkeypatch.setattr(
+        notes_body, "iter_note_bodies", lambda pks: ((pk, bodies[pk]) for pk in pks)
+    )
+    fetched = []
+
+    def _id_search(note_id):
+        fetched.append(note_id)
+        return subprocess.CompletedProcess([], 0, stdout='<div><img src="x.png"></div>\n')
+
+    monkeypatch.setattr(export_memo, "id_search_memo", _id_search)
+    monkeypatch.setattr(export_archive, "id_search_memo", _id_search)
+    notes = [
+        NoteMeta("Work", "Plain", "N-1", "Plain", 1, 10.0, note_id="x-coredata://S/ICNote/p1"),
+        NoteMeta("Work", "Photo", "N-2", "Photo", 2, 10.0, note_id="x-coredata://S/ICNote/p2"),
+    ]
+
+    export_memo._export_incremental(str(tmp_path), notes, ("html",))
+    assert fetched == ["x-coredata://S/ICNote/p2"]
+    assert '<img src="x.png">' in (tmp_path / "Photo [p2].html").read_text()
+    assert "<p>Plain</p>" in (tmp_path / "Plain [p1].html").read_text()
+
+    fetched.clear()
+    meta = [dataclasses.asdict(n) for n in notes]
+    records = [r for _note, r, _err in export_archive.iter_records(meta, with_html=True)]
+    assert fetched == ["x-coredata://S/ICNote/p2"]
+    assert '<img src="x.png">' in records[1]["html"]
+
+
+def test_export_file_names_do_not_collide():
+    assert export_memo._clean_file_name("Meeting", export_memo._note_suffix(pk=4)) == "Meeting [p4]"
+    applescript_id = "x-coredata://ABCD/ICNote/p4"
+    assert export_memo._note_suffix(note_id=applescript_id) == "p4"
+    long_name = export_memo._clean_file_name("a/b:" + "x" * 300, "p12345")
+    assert len(long_name) == 250
+    assert long_name.startswith("a-b-") and long_name.endswith(" [p12345]")
+
+
+def test_export_archive_jsonl_and_sqlite(monkeypatch, tmp_path):
+    import gzip
+    import json
+    import sqlite3
+
+    from memo_helpers import export_archive, notes_body, notes_provider
+
+    notes = [
+        {
+            "folder": "Projects",
+            "folder_path": "Work/Projects",
+            "title": "Plan",
+            "identifier": "N-1",
+            "note_id": None,
+            "lookup_title": "Plan",
+            "pk": 1,
+            "modified": 1700000000.0,
+            "created": 1690000000.0,
+        }
+    ]
+    monkeypatch.setattr(notes_provider, "list_notes_meta", lambda folder="": notes)
+    monkeypatch.setattr(
+        notes_body,
+        "iter_note_bodies",
+        lambda pks: ((pk, notes_body.NoteBody(text="Plan\nShip it\n")) for pk in pks),
+    )
+
+    mask = os.umask(0o022)
+    try:
+        out = export_archive.export_archive(str(tmp_path), "jsonl", "gzip", with_html=True)
+    finally:
+        os.umask(mask)
+    assert out == str(tmp_path / "notes.jsonl.gz")
+    assert stat.S_IMODE(os.stat(out).st_mode) == 0o644
+    with gzip.open(out, "rt", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert records == [
+        {
+            "folder": "Work/Projects",
+            "title": "Plan",
+            "identifier": "N-1",
+            "created": "2023-07-22T04:26:40+00:00",
+            "modified": "2023-11-14T22:13:20+00:00",
+            "markdown": "Plan\n\nShip it",
+            "html": "<p>Plan</p>\n<p>Ship it</p>\n",
+        }
+    ]
+
+    out = export_archive.export_archive(str(tmp_path), "sqlite")
+    con = sqlite3.connect(out)
+    assert con.execute("select folder, title, markdown, html from notes").fetchall() == [
+        ("Work/Projects", "Plan", "Plan\n\nShip it", None)
+    ]
+    con.close()
+    assert not list(tmp_path.glob("*.tmp*"))
@@ -0,0 +1,116 @@
+import pytest
+
+from memo_helpers import notes_body, notes_index
+
+
+@pytest.fixture
+def bodies(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    texts = {
+        1: "Groceries\nmilk, eggs and crème fraîche",
+        2: "Trip plan\nbook the train to Kraków",
+        3: "Kraków\nrestaurants",
+    }
+    reads = []
+
+    def _iter(pks):
+        for pk in pks:
+            reads.append(pk)
+            yield pk, notes_body.NoteBody(text=texts[pk])
+
+    monkeypatch.setattr(notes_body, "iter_note_bodies", _iter)
+    return texts, reads
+
+
+def _notes(modified=None):
+    modified = modified or {}
+    return [
+        {"folder": "Home", "title": "Groceries", "identifier": "N-1", "pk": 1, "modified": modified.get(1, 1.0)},
+        {"folder": "Travel", "title": "Trip plan", "identifier": "N-2", "pk": 2, "modified": modified.get(2, 1.0)},
+        {"folder": "Travel", "title": "Kraków", "identifier": "N-3", "pk": 3, "modified": modified.get(3, 1.0)},
+    ]
+
+
+def test_index_search_ranks_titles_and_snippets(bodies):
+    assert notes_index.update_index(_notes()) == 3
+    hits = notes_index.search_index("krakow")
+    assert [h.title for h in hits] == ["Kraków", "Trip plan"]
+    assert "[Kraków]" in hits[1].snippet
+    assert [h.title for h in notes_index.search_index("creme", folder="Home")] == ["Groceries"]
+    # Invalid FTS5 syntax falls back to literal words.
+    assert [h.title for h in notes_index.search_index('eggs "')] == ["Groceries"]
+
+
+def test_index_updates_incrementally(bodies):
+    texts, reads = bodies
+    notes_index.update_index(_notes(), fingerprint="a")
+    reads.clear()
+    assert notes_index.update_index(_notes(), fingerprint="a") == 0
+    assert notes_index.update_index(_notes()) == 0
+    assert reads == []
+
+    texts[2] = "Trip plan\nfly to Lisbon instead"
+    assert notes_index.update_index(_notes({2: 2.0})[:2], fingerprint="b") == 1
+    assert reads == [2]
+    assert [h.title for h in notes_index.search_index("lisbon")] == ["Trip plan"]
+    # Note 3 is gone from the listing, so it's dropped from the index.
+    assert notes_index.search_index("restaurants") == []
+    assert notes_index.index_excerpts(_notes()) == {
+        "id:N-1": "Groceries milk, eggs and crème fraîche",
+        "id:N-2": "Trip plan fly to Lisbon instead",
+    }
+
+
+def test_index_retries_notes_that_fail_to_decode(monkeypatch, bodies):
+    from memo_helpers import id_search_memo
+
+    texts, reads = bodies
+    notes = _notes()
+    notes[1]["note_id"] = "x-coredata://S/ICNote/p2"
+    real_iter = notes_body.iter_note_bodies
+
+    def _iter(pks):
+        for pk, body in real_iter(pks):
+            yield pk, None if pk == 2 else body
+
+    monkeypatch.setattr(notes_body, "iter_note_bodies", _iter)
+    fetched = []
+
+    def _get_bodies(ids, **_kwargs):
+        fetched.extend(ids)
+        return [id_search_memo.NoteBodyResult(i, None, "Notes got an error.") for i in ids]
+
+    monkeypatch.setattr(id_search_memo, "get_note_bodies", _get_bodies)
+
+    # Not fetched through AppleScript here, so the run isn't complete...
+    assert notes_index.update_index(notes, fingerprint="a", allow_applescript=False) == 2
+    assert fetched == []
+    # ...and the next one tries again, through AppleScript, which fails too.
+    assert notes_index.update_index(notes, fingerprint="a") == 0
+    assert fetched == ["x-coredata://S/ICNote/p2"]
+
+    def _get_bodies_ok(ids, **_kwargs):
+        return [id_search_memo.NoteBodyResult(i, "<p>Lisbon</p>", None) for i in ids]
+
+    monkeypatch.setattr(id_search_memo, "get_note_bodies", _get_bodies_ok)
+    assert notes_index.update_index(notes, fingerprint="a") == 1
+    assert [h.title for h in notes_index.search_index("lisbon")] == ["Trip plan"]
+    reads.clear()
+    assert notes_index.update_index(notes, fingerprint="a") == 0
+    assert reads == []
+
+
+def test_index_keeps_progress_of_interrupted_update(bodies, monkeypatch):
+    texts, reads = bodies
+    monkeypatch.setattr(notes_index, "_COMMIT_EVERY", 1)
+
+    def _iter(pks):
+        for pk in pks:
+            if pk == 3:
+                raise KeyboardInterrupt
+            yield pk, notes_body.NoteBody(text=texts[pk])
+
+    monkeypatch.setattr(notes_body, "iter_note_bodies", _iter)
+    with pytest.raises(KeyboardInterrupt):
+        notes_index.update_index(_notes(), fingerprint="a")
+    assert set(notes_index.index_excerpts(_notes())) == {"id:N-1", "id:N-2"}
@@ -16,16 +16,23 @@ def _patch_notes(monkeypatch):
     monkeypatch.setattr(memo_mod, "list_folders_tree", lambda: "Personal\nWork\n  Sub")
 
     # Provide stable IDs so edit/move/delete code paths can select something.
-    note_map = {1: ("note-id-1", "Work - Alpha"), 2: ("note-id-2", "Work - Beta")}
-    notes_list = ["Work - Alpha", "Work - Beta"]
-    monkeypatch.setattr(memo_mod, "get_note", lambda folder="": [note_map, notes_list])
+    notes_meta = [
+        {"folder": "Work", "title": "Alpha", "note_id": "note-id-1"},
+        {"folder": "Work", "title": "Beta", "note_id": "note-id-2"},
+    ]
+    monkeypatch.setattr(memo_mod, "list_notes_meta", lambda folder="": notes_meta)
+
+    def _get_note(folder=""):
+        raise AssertionError("selection should not enumerate notes via AppleScript")
+
+    monkeypatch.setattr(memo_mod, "get_note", _get_note)
 
     monkeypatch.setattr(memo_mod, "edit_note", lambda note_id: None)
 
-    def _delete_note(_note_id):
+    def _delete_notes(_note_ids, _titles=None):
         click.secho("\nNote deleted successfully.", fg="green")
 
-    monkeypatch.setattr(memo_mod, "delete_note", _delete_note)
+    monkeypatch.setattr(memo_mod, "delete_notes", _delete_notes)
 
 
 def test_notes(monkeypatch):
@@ -101,6 +108,32 @@ def test_notes_move_indexerror(monkeypatch):
     assert result.exit_code == 1
 
 
+def test_notes_move_many(monkeypatch):
+    import memo.memo as memo_mod
+
+    _patch_notes(monkeypatch)
+    moved = []
+    monkeypatch.setattr(
+        memo_mod,
+        "move_notes",
+        lambda ids, folder, titles=None: moved.append((ids, folder, titles)),
+    )
+    result = CliRunner().invoke(cli, ["notes", "--move"], input="2,1\nArchive\n")
+    assert result.exit_code == 0, result.output
+    assert "Enter the folder you want to move the notes to" in result.output
+    ids, folder, titles = moved[0]
+    assert ids == ["note-id-2", "note-id-1"] and folder == "Archive"
+    assert titles["note-id-2"] == "Work - Beta"
+
+
+def test_notes_delete_many_needs_confirmation(monkeypatch):
+    _patch_notes(monkeypatch)
+    result = CliRunner().invoke(cli, ["notes", "--delete"], input="1-2\nn\n")
+    assert result.exit_code == 0
+    assert "Delete 2 notes?" in result.output
+    assert "Note deleted successfully." not in result.output
+
+
 def test_notes_flist(monkeypatch):
     _patch_notes(monkeypatch)
     runner = CliRunner()
@@ -0,0 +1,111 @@
+import time
+
+from memo_helpers import preview_prefetch
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_prefetch_top_items_and_focus_neighbours(monkeypatch, tmp_path):
+    rendered = []
+    monkeypatch.setattr(
+        preview_prefetch, "cached_preview", lambda _map, key, _item: rendered.append(key)
+    )
+    monkeypatch.setenv("MEMO_PREVIEW_PREFETCH", "2")
+    monkeypatch.setenv("MEMO_PREVIEW_WORKERS", "1")
+    items = {str(i): {"title": f"n{i}"} for i in range(1, 21)}
+    focus = tmp_path / "focus.log"
+
+    prefetcher = preview_prefetch.PreviewPrefetcher(items, tmp_path / "map.json", focus)
+    prefetcher.start()
+    try:
+        assert _wait_for(lambda: {"1", "2"} <= set(rendered))
+        focus.write_text("15\n")
+        expected = {"12", "13", "14", "15", "16", "17", "18"}
+        assert _wait_for(lambda: expected <= set(rendered))
+    finally:
+        prefetcher.stop()
+    assert rendered[:2] == ["1", "2"]
+    assert rendered[2] == "15"
+    assert len(rendered) == len(set(rendered))
+
+
+def test_prefetch_stop_does_not_wait_for_slow_renders(monkeypatch, tmp_path):
+    import threading
+
+    release = threading.Event()
+    monkeypatch.setattr(preview_prefetch, "cached_preview", lambda *_: release.wait(5))
+    monkeypatch.setenv("MEMO_PREVIEW_WORKERS", "4")
+    items = {str(i): {} for i in range(1, 11)}
+
+    prefetcher = preview_prefetch.PreviewPrefetcher(items, tmp_path / "map.json")
+    prefetcher.start()
+    time.sleep(0.05)
+    t0 = time.monotonic()
+    prefetcher.stop()
+    release.set()
+    assert time.monotonic() - t0 < 1.0
+
+
+def test_prefetch_disabled(monkeypatch, tmp_path):
+    monkeypatch.setenv("MEMO_PREVIEW_PREFETCH", "0")
+    prefetcher = preview_prefetch.PreviewPrefetcher({"1": {}}, tmp_path / "m", tmp_path / "f")
+    assert not prefetcher.enabled
+    prefetcher.start()
+    prefetcher.stop()
+
+
+def test_persistent_preview_cache(monkeypatch, tmp_path):
+    from memo_helpers import fzf_preview_notes, preview_cache
+
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.delenv("MEMO_NO_CACHE", raising=False)
+    renders = []
+
+    def _render(item):
+        renders.append(item["pk"])
+        return f"# note {item['pk']} @ {item['modified']}"
+
+    monkeypatch.setattr(fzf_preview_notes, "_render_markdown", _render)
+    item = {"pk": 7, "modified": 1700000000.0, "cache_key": "7"}
+    session_a = tmp_path / "a" / "map.json"
+    session_b = tmp_path / "b" / "map.json"
+
+    assert fzf_preview_notes.cached_preview(session_a, "1", item).startswith("# note 7")
+    assert fzf_preview_notes.cached_preview(session_b, "3", item).startswith("# note 7")
+    assert renders == [7]
+
+    edited = dict(item, modified=1700000100.0)
+    assert fzf_preview_notes.cached_preview(session_b, "3", edited).endswith("1700000100.0")
+    assert renders == [7, 7]
+
+    preview_cache.preview_evict(max_bytes=0)
+    assert not list((tmp_path / "memo" / "previews_v1").glob("*/*.md"))
+
+
+def test_preview_server_round_trip(monkeypatch, tmp_path, capfd):
+    from memo_helpers import preview_client, preview_server
+
+    monkeypatch.setattr(
+        preview_server, "cached_preview", lambda _map, key, item: f"# {item['title']} ({key})"
+    )
+    focused = []
+    items = {"1": {"title": "Groceries"}}
+    server = preview_server.PreviewServer(
+        items, tmp_path / "map.json", tmp_path / "s.sock", on_focus=focused.append
+    )
+    assert server.start()
+    try:
+        preview_client.main([str(tmp_path / "s.sock"), "1"])
+        preview_client.main([str(tmp_path / "s.sock"), "9"])
+    finally:
+        server.stop()
+    assert capfd.readouterr().out == "# Groceries (1)\n(no preview)\n"
+    assert focused == ["1"]
+    assert not (tmp_path / "s.sock").exists()
@@ -6,23 +6,24 @@ def _patch_reminders(monkeypatch):
     import memo.memo as memo_mod
     import click
     import datetime
+    from memo_helpers.reminders_sqlite import Reminder
 
-    # Map/list shape matches get_reminder() contract in memo_helpers/get_memo.py
-    reminder_map = {
-        1: ("rem-id-1", "Test reminder", datetime.datetime(2026, 1, 1, 12, 0, 0)),
-    }
-    reminder_list = ["Test reminder | 2026-01-01 12:00:00"]
-    monkeypatch.setattr(memo_mod, "get_reminder", lambda: [reminder_map, reminder_list])
+    # Shape matches get_reminder() in memo_helpers/reminders_provider.py
+    due = datetime.datetime(2026, 1, 1, 12, 0, 0).timestamp()
+    reminders = [Reminder("rem-id-1", "Test reminder", due), Reminder("rem-id-2", "Someday", None)]
+    monkeypatch.setattr(memo_mod, "get_reminder", lambda list_name="": reminders)
 
     monkeypatch.setattr(
         memo_mod,
-        "complete_reminder",
-        lambda _rid: click.secho("\nReminder marked successfully as completed.", fg="green"),
+        "complete_reminders",
+        lambda _ids, _titles=None: click.secho(
+            "\nReminder marked successfully as completed.", fg="green"
+        ),
     )
     monkeypatch.setattr(
         memo_mod,
-        "delete_reminder",
-        lambda _rid: click.secho("\nReminder deleted successfully.", fg="green"),
+        "delete_reminders",
+        lambda _ids, _titles=None: click.secho("\nReminder deleted successfully.", fg="green"),
     )
 
 
@@ -32,6 +33,8 @@ def test_rem(monkeypatch):
     result = runner.invoke(cli, ["rem"])
     assert result.exit_code == 0
     assert "Your Reminders:" in result.output
+    assert "1. Test reminder | 2026-01-01 12:00:00 |" in result.output
+    assert "2. Someday | No due date" in result.output
 
 
 def test_rem_complete(monkeypatch):
@@ -48,3 +51,174 @@ def test_rem_delete(monkeypatch):
     result = runner.invoke(cli, ["rem", "--delete"], input="1")
     assert result.exit_code == 0
     assert "Reminder deleted successfully." in result.output
+
+
+def test_rem_delete_many_asks_first(monkeypatch):
+    _patch_reminders(monkeypatch)
+    result = CliRunner().invoke(cli, ["rem", "--delete"], input="all\nn\n")
+    assert result.exit_code == 0
+    assert "Delete 2 reminders?" in result.output
+    assert "Reminder deleted successfully." not in result.output
+
+
+def _make_reminders_store(path):
+    import sqlite3
+
+    con = sqlite3.connect(path)
+    con.executescript(
+        """
+        create table ZREMCDBASELIST (Z_PK integer primary key, ZNAME text, ZMARKEDFORDELETION integer);
+        create table ZREMCDREMINDER (
+            Z_PK integer primary key, ZTITLE text, ZCOMPLETED integer,
+            ZMARKEDFORDELETION integer, ZDUEDATE timestamp, ZLIST integer, ZCKIDENTIFIER text
+        );
+        insert into ZREMCDBASELIST values (1, 'Home', 0), (2, 'Old', 1);
+        """
+    )
+    # Due dates are Core Data timestamps (seconds since 2001-01-01 UTC).
+    con.executemany(
+        "insert into ZREMCDREMINDER values (?, ?, ?, ?, ?, ?, ?)",
+        [
+            (1, "Later", 0, 0, 800000000.0, 1, "CK-1"),
+            (2, "Sooner", 0, 0, 700000000.0, 1, "CK-2"),
+            (3, "Undated", 0, 0, None, 1, "CK-3"),
+            (4, "Done", 1, 0, 600000000.0, 1, "CK-4"),
+            (5, "Deleted", 0, 1, 600000000.0, 1, "CK-5"),
+            (6, "In deleted list", 0, 0, 600000000.0, 2, "CK-6"),
+        ],
+    )
+    con.commit()
+    con.close()
+
+
+def test_sqlite_reminders(monkeypatch, tmp_path):
+    from memo_helpers.reminders_sqlite import list_reminders
+
+    import sqlite3
+
+    _make_reminders_store(tmp_path / "Data-A.sqlite")
+    # Stores without the reminders schema (e.g. an unused local store) are skipped.
+    sqlite3.connect(tmp_path / "Data-local.sqlite").close()
+    monkeypatch.setenv("MEMO_REMINDERS_DB_PATH", str(tmp_path))
+
+    reminders = {r.title: r for r in list_reminders()}
+    assert sorted(reminders) == ["Later", "Sooner", "Undated"]
+    assert reminders["Sooner"].reminder_id == "x-apple-reminder://CK-2"
+    assert reminders["Sooner"].due == 700000000.0 + 978307200
+    assert reminders["Sooner"].list_name == "Home"
+    assert reminders["Undated"].due is None
+
+
+def test_rem_sqlite_backend(monkeypatch, tmp_path):
+    import memo.memo as memo_mod
+
+    db = tmp_path / "Data-A.sqlite"
+    _make_reminders_store(db)
+    monkeypatch.setenv("MEMO_REMINDERS_DB_PATH", str(db))
+    monkeypatch.setenv("MEMO_REMINDERS_BACKEND", "sqlite")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    completed = []
+    monkeypatch.setattr(
+        memo_mod, "complete_reminders", lambda ids, _titles=None: completed.extend(ids)
+    )
+
+    # Out-of-range input is asked for again.
+    result = CliRunner().invoke(cli, ["rem", "--complete"], input="4\n3,1-2\ny\n")
+    assert result.exit_code == 0, result.output
+    assert "1. Sooner | 2023-" in result.output
+    assert "3. Undated | No due date" in result.output
+    assert "'4' is not in the list (1-3)." in result.output
+    assert "Complete 3 reminders?" in result.output
+    assert completed == [
+        "x-apple-reminder://CK-3",
+        "x-apple-reminder://CK-2",
+        "x-apple-reminder://CK-1",
+    ]
+
+
+def test_parse_selection():
+    import pytest
+    from memo_helpers.choice_memo import parse_selection
+
+    assert parse_selection("3", 5) == [3]
+    assert parse_selection(" 5-3, 1 4 ", 5) == [3, 4, 5, 1]
+    assert parse_selection("all", 3) == [1, 2, 3]
+    for bad in ("", "0", "2-6", "x", "1-"):
+        with pytest.raises(ValueError):
+            parse_selection(bad, 5)
+
+
+def test_batched_reminder_results(monkeypatch, capsys):
+    import subprocess
+    from memo_helpers import applescript, delete_memo
+
+    calls = []
+
+    def fake_run(script, *ids, label):
+        calls.append(ids)
+        out = "ok\x1e!Can’t get reminder id \"B\".\x1eok\n"
+        return subprocess.CompletedProcess([], 0, stdout=out, stderr="")
+
+    forgotten = []
+    monkeypatch.setattr(applescript, "run_applescript", fake_run)
+    monkeypatch.setattr(delete_memo, "forget_reminder", lambda *ids: forgotten.extend(ids))
+
+    results = delete_memo.complete_reminders(["A", "B", "C"], {"B": "Call mom"})
+    assert calls == [("A", "B", "C")]
+    assert results == {"A": None, "B": 'Can’t get reminder id "B".', "C": None}
+    assert forgotten == ["A", "C"]
+    out = capsys.readouterr().out
+    assert "2 reminders marked successfully as completed." in out
+    assert 'Error: Call mom: Can’t get reminder id "B".' in out
+
+
+def test_parse_applescript_reminders():
+    import datetime
+    from memo_helpers.get_memo import _parse_reminders
+
+    # Reference date 2026-01-01 00:01:00, then id/offset/name records.
+    stdout = "\x1e".join(
+        [
+            "2026\x1f1\x1f1\x1f60",
+            "x-apple-reminder://A\x1f3600\x1fCall | mom",
+            "x-apple-reminder://B\x1f\x1fUndated",
+            "x-apple-reminder://C\x1f-1,5E+3\x1fOverdue",
+        ]
+    ) + "\n"
+    ref = datetime.datetime(2026, 1, 1, 0, 1).timestamp()
+    a, b, c = _parse_reminders(stdout)
+    assert (a.reminder_id, a.title, a.due) == ("x-apple-reminder://A", "Call | mom", ref + 3600)
+    assert b.due is None
+    assert c.due == ref - 1500
+
+
+def test_reminders_cache(monkeypatch, tmp_path):
+    import sqlite3
+    from memo_helpers import reminders_provider, reminders_sqlite
+
+    db = tmp_path / "Data-A.sqlite"
+    _make_reminders_store(db)
+    con = sqlite3.connect(db)
+    con.execute("insert into ZREMCDBASELIST values (3, 'Work', 0)")
+    con.execute("insert into ZREMCDREMINDER values (7, 'Report', 0, 0, null, 3, 'CK-7')")
+    con.commit()
+    con.close()
+    monkeypatch.setenv("MEMO_REMINDERS_DB_PATH", str(db))
+    monkeypatch.setenv("MEMO_REMINDERS_BACKEND", "sqlite")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.delenv("MEMO_NO_CACHE", raising=False)
+
+    assert [r.title for r in reminders_provider.get_reminder(list_name="Work")] == ["Report"]
+    assert len(reminders_provider.get_reminder()) == 4
+
+    # Served from the cache while the store is unchanged...
+    def fail(_list_name=""):
+        raise AssertionError("store queried")
+
+    monkeypatch.setattr(reminders_sqlite, "list_reminders", fail)
+    assert len(reminders_provider.get_reminder()) == 4
+    # ...with memo's own changes applied to the cached listings.
+    reminders_provider.forget_reminder("x-apple-reminder://CK-7")
+    reminders_provider.update_cached_reminder("x-apple-reminder://CK-1", title="Much later")
+    assert reminders_provider.get_reminder(list_name="Work") == []
+    assert [r.title for r in reminders_provider.get_reminder()] == ["Sooner", "Much later", "Undated"]
@@ -0,0 +1,146 @@
+import sqlite3
+
+import pytest
+
+from memo_helpers import notes_provider, notes_sqlite
+
+
+def _make_store(path):
+    con = sqlite3.connect(path)
+    con.execute(
+        """
+        create table ZICCLOUDSYNCINGOBJECT (
+            Z_PK integer primary key,
+            Z_ENT integer,
+            ZTITLE1 text,
+            ZTITLE2 text,
+            ZSNIPPET text,
+            ZIDENTIFIER text,
+            ZFOLDER integer,
+            ZPARENT integer,
+            ZMARKEDFORDELETION integer,
+            ZISPASSWORDPROTECTED integer
+        )
+        """
+    )
+    rows = [
+        # Folders
+        (1, 15, None, "Work", None, "F-1", None, None, 0, 0),
+        (2, 15, None, "Projects", None, "F-2", None, 1, 0, 0),
+        (3, 15, None, "Personal", None, "F-3", None, None, 0, 0),
+        (4, 15, None, "Recently Deleted", None, "TrashFolder-1", None, None, 0, 0),
+        # Notes
+        (10, 12, "Beta", None, None, "N-10", 1, None, 0, 0),
+        (11, 12, "alpha", None, None, "N-11", 1, None, 0, 0),
+        (12, 12, "", None, "First line\nsecond", "N-12", 2, None, 0, 0),
+        (13, 12, "Groceries", None, None, "N-13", 3, None, 0, 0),
+        (14, 12, "Trashed", None, None, "N-14", 4, None, 0, 0),
+        (15, 12, "Gone", None, None, "N-15", 1, None, 1, 0),
+        (16, 12, "Secret", None, None, "N-16", 1, None, 0, 1),
+    ]
+    con.executemany(
+        "insert into ZICCLOUDSYNCINGOBJECT values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    con.execute("create table Z_METADATA (Z_VERSION integer, Z_UUID varchar, Z_PLIST blob)")
+    con.execute("insert into Z_METADATA values (1, 'STORE-UUID', null)")
+    con.execute("create table Z_PRIMARYKEY (Z_ENT integer, Z_NAME varchar, Z_SUPER integer, Z_MAX integer)")
+    con.execute("insert into Z_PRIMARYKEY values (12, 'ICNote', 0, 16)")
+    con.commit()
+    con.close()
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    db = tmp_path / "NoteStore.sqlite"
+    _make_store(db)
+    monkeypatch.setenv("MEMO_NOTES_DB_PATH", str(db))
+    monkeypatch.setenv("MEMO_NOTES_BACKEND", "sqlite")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.delenv("MEMO_NO_CACHE", raising=False)
+    return db
+
+
+def test_sqlite_note_titles(store):
+    assert notes_sqlite.list_note_titles() == [
+        "Personal - Groceries",
+        "Projects - First line second",
+        "Work - alpha",
+        "Work - Beta",
+    ]
+    assert notes_sqlite.list_note_titles(folder="Wor") == ["Work - alpha", "Work - Beta"]
+
+
+def test_sqlite_folders(store):
+    assert notes_sqlite.list_folder_names() == [
+        "Personal",
+        "Projects",
+        "Recently Deleted",
+        "Work",
+    ]
+    assert ("Projects", "Work") in notes_sqlite.list_folders_with_parents()
+
+
+def test_sqlite_notes_meta(store):
+    meta = notes_sqlite.list_notes_meta(folder="Projects")
+    assert len(meta) == 1
+    assert meta[0].title == "First line second"
+    assert meta[0].lookup_title == ""
+    assert meta[0].identifier == "N-12"
+    assert meta[0].pk == 12
+    assert meta[0].folder_path == "Work/Projects"
+    assert meta[0].note_id == "x-coredata://STORE-UUID/ICNote/p12"
+
+
+def test_provider_serves_snapshot_from_cache(store, monkeypatch):
+    calls = []
+    real = notes_sqlite.load_snapshot
+    monkeypatch.setattr(
+        notes_sqlite, "load_snapshot", lambda *a: calls.append(1) or real(*a)
+    )
+    # Folder views and folder-scoped listings never load every note.
+    assert notes_provider.list_folders_tree() == "Personal\nRecently Deleted\nWork\n  Projects"
+    assert notes_provider.list_note_titles(folder="Personal") == ["Personal - Groceries"]
+    projects = notes_provider.list_notes_meta(folder="Proj")[0]
+    assert projects["folder_path"] == "Work/Projects"
+    assert projects["note_id"] == "x-coredata://STORE-UUID/ICNote/p12"
+    assert calls == []
+
+    assert notes_provider.list_notes_meta()[0]["title"] == "Groceries"
+    monkeypatch.setattr(notes_sqlite, "load_folders", lambda: pytest.fail("folders queried"))
+    meta = notes_provider.list_notes_meta()
+    assert [n["folder_path"] for n in meta][:2] == ["Personal", "Work/Projects"]
+    assert "Work - Beta" in notes_provider.list_note_titles()
+    assert "Work" in notes_provider.list_folder_names()
+    assert calls == [1]
+
+
+def test_provider_direct_query_without_cache(store, monkeypatch):
+    monkeypatch.setenv("MEMO_NO_CACHE", "1")
+    monkeypatch.setattr(notes_sqlite, "load_snapshot", lambda: pytest.fail("snapshot built"))
+    assert notes_provider.list_note_titles(folder="Work") == ["Work - alpha", "Work - Beta"]
+    assert [n["pk"] for n in notes_provider.list_notes_meta(folder="Personal")] == [13]
+
+
+def test_listings_sort_with_casefold(store, monkeypatch):
+    con = sqlite3.connect(store)
+    con.executemany(
+        "insert into ZICCLOUDSYNCINGOBJECT (Z_PK, Z_ENT, ZTITLE1, ZIDENTIFIER, ZFOLDER) "
+        "values (?, 12, ?, ?, ?)",
+        [(17, "Érable", "N-17", 3), (18, "école", "N-18", 3), (19, "Zed", "N-19", None)],
+    )
+    con.commit()
+    con.close()
+    expected = [
+        "Personal - Groceries",
+        "Personal - école",
+        "Personal - Érable",
+        "Projects - First line second",
+        "Work - alpha",
+        "Work - Beta",
+        "Zed",
+    ]
+    # Folder-scoped listings (straight from SQL) and the cached snapshot agree.
+    assert notes_provider.list_note_titles(folder="Personal") == expected[:3] + ["Zed"]
+    assert notes_provider.list_note_titles() == expected
+    assert [n["title"] for n in notes_provider.list_notes_meta()][:3] == ["Zed", "Groceries", "école"]
@@ -0,0 +1,74 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from memo_sqlite_test import _make_store
+
+# Cold-start guard: `memo notes` and `memo --version` must not pull in the
+# converters, the export/edit stack or process pools. Measured with
+# `python -X importtime` in a fresh interpreter.
+
+_SRC = Path(__file__).resolve().parents[1] / "src"
+
+_HEAVY = {
+    "html2text",
+    "mistune",
+    "chardet",
+    "concurrent.futures",
+    "multiprocessing",
+    "subprocess",
+    "memo_helpers.applescript",
+    "memo_helpers.export_memo",
+    "memo_helpers.export_archive",
+    "memo_helpers.edit_memo",
+    "memo_helpers.add_memo",
+    "memo_helpers.move_memo",
+    "memo_helpers.search_memo",
+}
+
+# Total import time (sum of every module's own time). Generous on purpose: it
+# catches an eager import creeping back in, not machine jitter.
+_BUDGET_MS = float(os.getenv("MEMO_STARTUP_BUDGET_MS", "400"))
+
+
+def _import_times(args, env):
+    code = f"from memo.memo import cli; cli({args!r})"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": str(_SRC), **env},
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, _, name = (part.strip() for part in line[12:].split("|"))
+        if self_us.isdigit():
+            times[name] = int(self_us) / 1000.0
+    return result, times
+
+
+def test_version_startup_imports():
+    result, times = _import_times(["--version"], {})
+    assert result.returncode == 0, result.stderr
+    assert not _HEAVY & times.keys()
+    assert "memo_helpers.cache" not in times
+    assert sum(times.values()) < _BUDGET_MS
+
+
+def test_notes_listing_startup_imports(tmp_path):
+    db = tmp_path / "NoteStore.sqlite"
+    _make_store(db)
+    env = {
+        "MEMO_NOTES_DB_PATH": str(db),
+        "MEMO_NOTES_BACKEND": "sqlite",
+        "XDG_CACHE_HOME": str(tmp_path / "cache"),
+    }
+    result, times = _import_times(["notes"], env)
+    assert result.returncode == 0, result.stderr
+    assert "Work - Beta" in result.stdout
+    # importlib.metadata (used by --version) needs tempfile; listing must not.
+    assert not (_HEAVY | {"tempfile"}) & times.keys()
+    assert sum(times.values()) < _BUDGET_MS
@@ -0,0 +1,88 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from memo_helpers import tracing
+
+
+@pytest.fixture
+def trace_file(monkeypatch, tmp_path):
+    path = tmp_path / "trace.jsonl"
+    monkeypatch.setenv("MEMO_TRACE", str(path))
+    monkeypatch.delenv("MEMO_TIMING", raising=False)
+    monkeypatch.delenv("MEMO_TRACE_PARENT", raising=False)
+    tracing.attach({})
+    yield path
+    tracing.attach({})
+
+
+def _records(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_spans_nest_and_count(trace_file):
+    with tracing.span("outer", folder="Work"):
+        tracing.count("rows", 3)
+        with tracing.span("inner"):
+            tracing.count("rows")
+            tracing.count("rows")
+
+    inner, outer = _records(trace_file)
+    assert inner["name"] == "inner" and inner["parent"] == outer["span"]
+    assert inner["counters"] == {"rows": 2}
+    assert outer["parent"] is None
+    assert outer["attrs"] == {"folder": "Work"}
+    assert outer["counters"] == {"rows": 3}
+
+
+def test_child_process_joins_trace(trace_file):
+    code = "from memo_helpers.tracing import span\nwith span('child'):\n    pass\n"
+    with tracing.span("parent"):
+        env = tracing.child_env()
+        env["MEMO_TIMING"] = "1"
+        result = subprocess.run(
+            [sys.executable, "-c", code], env=env, capture_output=True, text=True
+        )
+
+    assert result.returncode == 0
+    # Only the top-level process prints the MEMO_TIMING tree.
+    assert result.stderr == ""
+    child, parent = _records(trace_file)
+    assert child["pid"] != os.getpid()
+    assert child["parent"] == parent["span"]
+    assert child["trace"] == parent["trace"]
+
+
+def test_chrome_trace_format(monkeypatch, tmp_path):
+    path = tmp_path / "trace.json"
+    monkeypatch.setenv("MEMO_TRACE", str(path))
+    tracing.attach({})
+    try:
+        with tracing.span("work"):
+            pass
+    finally:
+        tracing.attach({})
+    # Unterminated JSON array, as the trace viewers accept it.
+    events = json.loads(path.read_text().rstrip().rstrip(",") + "]")
+    assert [e["ph"] for e in events] == ["M", "X"]
+    assert events[1]["name"] == "work" and events[1]["dur"] >= 0
+
+
+def test_timing_tree_collapses_repeats(monkeypatch, capsys):
+    monkeypatch.setenv("MEMO_TIMING", "1")
+    monkeypatch.delenv("MEMO_TRACE", raising=False)
+    monkeypatch.delenv("MEMO_TRACE_PARENT", raising=False)
+    tracing.attach({})
+    with tracing.span("export"):
+        for _ in range(10):
+            with tracing.span("decode"):
+                tracing.count("bytes", 5)
+    tracing.report()
+
+    lines = capsys.readouterr().err.splitlines()
+    assert len(lines) == 2
+    assert lines[0].startswith("[timing] export")
+    assert "decode x10" in lines[1] and "bytes=50" in lines[1]